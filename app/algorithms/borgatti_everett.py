@@ -1,7 +1,9 @@
 import numpy as np
-import numba
 import math
 import pygad
+from graph_snapshot import snapshot_of
+from algorithms.genetic import run_genetic, OBJECTIVE_BE_RHO
+from algorithms.cp_kernels import be_rho
 
 class Borgatti_Everett:
     def __init__(self, G, A, n):
@@ -9,56 +11,22 @@ class Borgatti_Everett:
         self.A = A
         self.n = n
 
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def create_core_periphery_matrix(n, core_indices):
-        delta = np.zeros((n, n))
-        core_indices_set = set(core_indices)  # Convert list to set for faster lookup
-        for i in range(n):
-            if i in core_indices_set:
-                delta[i, :] = 1
-                delta[:, i] = 1
-        return delta
-    
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def pearson_correlation(x, y):
-        n = len(x)
-        sum_x = 0.0
-        sum_y = 0.0
-        sum_x_sq = 0.0
-        sum_y_sq = 0.0
-        sum_xy = 0.0
-        
-        for i in range(n):
-            sum_x += x[i]
-            sum_y += y[i]
-            sum_x_sq += x[i] ** 2
-            sum_y_sq += y[i] ** 2
-            sum_xy += x[i] * y[i]
-        
-        numerator = sum_xy - (sum_x * sum_y / n)
-        denominator = np.sqrt((sum_x_sq - sum_x ** 2 / n) * (sum_y_sq - sum_y ** 2 / n))
-        
-        if denominator == 0:
-            return 0.0
-        else:
-            return numerator / denominator
-        
+    def core_mask(self, core_indices):
+        mask = np.zeros(self.n, dtype=np.bool_)
+        mask[np.asarray(core_indices, dtype=np.int64)] = True
+        return mask
+
     def borgatti_everett_correlation(self, core_indices):
-        n = self.A.shape[0]
-        delta = self.create_core_periphery_matrix(n, core_indices)
-        A_flat = self.A.flatten()
-        delta_flat = delta.flatten()
-        # Compute Pearson correlation
-        rho = self.pearson_correlation(A_flat, delta_flat)
-        return rho
+        # n x n 패턴 행렬 없이 CSR에서 O(m)으로 Pearson 상관계수 계산
+        csr = snapshot_of(self.G)
+        return be_rho(csr.indptr, csr.indices, csr.data, self.core_mask(core_indices))
 
     def fitness_function_borgatti_everett(self, ga_instance, solution, solution_idx):
-        core_indices = np.where(solution > 0.5)[0]  # Vectorized way to find core indices
-        if core_indices.size == 0:
+        core_mask = solution > 0.5
+        if not core_mask.any():
             return -1
-        rho = self.borgatti_everett_correlation(core_indices)
+        csr = snapshot_of(self.G)
+        rho = be_rho(csr.indptr, csr.indices, csr.data, core_mask)
         return rho if np.isfinite(rho) else -1
 
     def initial_sol(self) :
@@ -121,8 +89,17 @@ class Borgatti_Everett:
         return initial_population
 
 
-    def fit(self, iter=1000):
+    def fit(self, iter=1000, engine="numba", population_size=64, elite=2, mutation_rate=None, patience=200, seed=None):
         initial_population = self.initial_sol()
+        if engine == "numba":
+            # 적합도를 CSR 위에서 병렬로 평가하는 numba GA (세번째 값은 실제 진행한 세대 수)
+            solution, fitness, generations = run_genetic(
+                snapshot_of(self.G), initial_population, OBJECTIVE_BE_RHO,
+                generations=iter, population_size=population_size, elite=elite,
+                mutation_rate=mutation_rate, patience=patience, seed=seed,
+            )
+            return solution, fitness, generations
+
         ga_instance_borgatti = pygad.GA(
             num_generations=iter,
             num_parents_mating=2,
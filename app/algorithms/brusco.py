@@ -1,5 +1,7 @@
 import numpy as np
-import numba
+from graph_snapshot import snapshot_of
+from algorithms.genetic import run_genetic, OBJECTIVE_BRUSCO_Z
+from algorithms.cp_kernels import brusco_z
 import math
 import pygad
 
@@ -9,39 +11,18 @@ class Brusco:
         self.A = A
         self.n = n
 
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def calculate_brusco_metric(A, n, core_indices, periphery_indices):
-        core_core_edges = 0
-        periphery_periphery_edges = 0
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                if i in core_indices and j in core_indices:
-                    if A[i, j] == 0:
-                        core_core_edges += 1
-                if i in periphery_indices and j in periphery_indices:
-                    if A[i, j] == 1:
-                        periphery_periphery_edges += 1
-
-        return core_core_edges + periphery_periphery_edges
-
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def get_periphery_indices(n, core_indices) :
-        periphery_indices = [i for i in range(n) if i not in core_indices]
-        return periphery_indices
-
     def brusco_metric(self, core_indices):
-        n = self.A.shape[0]
-        periphery_indices = self.get_periphery_indices(n, core_indices)
-        return self.calculate_brusco_metric(self.A, n, core_indices, periphery_indices)
+        # 코어 마스크와 CSR 엣지로 O(m)에 Z 계산
+        csr = snapshot_of(self.G)
+        core_mask = np.zeros(csr.n, dtype=np.bool_)
+        core_mask[np.asarray(core_indices, dtype=np.int64)] = True
+        return brusco_z(csr.indptr, csr.indices, csr.data, core_mask)
 
     def fitness_function_brusco_metric(self, ga_instance, solution, solution_idx):
-        core_indices = [i for i, gene in enumerate(solution) if gene > 0.5]
-        if not core_indices:
-            return -1
-        Z = self.brusco_metric(core_indices)
+        # 빈 코어도 Z가 정의되므로 -1로 처리하지 않음 (Z >= 0이라 -1이 항상 최선이 됨)
+        core_mask = solution > 0.5
+        csr = snapshot_of(self.G)
+        Z = brusco_z(csr.indptr, csr.indices, csr.data, core_mask)
         return -Z if np.isfinite(Z) else 0
     
     def initial_sol(self) :
@@ -101,8 +82,17 @@ class Brusco:
         return initial_population
 
 
-    def fit(self, iter=1000):
+    def fit(self, iter=1000, engine="numba", population_size=64, elite=2, mutation_rate=None, patience=200, seed=None):
         initial_population = self.initial_sol()
+        if engine == "numba":
+            # 적합도를 CSR 위에서 병렬로 평가하는 numba GA (세번째 값은 실제 진행한 세대 수)
+            solution, fitness, generations = run_genetic(
+                snapshot_of(self.G), initial_population, OBJECTIVE_BRUSCO_Z,
+                generations=iter, population_size=population_size, elite=elite,
+                mutation_rate=mutation_rate, patience=patience, seed=seed,
+            )
+            return solution, -fitness, generations
+
         ga_instance_brusco = pygad.GA(
             num_generations=iter,
             num_parents_mating=2,
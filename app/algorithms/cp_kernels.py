@@ -0,0 +1,188 @@
+import numpy as np
+import numba
+
+# CSR 기반 core-periphery 목적함수 커널 (core_mask: 길이 n의 bool 배열)
+
+
+@numba.jit(nopython=True, cache=True)
+def pearson_from_sums(N, sum_x, sum_x_sq, sum_y, sum_y_sq, sum_xy):
+    numerator = sum_xy - (sum_x * sum_y / N)
+    denominator = np.sqrt((sum_x_sq - sum_x ** 2 / N) * (sum_y_sq - sum_y ** 2 / N))
+    if denominator == 0:
+        return 0.0
+    return numerator / denominator
+
+
+@numba.jit(nopython=True, cache=True)
+def be_rho_from_counts(n, k, total, total_sq, touching):
+    """
+    Borgatti-Everett rho in O(1) from sufficient statistics.
+
+    Correlation over all n*n cells of the adjacency matrix and the ideal
+    pattern delta (delta_ij = 1 when i or j is core, diagonal included).
+    total / total_sq are the sum and squared sum of all stored adjacency
+    entries and touching is the sum of the entries in a core row or column
+    (each undirected edge counts twice, as in the dense matrix).
+    """
+    N = float(n) * n
+    ones = N - float(n - k) * (n - k)
+    return pearson_from_sums(N, total, total_sq, ones, ones, touching)
+
+
+@numba.jit(nopython=True, cache=True)
+def be_touching(indptr, indices, data, core_mask):
+    """Sum of adjacency entries in core rows or columns, O(m)."""
+    n = indptr.shape[0] - 1
+    touching = 0.0
+    for i in range(n):
+        for e in range(indptr[i], indptr[i + 1]):
+            if core_mask[i] or core_mask[indices[e]]:
+                touching += data[e]
+    return touching
+
+
+@numba.jit(nopython=True, cache=True)
+def be_rho(indptr, indices, data, core_mask):
+    """Borgatti-Everett rho of a binary partition in O(m), without the n x n pattern."""
+    n = indptr.shape[0] - 1
+    k = 0
+    for i in range(n):
+        if core_mask[i]:
+            k += 1
+    total = 0.0
+    total_sq = 0.0
+    for e in range(data.shape[0]):
+        total += data[e]
+        total_sq += data[e] * data[e]
+    return be_rho_from_counts(n, k, total, total_sq, be_touching(indptr, indices, data, core_mask))
+
+
+@numba.jit(nopython=True, cache=True)
+def brusco_z_from_counts(k, core_core_edges, periphery_periphery_edges):
+    """Brusco Z: missing core-core pairs plus periphery-periphery edges."""
+    return k * (k - 1) // 2 - core_core_edges + periphery_periphery_edges
+
+
+@numba.jit(nopython=True, cache=True)
+def brusco_z(indptr, indices, data, core_mask):
+    """
+    Brusco Z of a binary partition in O(m). Pairs are counted like the dense
+    definition: a core-core pair is present when A_ij != 0 and a
+    periphery-periphery pair is an edge when A_ij == 1; the diagonal is
+    ignored.
+    """
+    n = indptr.shape[0] - 1
+    k = 0
+    core_core = 0
+    periphery_periphery = 0
+    for i in range(n):
+        if core_mask[i]:
+            k += 1
+        for e in range(indptr[i], indptr[i + 1]):
+            j = indices[e]
+            if j <= i:
+                continue
+            if core_mask[i] and core_mask[j]:
+                if data[e] != 0:
+                    core_core += 1
+            elif not core_mask[i] and not core_mask[j]:
+                if data[e] == 1:
+                    periphery_periphery += 1
+    return brusco_z_from_counts(k, core_core, periphery_periphery)
+
+
+@numba.jit(nopython=True, cache=True)
+def cp_density_from_counts(n, k, core_core_edges, core_periphery_edges, periphery_periphery_edges, gamma, beta):
+    """
+    Low-rank core CP density from block edge counts. Blocks with zero volume
+    (fewer than two core or periphery nodes) contribute 0.
+    """
+    vol_cc = 0.5 * k * (k - 1)
+    vol_cp = float(k) * (n - k)
+    vol_pp = 0.5 * (n - k) * (n - k - 1)
+    density = 0.0
+    if vol_cc > 0:
+        density += core_core_edges / vol_cc
+    if vol_cp > 0:
+        density += core_periphery_edges / vol_cp
+    if vol_pp > 0:
+        density -= periphery_periphery_edges / vol_pp
+    return density - gamma * (k / n) - beta
+
+
+@numba.jit(nopython=True, cache=True)
+def block_edge_counts(indptr, indices, core_mask):
+    """(E_cc, E_cp, E_pp) of a partition; every undirected edge and self loop counted once."""
+    n = indptr.shape[0] - 1
+    e_cc = 0
+    e_cp = 0
+    e_pp = 0
+    for i in range(n):
+        for e in range(indptr[i], indptr[i + 1]):
+            j = indices[e]
+            if j < i:
+                continue
+            if core_mask[i] and core_mask[j]:
+                e_cc += 1
+            elif core_mask[i] or core_mask[j]:
+                e_cp += 1
+            else:
+                e_pp += 1
+    return e_cc, e_cp, e_pp
+
+
+@numba.jit(nopython=True, cache=True)
+def sweep_cut_counts(indptr, indices, order):
+    """
+    Block edge counts of every prefix cut of `order`: entry nc of the returned
+    arrays is (E_cc, E_cp, E_pp) with the first nc nodes of `order` as core.
+    Nodes enter the core one at a time, so all n + 1 cuts cost O(n + m).
+    """
+    n = indptr.shape[0] - 1
+    in_core = np.zeros(n, dtype=np.bool_)
+    e_cc = np.zeros(n + 1, dtype=np.int64)
+    e_cp = np.zeros(n + 1, dtype=np.int64)
+    e_pp = np.zeros(n + 1, dtype=np.int64)
+    for i in range(n):
+        for e in range(indptr[i], indptr[i + 1]):
+            if indices[e] >= i:
+                e_pp[0] += 1
+    for t in range(n):
+        v = order[t]
+        core_neighbours = 0
+        periphery_neighbours = 0
+        loops = 0
+        for e in range(indptr[v], indptr[v + 1]):
+            u = indices[e]
+            if u == v:
+                loops += 1
+            elif in_core[u]:
+                core_neighbours += 1
+            else:
+                periphery_neighbours += 1
+        in_core[v] = True
+        e_cc[t + 1] = e_cc[t] + core_neighbours + loops
+        e_cp[t + 1] = e_cp[t] + periphery_neighbours - core_neighbours
+        e_pp[t + 1] = e_pp[t] - periphery_neighbours - loops
+    return e_cc, e_cp, e_pp
+
+
+@numba.jit(nopython=True, cache=True)
+def sweep_cut(indptr, indices, order, lo, hi, gamma, beta):
+    """
+    Best prefix cut of `order` for the CP density, trying core sizes lo..hi.
+    Returns (best core size, density of every tried size); ties go to the
+    smallest size.
+    """
+    n = indptr.shape[0] - 1
+    e_cc, e_cp, e_pp = sweep_cut_counts(indptr, indices, order)
+    values = np.empty(max(hi - lo + 1, 0))
+    best_nc = -1
+    best = -np.inf
+    for nc in range(lo, hi + 1):
+        value = cp_density_from_counts(n, nc, e_cc[nc], e_cp[nc], e_pp[nc], gamma, beta)
+        values[nc - lo] = value
+        if value > best:
+            best = value
+            best_nc = nc
+    return best_nc, values
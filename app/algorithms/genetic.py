@@ -0,0 +1,131 @@
+import numpy as np
+import numba
+from algorithms.cp_kernels import be_rho, brusco_z
+from algorithms.random_streams import stream_seed, uniform, randint
+
+# 이진 코어 벡터용 유전 알고리즘 (numba). 개체 = 길이 n의 uint8 벡터, 1이면 코어.
+
+OBJECTIVE_BE_RHO = 0      # 적합도 = rho
+OBJECTIVE_BRUSCO_Z = 1    # 적합도 = -Z
+
+
+@numba.jit(nopython=True, cache=True)
+def solution_fitness(indptr, indices, data, solution, objective):
+    """Fitness of one 0/1 solution; an empty core scores -1 for rho."""
+    core_mask = solution > 0
+    if objective == OBJECTIVE_BE_RHO:
+        if not core_mask.any():
+            return -1.0
+        rho = be_rho(indptr, indices, data, core_mask)
+        return rho if np.isfinite(rho) else -1.0
+    return -float(brusco_z(indptr, indices, data, core_mask))
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def evaluate_population(indptr, indices, data, population, objective):
+    """Fitness of every row of `population`, evaluated in parallel."""
+    fitness = np.empty(population.shape[0])
+    for p in numba.prange(population.shape[0]):
+        fitness[p] = solution_fitness(indptr, indices, data, population[p], objective)
+    return fitness
+
+
+@numba.jit(nopython=True, cache=True)
+def _tournament(state, fitness, size):
+    state, best = randint(state, fitness.shape[0])
+    for _ in range(size - 1):
+        state, other = randint(state, fitness.shape[0])
+        if fitness[other] > fitness[best]:
+            best = other
+    return state, best
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def _breed(population, fitness, order, elite, mutation_rate, tournament_size, seed, generation):
+    """
+    Next generation: the `elite` best rows are copied unchanged, the rest are
+    uniform crossovers of two tournament winners followed by bit-flip mutation.
+    """
+    size, n = population.shape
+    children = np.empty_like(population)
+    for c in range(elite):
+        children[c] = population[order[c]]
+    for c in numba.prange(elite, size):
+        state = stream_seed(seed, generation, c)
+        state, a = _tournament(state, fitness, tournament_size)
+        state, b = _tournament(state, fitness, tournament_size)
+        for g in range(n):
+            state, u = uniform(state)
+            gene = population[a, g] if u < 0.5 else population[b, g]
+            state, u = uniform(state)
+            if u < mutation_rate:
+                gene = 1 - gene
+            children[c, g] = gene
+    return children
+
+
+@numba.jit(nopython=True, cache=True)
+def evolve(indptr, indices, data, population, objective, generations, elite,
+           mutation_rate, tournament_size, patience, tol, seed):
+    """
+    Run the GA starting from `population` (uint8, one solution per row).
+    Stops after `generations` or when the best fitness has not improved by
+    more than `tol` for `patience` generations (patience <= 0 disables it).
+    Returns (best solution, best fitness, generations run).
+    """
+    fitness = evaluate_population(indptr, indices, data, population, objective)
+    best_idx = np.argmax(fitness)
+    best = population[best_idx].copy()
+    best_fitness = fitness[best_idx]
+    stale = 0
+    generation = 0
+    while generation < generations:
+        generation += 1
+        order = np.argsort(-fitness)
+        population = _breed(population, fitness, order, elite, mutation_rate, tournament_size, seed, generation)
+        fitness = evaluate_population(indptr, indices, data, population, objective)
+        best_idx = np.argmax(fitness)
+        if fitness[best_idx] > best_fitness + tol:
+            best_fitness = fitness[best_idx]
+            best = population[best_idx].copy()
+            stale = 0
+        else:
+            stale += 1
+            if patience > 0 and stale >= patience:
+                break
+    return best, best_fitness, generation
+
+
+def seed_population(initial_population, population_size, mutation_rate, rng):
+    """
+    Fill a population from seed solutions: every seed is kept once and the
+    remaining rows are mutated copies of the seeds.
+    """
+    seeds = np.asarray(initial_population, dtype=np.uint8).reshape(-1, np.shape(initial_population)[-1])
+    population_size = max(population_size, seeds.shape[0])
+    picks = np.concatenate((np.arange(seeds.shape[0]), rng.integers(0, seeds.shape[0], population_size - seeds.shape[0])))
+    population = seeds[picks].copy()
+    flips = rng.random(population[seeds.shape[0]:].shape) < mutation_rate
+    population[seeds.shape[0]:] ^= flips.astype(np.uint8)
+    return population
+
+
+def run_genetic(snapshot, initial_population, objective, generations=1000, population_size=64,
+                elite=2, mutation_rate=None, tournament_size=3, patience=200, tol=1e-12, seed=None):
+    """
+    Maximise `objective` over binary core vectors of `snapshot`.
+    Returns (best solution as int array, best fitness, generations run).
+    """
+    rng = np.random.default_rng(seed)
+    n = snapshot.n
+    if mutation_rate is None:
+        # 세대당 평균 한두 개 노드를 뒤집는 정도
+        mutation_rate = min(0.05, 1.5 / max(n, 1))
+    population = seed_population(initial_population, population_size, max(mutation_rate, 0.05), rng)
+    elite = int(min(max(elite, 0), population.shape[0] - 1))
+    best, best_fitness, generations_run = evolve(
+        snapshot.indptr, snapshot.indices, snapshot.data, population, objective,
+        int(generations), elite, float(mutation_rate), int(max(tournament_size, 1)),
+        int(patience), float(tol), int(rng.integers(0, 2 ** 63 - 1)),
+    )
+    return best.astype(np.int64), float(best_fitness), int(generations_run)
@@ -1,160 +1,238 @@
 import numpy as np
-import networkx as nx
 import numba
+import hashlib
+from graph_snapshot import GraphSnapshot, snapshot_of, bfs_distances, core_numbers
+from null_models import null_graphs
+
+# null model 기준값(G_prime_average)과 전체 노드 closeness는 사용자가 고른 core와
+# 무관하므로 그래프별로 한 번만 계산해 메모리와 그래프 저장소에 보관
+BASELINE_NAMESPACE = "holme_baseline"
+CLOSENESS_NAMESPACE = "holme_closeness"
+REFRESH_BASELINE_SAMPLES = 10
+
+_baseline_cache = {}
+_closeness_cache = {}
+
+
+def _degree_key(G, seed):
+    snapshot = snapshot_of(G)
+    degrees = np.diff(snapshot.binary_adjacency().indptr).astype(np.int64)
+    return f"{hashlib.sha1(degrees.tobytes()).hexdigest()}_{seed}"
+
+
+def _structure_key(G):
+    A = snapshot_of(G).binary_adjacency()
+    digest = hashlib.sha1(np.asarray(A.indptr, dtype=np.int64).tobytes())
+    digest.update(np.asarray(A.indices, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
 
 class Holme:
-    def __init__(self, G):
+    def __init__(self, G, store=None):
         self.G = G
+        # graph_store.GraphStore (선택): 기준값을 디스크에 보관해 재시작 후에도 재사용
+        self.store = store
 
     @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def _numba_closeness_centrality(n, U, shortest_paths):
-        total_distance = 0.0
-        n_U = len(U)
-        for i in U:
-            for j in U:
-                if i != j:
-                    total_distance += shortest_paths[i, j]
-        
-        if total_distance == 0:
+    def _closeness(n, n_U, total_distance):
+        # 도달하지 못한 쌍의 거리는 0으로 취급
+        if n_U == 0 or total_distance == 0:
             return 0
-        
-        return 1/(total_distance / (n_U * (n - 1))) 
+        return 1/(total_distance / (n_U * (n - 1)))
+
+    @staticmethod
+    @numba.jit(nopython=True, parallel=True, cache=True)
+    def _subset_distance_sum(indptr, indices, sources, in_subset):
+        """Sum of BFS distances from every source to the reached nodes of the subset."""
+        n = indptr.shape[0] - 1
+        sums = np.zeros(sources.shape[0], dtype=np.int64)
+        for s in numba.prange(sources.shape[0]):
+            dist = np.full(n, -1, dtype=np.int64)
+            queue = np.empty(n, dtype=np.int64)
+            count = bfs_distances(indptr, indices, sources[s], dist, queue)
+            total = 0
+            for q in range(count):
+                v = queue[q]
+                if in_subset[v]:
+                    total += dist[v]
+            sums[s] = total
+        return sums.sum()
+
+    @staticmethod
+    @numba.jit(nopython=True, parallel=True, cache=True)
+    def _core_distance_buckets(indptr, indices, core, k_max):
+        """
+        One BFS per node; the distance d(i, j) goes to bucket min(core_i, core_j),
+        so the distance sum inside the k-core is the suffix sum of buckets >= k.
+        """
+        n = indptr.shape[0] - 1
+        n_chunks = min(n, 256)
+        partial = np.zeros((n_chunks, k_max + 1), dtype=np.int64)
+        for c in numba.prange(n_chunks):
+            dist = np.full(n, -1, dtype=np.int64)
+            queue = np.empty(n, dtype=np.int64)
+            for s in range(c * n // n_chunks, (c + 1) * n // n_chunks):
+                count = bfs_distances(indptr, indices, s, dist, queue)
+                core_s = core[s]
+                for q in range(count):
+                    v = queue[q]
+                    partial[c, min(core_s, core[v])] += dist[v]
+                for q in range(count):
+                    dist[queue[q]] = -1
+        buckets = np.zeros(k_max + 1, dtype=np.int64)
+        for c in range(n_chunks):
+            buckets += partial[c]
+        return buckets
+
+    @staticmethod
+    def _csr(G_or_snapshot):
+        snapshot = G_or_snapshot if isinstance(G_or_snapshot, GraphSnapshot) else snapshot_of(G_or_snapshot)
+        A = snapshot.binary_adjacency()
+        return snapshot, np.asarray(A.indptr, dtype=np.int64), np.asarray(A.indices, dtype=np.int32)
 
     def closeness_centrality(self, G, U):
         """
         Calculate the closeness centrality for a subset U of nodes in graph G.
         """
-        n = len(G)
+        U = list(U) if U is not None else []
         n_U = len(U)
         if n_U == 0:
             return 0
-        
-        # Generate shortest path matrix
-        node_list = list(G.nodes)
-        node_index = {node: idx for idx, node in enumerate(node_list)}
-        shortest_paths = np.full((n, n), np.inf)
-
-        for i in U:
-            sp = nx.single_source_shortest_path_length(G, i)
-            for j in sp:
-                shortest_paths[node_index[i], node_index[j]] = sp[j]
-        
-        # Replace np.inf with 0 for disconnected pairs
-        shortest_paths[np.isinf(shortest_paths)] = 0
-        
-        U_indices = np.array([node_index[i] for i in U])
-        
-        return self._numba_closeness_centrality(n, U_indices, shortest_paths)
+        snapshot, indptr, indices = self._csr(G)
+        node_index = {node: idx for idx, node in enumerate(snapshot.labels)}
+        sources = np.array([node_index[i] for i in U], dtype=np.int64)
+        in_subset = np.zeros(snapshot.n, dtype=np.bool_)
+        in_subset[sources] = True
+        total_distance = self._subset_distance_sum(indptr, indices, sources, in_subset)
+        return self._closeness(snapshot.n, n_U, float(total_distance))
 
-    def find_best_k_core(self, G):
+    def k_core_closeness(self, G_or_snapshot):
         """
-        Find the k-core that maximizes the closeness centrality.
+        Closeness of every nested k-core from one core decomposition and one
+        all-source BFS pass. Returns (core numbers, closeness of V,
+        best k, closeness of the best k-core); the best k is the smallest k
+        with maximal closeness (0 when the graph has no edges).
         """
-        best_k_core = None
+        snapshot, indptr, indices = self._csr(G_or_snapshot)
+        n = snapshot.n
+        core = core_numbers(indptr, indices)
+        k_max = int(core.max()) if n else 0
+        buckets = self._core_distance_buckets(indptr, indices, core, k_max)
+        # 큰 k부터 shell을 더해가며 k-core 크기와 거리 합을 누적
+        sizes = np.cumsum(np.bincount(core, minlength=k_max + 1)[::-1])[::-1]
+        distance_sums = np.cumsum(buckets[::-1])[::-1]
+
+        C_C_V = self._closeness(n, n, float(distance_sums[0])) if n else 0
+        best_k = 0
         max_closeness = -1
-        
-        k = 1
-        while True:
-            k_core = nx.k_core(G, k)
-            if k_core.number_of_nodes() == 0:
-                break
-            k_core_nodes = list(k_core.nodes)
-            cc = self.closeness_centrality(G, k_core_nodes)
+        for k in range(1, k_max + 1):
+            cc = self._closeness(n, int(sizes[k]), float(distance_sums[k]))
             if cc > max_closeness:
                 max_closeness = cc
-                best_k_core = k_core_nodes
-            k += 1
-        
-        return best_k_core
+                best_k = k
+        return core, C_C_V, best_k, max(max_closeness, 0)
+
+    def find_best_k_core(self, G):
+        """
+        Find the k-core that maximizes the closeness centrality.
+        """
+        core, _, best_k, _ = self.k_core_closeness(G)
+        if best_k == 0:
+            return []
+        labels = snapshot_of(G).labels
+        return [labels[i] for i in np.flatnonzero(core >= best_k)]
+
+    def _cached(self, cache, namespace, key):
+        value = cache.get(key)
+        if value is None and self.store is not None:
+            value = self.store.get_value(namespace, key)
+            if value is not None:
+                cache[key] = value
+        return value
+
+    def _remember(self, cache, namespace, key, value):
+        cache[key] = value
+        if self.store is not None:
+            self.store.put_value(namespace, key, value)
+
+    def graph_closeness(self, G):
+        """Closeness of the whole node set, cached per graph structure."""
+        key = _structure_key(G)
+        C_C_V = self._cached(_closeness_cache, CLOSENESS_NAMESPACE, key)
+        if C_C_V is None:
+            _, C_C_V, _, _ = self.k_core_closeness(G)
+            self._remember(_closeness_cache, CLOSENESS_NAMESPACE, key, C_C_V)
+        return C_C_V
 
-    def holme_metric(self, G, n_iter):
+    def null_baseline(self, G, n_iter=None, seed=0):
+        """
+        G_prime_average: mean core centrality of the best k-core over
+        configuration-model graphs with G's degree sequence. The per-graph
+        values are cached per degree sequence and seed; n_iter=None uses all
+        cached values (at least REFRESH_BASELINE_SAMPLES).
+        """
+        key = _degree_key(G, seed)
+        samples = self._cached(_baseline_cache, BASELINE_NAMESPACE, key) or []
+        if n_iter is None:
+            n_iter = max(len(samples), REFRESH_BASELINE_SAMPLES)
+        if len(samples) < n_iter:
+            samples = list(samples)
+            # 앙상블의 i번째 그래프는 항상 같으므로 부족한 만큼만 추가 계산
+            for null_snapshot in null_graphs(G, n_iter, seed=seed)[len(samples):]:
+                _, C_C_V_prime, _, C_C_prime = self.k_core_closeness(null_snapshot)
+                samples.append(C_C_prime / C_C_V_prime)
+            self._remember(_baseline_cache, BASELINE_NAMESPACE, key, samples)
+        return np.mean(samples[:n_iter])
+
+    def holme_metric(self, G, n_iter, seed=0):
         """
         Calculate the CP metric for graph G with the best k-core.
         """
-        V = set(G.nodes)
-        C_C_V = self.closeness_centrality(G, V)
+        # core 분해 한 번과 BFS 한 번으로 전체/모든 k-core의 closeness 계산
+        core, C_C_V, best_k, C_C_core = self.k_core_closeness(G)
+        self._remember(_closeness_cache, CLOSENESS_NAMESPACE, _structure_key(G), C_C_V)
         
         if C_C_V == 0:
             return 0
         
-        best_k_core_nodes = self.find_best_k_core(G)
-        C_C_core = self.closeness_centrality(G, best_k_core_nodes)
-        
+
         core_centrality = C_C_core / C_C_V
         
-        sum_random = []
-        for _ in range(n_iter):
-            degree_sequence = [d for _, d in G.degree()]
-            G_random = nx.configuration_model(degree_sequence)
-            G_random = nx.Graph(G_random)
-            G_random.remove_edges_from(nx.selfloop_edges(G_random))
-            C_C_V_prime = self.closeness_centrality(G_random, set(G_random.nodes))
-            best_k_core_nodes_prime = self.find_best_k_core(G_random)
-            C_C_prime = self.closeness_centrality(G_random, best_k_core_nodes_prime)
-
-            core_centrality_prime = C_C_prime / C_C_V_prime
-            sum_random.append(core_centrality_prime)
-        
-        G_prime_average = np.mean(sum_random)
+        G_prime_average = self.null_baseline(G, n_iter, seed=seed)
         
         c_cp = core_centrality - G_prime_average
-        r_nodes = list(G.nodes())
-        r_index = [r_nodes.index(i) for i in best_k_core_nodes]
-
-        n = self.G.number_of_nodes()
-        core_indices = [0 for _ in range(n)]
-        for i in r_index:
-            core_indices[i] = 1
-
+        # 스냅샷의 노드 순서 = G.nodes() 순서
+        core_indices = (core >= best_k).astype(int).tolist()
 
         return c_cp, core_indices, core_centrality
     
-    def holme_refresh(self, G, core_indices):
+    def holme_refresh(self, G, core_indices, seed=0):
         """
         Refresh the core centrality based on a pre-computed set of core indices.
+        The whole-graph closeness and the null-model baseline come from the
+        cache, so this costs one subset-closeness evaluation.
 
         Parameters:
         - G: the graph
-        - core_indices: a list or array indicating core nodes (1 for core, 0 for non-core)
+        - core_indices: the core nodes (node identifiers of G)
         
         Returns:
-        - core centrality of the provided core indices
+        - (C_cp, core centrality) of the provided core
         """
-        V = set(G.nodes)
-        
-        # Calculate closeness centrality for the entire graph
-        C_C_V = self.closeness_centrality(G, V)
+        # Closeness centrality for the entire graph (cached)
+        C_C_V = self.graph_closeness(G)
         
-        print(C_C_V)
         if C_C_V == 0:
             return 0
         
-        # If core_indices is an index-based array, convert it back to node identifiers
-        node_list = list(G.nodes)
-        
         # Calculate closeness centrality for the core nodes
         C_C_core = self.closeness_centrality(G, core_indices)
         
-        print(C_C_core)
         # Calculate and return the core centrality
         core_centrality = C_C_core / C_C_V
 
-        sum_random = []
-        for _ in range(10):
-            degree_sequence = [d for _, d in G.degree()]
-            G_random = nx.configuration_model(degree_sequence)
-            G_random = nx.Graph(G_random)
-            G_random.remove_edges_from(nx.selfloop_edges(G_random))
-            C_C_V_prime = self.closeness_centrality(G_random, set(G_random.nodes))
-            best_k_core_nodes_prime = self.find_best_k_core(G_random)
-            C_C_prime = self.closeness_centrality(G_random, best_k_core_nodes_prime)
-
-            core_centrality_prime = C_C_prime / C_C_V_prime
-            sum_random.append(core_centrality_prime)
-        
-        G_prime_average = np.mean(sum_random)
+        G_prime_average = self.null_baseline(G, seed=seed)
         
         c_cp = core_centrality - G_prime_average
 
-        return c_cp, core_centrality
\ No newline at end of file
+        return c_cp, core_centrality
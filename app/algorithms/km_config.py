@@ -6,6 +6,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 import matplotlib.colors as mcolors
 from scipy.stats import gaussian_kde
+from null_models import null_graphs
 
 class KM_Config:
     def __init__(self, G, A):
@@ -146,12 +147,13 @@ class KM_Config:
     def randomize_graph(self):
         return nx.configuration_model([degree for _, degree in self.G.degree()])
 
-    def statistical_test_on_core_periphery(self, num_randomization=500, max_updates=100, alpha=0.05):
+    def statistical_test_on_core_periphery(self, num_randomization=500, max_updates=100, alpha=0.05, seed=0):
         c, x, Q_cp_original = self.optimize(max_updates=max_updates)
         
         Q_cp_random_samples = []
-        for _ in range(num_randomization):
-            randomized_graph = self.randomize_graph()
+        # configuration model 앙상블 (multi-edge는 가중치, self loop 유지)
+        for null_snapshot in null_graphs(self.G, num_randomization, model="configuration_multi", seed=seed):
+            randomized_graph = null_snapshot.to_networkx(frozen=True)
             randomized_A = nx.to_numpy_array(randomized_graph)
             km_config_random = KM_Config(randomized_graph, randomized_A)
             _, _, Q_cp_random = km_config_random.optimize(max_updates=max_updates)
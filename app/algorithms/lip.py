@@ -1,70 +1,80 @@
 import numpy as np
 import numba
+from graph_snapshot import snapshot_of
+from algorithms.cp_kernels import brusco_z
 
-class Lip:
-    def __init__(self, G, A):
-        self.G = G
-        self.A = A
 
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def calculate_brusco_metric(A, n, core_indices, periphery_indices):
-        core_core_edges = 0
-        periphery_periphery_edges = 0
+@numba.jit(nopython=True, cache=True)
+def lip_cut(deg, m):
+    """
+    Lip's cut from a degree sequence in O(n log n): with the k highest degree
+    nodes as core, Z(k) = C(k, 2) + m - (sum of their degrees).
+    """
+    n = deg.shape[0]
+    sorted_indices = np.argsort(-deg)
+    Z_best = np.inf
+    k_best = 0
+    Z_influence = np.zeros(n)
+    if n < 2:
+        # 코어를 고를 수 없음: 빈 코어, Z = m
+        return Z_influence, sorted_indices[:0], m
 
-        for i in range(n):
-            for j in range(i + 1, n):
-                if i in core_indices and j in core_indices:
-                    if A[i, j] == 0:
-                        core_core_edges += 1
-                if i in periphery_indices and j in periphery_indices:
-                    if A[i, j] == 1:
-                        periphery_periphery_edges += 1
+    # Z의 초기값을 설정
+    Z = m
+    for k in range(1, n):
+        v_k = sorted_indices[k-1]
+        Z_influence[v_k] = k - 1 - deg[v_k]
+        Z += Z_influence[v_k]
+        
+        if Z < Z_best:
+            Z_best = Z
+            k_best = k
 
-        return core_core_edges + periphery_periphery_edges
-    
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def get_periphery_indices(n, core_indices) :
-        periphery_indices = [i for i in range(n) if i not in core_indices]
-        return periphery_indices
+    S1 = sorted_indices[:k_best]
+    return Z_influence, S1, Z_best
+
+
+class Lip:
+    def __init__(self, G, A=None):
+        self.G = G
+        self.A = A
 
     def brusco_metric(self, core_indices):
-        n = self.A.shape[0]
-        periphery_indices = self.get_periphery_indices(n, core_indices)
-        return self.calculate_brusco_metric(self.A, n, core_indices, periphery_indices)
+        # 코어 마스크와 CSR 엣지로 O(m)에 Z 계산
+        csr = snapshot_of(self.G)
+        core_mask = np.zeros(csr.n, dtype=np.bool_)
+        core_mask[np.asarray(core_indices, dtype=np.int64)] = True
+        return brusco_z(csr.indptr, csr.indices, csr.data, core_mask)
     
     @staticmethod
     @numba.jit(nopython=True, cache=True)
     def calculate_numba(A):
-        n = A.shape[0]
         deg = A.sum(axis=1)
-        sorted_indices = np.argsort(-deg)
-        Z_best = np.inf
-        k_best = 0
-        Z_influence = np.zeros(n)
-
-        # Z의 초기값을 설정
-        Z = 0.5 * deg.sum()
-        for k in range(1, n):
-            v_k = sorted_indices[k-1]
-            Z_influence[v_k] = k - 1 - deg[v_k]
-            Z += Z_influence[v_k]
-            
-            if Z < Z_best:
-                Z_best = Z
-                k_best = k
-
-        S1 = sorted_indices[:k_best]
-        return Z_influence, S1, Z_best
+        return lip_cut(deg, 0.5 * deg.sum())
 
-    def calculate(self):
-        z_influence, cores, z = self.calculate_numba(self.A)
-        n = self.A.shape[0]
-        core_indices = [0 for _ in range(n)]
-        for i in cores:
-            core_indices[i] = 1
+    def calculate(self, mode="auto"):
+        """
+        mode "dense" uses self.A, "sparse" reads degrees from the CSR
+        snapshot; "auto" picks sparse when no dense matrix was given.
+        """
+        if mode == "dense" or (mode == "auto" and self.A is not None):
+            z_influence, cores, z = self.calculate_numba(self.A)
+            n = self.A.shape[0]
+            exact = False
+        else:
+            csr = snapshot_of(self.G)
+            # dense 모드와 같은 가중 차수(A의 행 합)
+            deg = np.asarray(csr.adjacency().sum(axis=1), dtype=np.float64)
+            z_influence, cores, z = lip_cut(deg, 0.5 * deg.sum())
+            n = csr.n
+            # 0/1 인접행렬이고 self loop이 없으면 prefix 합의 Z가 곧 Brusco Z
+            exact = csr.self_loops() == 0 and bool(np.all(csr.data == 1))
 
+        core_indices = np.zeros(n, dtype=np.int64)
+        core_indices[cores] = 1
+        if exact:
+            z = int(round(z))
+        else:
+            z = self.brusco_metric(cores)
+        return z_influence, core_indices.tolist(), z
 
-        z = self.brusco_metric(cores)
-        return z_influence, core_indices, z
\ No newline at end of file
@@ -0,0 +1,192 @@
+import numpy as np
+import numba
+from algorithms.cp_kernels import be_rho_from_counts, brusco_z_from_counts, cp_density_from_counts
+from algorithms.genetic import OBJECTIVE_BE_RHO, OBJECTIVE_BRUSCO_Z
+
+# 이진 core 벡터를 노드 하나씩 뒤집으며 다듬는 local search.
+# 블록 카운트를 유지하므로 한 노드의 flip은 O(deg(v))로 평가됨.
+
+OBJECTIVE_CP_DENSITY = 2  # Low_Rank_Core의 CP density
+
+OBJECTIVES = {"rho": OBJECTIVE_BE_RHO, "Z": OBJECTIVE_BRUSCO_Z, "density": OBJECTIVE_CP_DENSITY}
+
+# counts 배열의 위치
+K, TOUCHING, CC_NONZERO, PP_ONE, E_CC, E_CP, E_PP = range(7)
+
+
+@numba.jit(nopython=True, cache=True)
+def _neighbour_counts(indptr, indices, data, core_mask, v):
+    """
+    For node v: (weight to periphery neighbours, self-loop weight, core
+    neighbours with A != 0, periphery neighbours with A != 0, periphery
+    neighbours with A == 1).
+    """
+    periphery_weight = 0.0
+    loop_weight = 0.0
+    core_nonzero = 0
+    periphery_nonzero = 0
+    periphery_one = 0
+    for e in range(indptr[v], indptr[v + 1]):
+        u = indices[e]
+        w = data[e]
+        if u == v:
+            loop_weight += w
+        elif core_mask[u]:
+            if w != 0:
+                core_nonzero += 1
+        else:
+            periphery_weight += w
+            if w != 0:
+                periphery_nonzero += 1
+            if w == 1:
+                periphery_one += 1
+    return periphery_weight, loop_weight, core_nonzero, periphery_nonzero, periphery_one
+
+
+@numba.jit(nopython=True, cache=True)
+def block_counts(indptr, indices, data, core_mask):
+    """Sufficient statistics of a partition, built by adding core nodes one at a time (O(m))."""
+    n = indptr.shape[0] - 1
+    counts = np.zeros(7)
+    mask = np.zeros(n, dtype=np.bool_)
+    for v in range(n):
+        for e in range(indptr[v], indptr[v + 1]):
+            if indices[e] > v and data[e] != 0:
+                counts[E_PP] += 1
+                if data[e] == 1:
+                    counts[PP_ONE] += 1
+    for v in range(n):
+        if core_mask[v]:
+            _apply_flip(indptr, indices, data, mask, counts, v)
+    return counts
+
+
+@numba.jit(nopython=True, cache=True)
+def _flip_delta(indptr, indices, data, core_mask, counts, v, out):
+    """Write the counts after flipping v into `out` without touching the partition."""
+    periphery_weight, loop_weight, core_nonzero, periphery_nonzero, periphery_one = \
+        _neighbour_counts(indptr, indices, data, core_mask, v)
+    out[:] = counts
+    if core_mask[v]:
+        # core -> periphery: v의 core 이웃은 cp, periphery 이웃은 pp가 됨
+        sign = -1.0
+        out[CC_NONZERO] -= core_nonzero
+        out[PP_ONE] += periphery_one
+        out[E_CC] -= core_nonzero
+        out[E_CP] += core_nonzero - periphery_nonzero
+        out[E_PP] += periphery_nonzero
+    else:
+        sign = 1.0
+        out[CC_NONZERO] += core_nonzero
+        out[PP_ONE] -= periphery_one
+        out[E_CC] += core_nonzero
+        out[E_CP] += periphery_nonzero - core_nonzero
+        out[E_PP] -= periphery_nonzero
+    out[K] += sign
+    # 대칭 행렬에서 (v, u), (u, v) 두 칸이 core 행/열에 들어오거나 빠짐
+    out[TOUCHING] += sign * (2.0 * periphery_weight + loop_weight)
+
+
+@numba.jit(nopython=True, cache=True)
+def _apply_flip(indptr, indices, data, core_mask, counts, v):
+    after = np.empty_like(counts)
+    _flip_delta(indptr, indices, data, core_mask, counts, v, after)
+    counts[:] = after
+    core_mask[v] = not core_mask[v]
+
+
+@numba.jit(nopython=True, cache=True)
+def score_counts(n, counts, total, total_sq, objective, gamma, beta):
+    """Objective to maximise: rho, -Z or CP density."""
+    k = int(counts[K])
+    if objective == OBJECTIVE_BE_RHO:
+        if k == 0:
+            return -1.0
+        return be_rho_from_counts(n, k, total, total_sq, counts[TOUCHING])
+    if objective == OBJECTIVE_BRUSCO_Z:
+        return -float(brusco_z_from_counts(k, counts[CC_NONZERO], counts[PP_ONE]))
+    return cp_density_from_counts(n, k, counts[E_CC], counts[E_CP], counts[E_PP], gamma, beta)
+
+
+@numba.jit(nopython=True, cache=True)
+def refine(indptr, indices, data, core_mask, objective, max_sweeps, tabu_iterations, tabu_tenure, gamma, beta, tol):
+    """
+    Greedy first-improvement sweeps over all nodes until no single flip
+    improves the objective, then an optional tabu phase that always takes
+    the best non-tabu flip (aspiration when it beats the best found).
+    `core_mask` is updated in place to the best partition.
+    Returns (best score, number of applied flips).
+    """
+    n = indptr.shape[0] - 1
+    total = 0.0
+    total_sq = 0.0
+    for e in range(data.shape[0]):
+        total += data[e]
+        total_sq += data[e] * data[e]
+
+    counts = block_counts(indptr, indices, data, core_mask)
+    candidate = np.empty_like(counts)
+    score = score_counts(n, counts, total, total_sq, objective, gamma, beta)
+    flips = 0
+
+    for _ in range(max_sweeps):
+        improved = False
+        for v in range(n):
+            _flip_delta(indptr, indices, data, core_mask, counts, v, candidate)
+            new_score = score_counts(n, candidate, total, total_sq, objective, gamma, beta)
+            if new_score > score + tol:
+                counts[:] = candidate
+                core_mask[v] = not core_mask[v]
+                score = new_score
+                flips += 1
+                improved = True
+        if not improved:
+            break
+
+    if tabu_iterations <= 0 or n == 0:
+        return score, flips
+
+    best_mask = core_mask.copy()
+    best_score = score
+    tabu_until = np.zeros(n, dtype=np.int64)
+    for it in range(1, tabu_iterations + 1):
+        best_v = -1
+        best_move = -np.inf
+        for v in range(n):
+            _flip_delta(indptr, indices, data, core_mask, counts, v, candidate)
+            new_score = score_counts(n, candidate, total, total_sq, objective, gamma, beta)
+            if tabu_until[v] >= it and new_score <= best_score + tol:
+                continue
+            if new_score > best_move:
+                best_move = new_score
+                best_v = v
+        if best_v < 0:
+            break
+        _apply_flip(indptr, indices, data, core_mask, counts, best_v)
+        tabu_until[best_v] = it + tabu_tenure
+        flips += 1
+        if best_move > best_score + tol:
+            best_score = best_move
+            best_mask[:] = core_mask
+    core_mask[:] = best_mask
+    return best_score, flips
+
+
+def refine_partition(snapshot, solution, objective="rho", max_sweeps=100, tabu_iterations=0,
+                     tabu_tenure=None, gamma=1.0, beta=0.0, threshold=0.5):
+    """
+    Polish a binary core vector (values >= threshold are core) on a CSR
+    snapshot. Returns (refined 0/1 int array, objective value, flips), where
+    the value is rho, Z or CP density depending on `objective`.
+    """
+    code = OBJECTIVES[objective]
+    core_mask = np.asarray(solution, dtype=np.float64) >= threshold
+    if tabu_tenure is None:
+        tabu_tenure = max(1, min(snapshot.n // 10, 20))
+    score, flips = refine(
+        snapshot.indptr, snapshot.indices, snapshot.data, core_mask, code,
+        int(max_sweeps), int(tabu_iterations), int(tabu_tenure), float(gamma), float(beta), 1e-12,
+    )
+    if code == OBJECTIVE_BRUSCO_Z:
+        score = -score
+    return core_mask.astype(np.int64), float(score), int(flips)
@@ -1,7 +1,12 @@
 import numpy as np
 import networkx as nx
-from scipy.sparse.linalg import eigs
+from scipy.sparse.linalg import eigsh
 import numba
+from graph_snapshot import snapshot_of
+from algorithms.cp_kernels import block_edge_counts, cp_density_from_counts, sweep_cut
+
+# 노드 수가 이 값 이하이면 dense eigh 사용 (ARPACK은 k < n 필요)
+EIGSH_MIN_NODES = 64
 
 
 class Low_Rank_Core:
@@ -32,76 +37,112 @@ class Low_Rank_Core:
             return len(X) * len(Y)
 
     def calculate_cp_density(self, G, V_C, V_P, gamma=1, beta=0.1):
-        E_VC_VC = 0
-        E_VC_VP = 0
-        E_VP_VP = 0
-        
-        for edge in G.edges():
-            u, v = edge
-            r_nodes = list(G.nodes())
-            u = r_nodes.index(u)
-            v = r_nodes.index(v)
-            if u in V_C and v in V_C:
-                E_VC_VC += 1
-            elif (u in V_C and v in V_P) or (v in V_C and u in V_P):
-                E_VC_VP += 1
-            elif u in V_P and v in V_P:
-                E_VP_VP += 1
-        
-        Vol_VC_VC = self.calculate_vol(V_C, V_C)
-        Vol_VC_VP = self.calculate_vol(V_C, V_P)
-        Vol_VP_VP = self.calculate_vol(V_P, V_P)
-        
+        """
+        CP density of the partition (V_C core, V_P = the other node indices)
+        counted on the CSR snapshot in O(m). Empty blocks contribute 0.
+        """
+        indptr, indices = self._csr(G)
         n = G.number_of_nodes()
-        
-        cp_density = (
-            (E_VC_VC / Vol_VC_VC) +
-            (E_VC_VP / Vol_VC_VP) -
-            (E_VP_VP / Vol_VP_VP) -
-            gamma * abs(len(V_C) / n) -
-            beta
-        )
-        return cp_density
+        core_mask = np.zeros(n, dtype=np.bool_)
+        core_mask[np.fromiter(V_C, dtype=np.int64, count=len(V_C))] = True
+        E_VC_VC, E_VC_VP, E_VP_VP = block_edge_counts(indptr, indices, core_mask)
+        return cp_density_from_counts(n, len(V_C), E_VC_VC, E_VC_VP, E_VP_VP, gamma, beta)
+
+    @staticmethod
+    def _csr(G):
+        # 0/1 인접 구조 (self loop 포함), 노드 순서 = G.nodes()
+        A = snapshot_of(G).binary_adjacency(drop_self_loops=False)
+        return np.asarray(A.indptr, dtype=np.int64), np.asarray(A.indices, dtype=np.int32)
 
     def find_cut(self, G, scores, b):
+        """
+        Sweep the nodes in decreasing score order into the core and keep the
+        core size in [b, n - b] with the highest CP density (gamma=0).
+        """
         sorted_indices = np.argsort(scores)[::-1]
-        
-        best_nc = None
-        max_objective = -np.inf
-        
         n = len(scores)
-        for nc in range(b, n - b + 1):
-            X_C = set(sorted_indices[:nc])
-            Y_C = set(sorted_indices[nc:])
-            
-            objective_value = self.calculate_cp_density(G, X_C, Y_C, gamma=0, beta=0.1)
-            
-            if objective_value > max_objective:
-                max_objective = objective_value
-                best_nc = nc
+        indptr, indices = self._csr(G)
+        best_nc, _ = sweep_cut(indptr, indices, np.ascontiguousarray(sorted_indices), b, n - b, 0.0, 0.1)
         
         V_C = set(sorted_indices[:best_nc])
         V_P = set(sorted_indices[best_nc:])
         
         return V_C, V_P, best_nc
 
+    @staticmethod
+    @numba.jit(nopython=True, parallel=True, cache=True)
+    def _rank2_degrees(l1, l2, u1, u2):
+        """
+        Degree of every node in the thresholded rank-2 graph
+        (l1*u1i*u1j + l2*u2i*u2j > 0.5) without the n x n matrix. Nodes are
+        sorted by u1 once; for each i the pairs far from the threshold are
+        counted by binary search and only the band where the l2 term can
+        decide is checked explicitly. A diagonal hit counts twice, like a
+        self loop in NetworkX.
+        """
+        n = u1.shape[0]
+        order = np.argsort(u1)
+        xs = u1[order]
+        y_max = np.abs(u2).max()
+        degrees = np.zeros(n, dtype=np.int64)
+        for i in numba.prange(n):
+            a = u1[i] * l1
+            b = u2[i] * l2
+            # 경계 근처의 반올림 오차를 흡수할 여유
+            slack = abs(b) * y_max + 1e-9
+            if a == 0:
+                lo, hi = 0, n
+                sure = 0
+            else:
+                t_high = (0.5 + slack) / a
+                t_low = (0.5 - slack) / a
+                if a > 0:
+                    # x_j > t_high 이면 확실히 포함, x_j <= t_low 이면 확실히 제외
+                    hi = np.searchsorted(xs, t_high, side='right')
+                    lo = np.searchsorted(xs, t_low, side='right')
+                    sure = n - hi
+                else:
+                    lo = np.searchsorted(xs, t_high, side='left')
+                    hi = np.searchsorted(xs, t_low, side='left')
+                    sure = lo
+            count = sure
+            for p in range(lo, hi):
+                j = order[p]
+                if u1[i] * u1[j] * l1 + u2[i] * u2[j] * l2 > 0.5:
+                    count += 1
+            if u1[i] * u1[i] * l1 + u2[i] * u2[i] * l2 > 0.5:
+                count += 1
+            degrees[i] = count
+        return degrees
+
+    def rank2_scores(self, G):
+        """Degrees of the thresholded rank-2 approximation of A (the LLC scores)."""
+        A = snapshot_of(G).adjacency()
+        n = A.shape[0]
+        if n <= EIGSH_MIN_NODES:
+            eigenvalues, eigenvectors = np.linalg.eigh(A.toarray())
+            eigenvalues, eigenvectors = eigenvalues[-2:], eigenvectors[:, -2:]
+        else:
+            # 대칭 CSR이므로 eigsh로 가장 큰 두 고유값(LA)
+            eigenvalues, eigenvectors = eigsh(A, k=2, which='LA')
+        return self._rank2_degrees(
+            float(eigenvalues[-1]), float(eigenvalues[-2]),
+            np.ascontiguousarray(eigenvectors[:, -1]), np.ascontiguousarray(eigenvectors[:, -2]),
+        )
+
+    @staticmethod
+    def top_core(scores, beta):
+        """Indices of the int(beta * n) highest scores (all nodes when that is 0, as argsort[-0:])."""
+        core_size = int(beta * len(scores))
+        return np.argsort(scores)[-core_size:]
+
     def low_rank_core(self, beta=None, gamma=0):
         G = self.G
-        A = nx.adjacency_matrix(G).astype(float)
-        eigenvalues, eigenvectors = eigs(A, k=2, which='LR')
-        
-        A_hat = np.outer(eigenvectors[:, 0], eigenvectors[:, 0]) * eigenvalues[0] + \
-                np.outer(eigenvectors[:, 1], eigenvectors[:, 1]) * eigenvalues[1]
-        
-        A_hat_thresh = np.where(A_hat > 0.5, 1, 0)
-        G_hat = nx.from_numpy_array(A_hat_thresh)
-        scores = np.array([G_hat.degree(i) for i in range(G_hat.number_of_nodes())])
+        scores = self.rank2_scores(G)
         
         if beta is not None:
             n = len(scores)
-            core_size = int(beta * n)
-            core_indices = np.argsort(scores)[-core_size:]
-            core_set = set(core_indices)
+            core_set = set(self.top_core(scores, beta).tolist())
             periphery_set = set(range(n)) - core_set
         else:
             b = int(len(scores)*0.1)
@@ -1,10 +1,144 @@
+import multiprocessing
+import os
 import numpy as np
 import networkx as nx
 import numba
+from concurrent.futures import ProcessPoolExecutor
+from scipy.sparse.linalg import eigsh
+from graph_snapshot import GraphSnapshot, snapshot_of
+from graph_store import SharedSnapshot, attach_shared
+
+MINRE_INITS = ("random", "eigen", "als")
+
+
+@numba.jit(nopython=True, cache=True)
+def _csr_matvec(indptr, indices, data, w):
+    n = indptr.shape[0] - 1
+    out = np.zeros(n)
+    for i in range(n):
+        total = 0.0
+        for e in range(indptr[i], indptr[i + 1]):
+            total += data[e] * w[indices[e]]
+        out[i] = total
+    return out
+
+
+@numba.jit(nopython=True, cache=True)
+def _csr_diagonal(indptr, indices, data):
+    n = indptr.shape[0] - 1
+    diag = np.zeros(n)
+    for i in range(n):
+        for e in range(indptr[i], indptr[i + 1]):
+            if indices[e] == i:
+                diag[i] += data[e]
+    return diag
+
+
+@numba.jit(nopython=True, cache=True)
+def minres_gradient_descent(indptr, indices, data, w, tol, max_iter, learning_rate):
+    """
+    Gradient descent on sum_{i != j} (A_ij - w_i w_j)^2 / 2 with the
+    closed-form gradient -2 (A w - diag(A) w - w |w|^2 + w^3), O(m) per step.
+    """
+    diag = _csr_diagonal(indptr, indices, data)
+    for _ in range(max_iter):
+        Aw = _csr_matvec(indptr, indices, data, w)
+        norm_sq = np.sum(w ** 2)
+        gradient = -2 * (Aw - diag * w - w * norm_sq + w ** 3)
+
+        w_new = w - learning_rate * gradient
+
+        if np.linalg.norm(w_new - w) < tol:
+            break
+
+        w = w_new
+
+    return w
+
+
+@numba.jit(nopython=True, cache=True)
+def minres_pre(indptr, indices, data, w):
+    """
+    PRE = 1 - RSS / TSS over the pairs i < j, in O(m) from
+    sum A_ij w_i w_j = (w'Aw - sum A_ii w_i^2) / 2 and
+    sum w_i^2 w_j^2 = ((sum w^2)^2 - sum w^4) / 2.
+    """
+    n = indptr.shape[0] - 1
+    pairs = n * (n - 1) / 2
+    sum_a = 0.0
+    sum_a_sq = 0.0
+    sum_awiwj = 0.0
+    for i in range(n):
+        for e in range(indptr[i], indptr[i + 1]):
+            j = indices[e]
+            if j > i:
+                a = data[e]
+                sum_a += a
+                sum_a_sq += a * a
+                sum_awiwj += a * w[i] * w[j]
+    w_sq = w ** 2
+    sum_ww = (np.sum(w_sq) ** 2 - np.sum(w_sq ** 2)) / 2
+
+    mean_A = sum_a / pairs
+    total_ss = sum_a_sq - 2 * mean_A * sum_a + pairs * mean_A ** 2
+    residual_ss = sum_a_sq - 2 * sum_awiwj + sum_ww
+    return 1 - (residual_ss / total_ss)
+
+
+def _eigen_start(indptr, indices, data):
+    # 가장 큰 고유값의 고유벡터 * sqrt(lambda): A ~ w w^T 의 rank-1 근사
+    n = indptr.shape[0] - 1
+    from scipy import sparse
+    A = sparse.csr_array((data, indices, indptr), shape=(n, n))
+    if n < 3:
+        values, vectors = np.linalg.eigh(A.toarray())
+    else:
+        values, vectors = eigsh(A, k=1, which='LA')
+    value = max(float(values[-1]), 0.0)
+    return np.abs(vectors[:, -1]) * np.sqrt(value)
+
+
+def _als_start(indptr, indices, data, sweeps=20):
+    """Alternating least squares: w_i = sum_{j != i} A_ij w_j / sum_{j != i} w_j^2."""
+    w = _eigen_start(indptr, indices, data)
+    if not np.any(w):
+        w = np.ones(indptr.shape[0] - 1)
+    diag = _csr_diagonal(indptr, indices, data)
+    for _ in range(sweeps):
+        Aw = _csr_matvec(indptr, indices, data, w) - diag * w
+        denom = np.sum(w ** 2) - w ** 2
+        w = np.where(denom > 0, Aw / np.where(denom > 0, denom, 1), 0.0)
+    return w
+
+
+def _initial_w(indptr, indices, data, init, rng):
+    if init == "eigen":
+        return _eigen_start(indptr, indices, data)
+    if init == "als":
+        return _als_start(indptr, indices, data)
+    return rng.random(indptr.shape[0] - 1)
+
+
+def _minres_run(indptr, indices, data, init, entropy, restart, tol, max_iter, learning_rate):
+    # 재시작 하나: 작업 프로세스에서도 실행되며 restart 번호로 독립 난수열 사용
+    rng = np.random.default_rng(np.random.SeedSequence(entropy, spawn_key=(restart,)))
+    w0 = _initial_w(indptr, indices, data, init, rng)
+    if restart > 0 and init != "random":
+        # 결정적 시작점은 재시작마다 작은 잡음을 더해 다른 해를 탐색
+        w0 = w0 * (1 + 0.1 * rng.standard_normal(w0.shape[0]))
+    w = minres_gradient_descent(indptr, indices, data, np.ascontiguousarray(w0, dtype=np.float64), tol, max_iter, learning_rate)
+    return w, minres_pre(indptr, indices, data, w)
+
+
+def _minres_shared_run(handle, init, entropy, restart, tol, max_iter, learning_rate):
+    # 작업 프로세스: 공유 메모리의 CSR을 복사 없이 붙여서 재시작 하나를 실행
+    snapshot = attach_shared(handle)
+    return _minres_run(snapshot.indptr, snapshot.indices, snapshot.data, init, entropy, restart,
+                       tol, max_iter, learning_rate)
 
 
 class Minre:
-    def __init__(self, G, A):
+    def __init__(self, G, A=None):
         self.G = G
         self.A = A
 
@@ -18,62 +152,54 @@ class Minre:
         w_scaled = (w_normalized - w_min) / (w_max - w_min)
         return w_scaled
 
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def calculate_pre(A, w):
-        n = A.shape[0]
-        
-        # ww^T 계산
-        wwT = np.outer(w, w)
-
-        # 비대각선 요소들만 합산하기 위해 직접 반복문을 사용
-        total_ss = 0.0
-        residual_ss = 0.0
-        mean_A = 0.0
-        count = 0
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                mean_A += A[i, j]
-                count += 1
-
-        mean_A /= count
-
-        for i in range(n):
-            for j in range(i + 1, n):
-                total_ss += (A[i, j] - mean_A) ** 2
-                residual_ss += (A[i, j] - wwT[i, j]) ** 2
-        
-        pre = 1 - (residual_ss / total_ss)
-        return pre
-
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def minres_algorithm(A, tol, max_iter, learning_rate):
-        n = A.shape[0]
-        w = np.random.rand(n)
-
-        for _ in range(max_iter):
-            gradient = np.zeros(n)
-            for i in range(n):
-                for j in range(n):
-                    if i != j:
-                        gradient[i] += -2 * (A[i, j] - w[i] * w[j]) * w[j]
-
-            w_new = w - learning_rate * gradient
+    def _csr(self):
+        # A가 주어지면 그 값을, 아니면 그래프의 CSR 스냅샷을 사용
+        if self.A is not None:
+            from scipy import sparse
+            A = sparse.csr_array(np.asarray(self.A, dtype=np.float64))
+        else:
+            A = snapshot_of(self.G).adjacency()
+        return (np.asarray(A.indptr, dtype=np.int64), np.asarray(A.indices, dtype=np.int32),
+                np.asarray(A.data, dtype=np.float64))
 
-            if np.linalg.norm(w_new - w) < tol:
-                break
+    def calculate_pre(self, w):
+        indptr, indices, data = self._csr()
+        return minres_pre(indptr, indices, data, np.asarray(w, dtype=np.float64))
 
-            w = w_new
+    def minres(self, tol=1e-5, max_iter=10000, learning_rate=0.001, cutoff = 0.5,
+               init="random", restarts=1, seed=None, processes=None):
+        """
+        Fit A ~ w w^T off the diagonal. `init` is "random", "eigen" (scaled
+        leading eigenvector) or "als"; with restarts > 1 the runs are spread
+        over worker processes and the w with the best PRE is kept.
+        """
+        if init not in MINRE_INITS:
+            raise ValueError(f"Unknown Minre init: {init}")
+        indptr, indices, data = self._csr()
+        entropy = np.random.SeedSequence(seed).entropy
+        restarts = max(int(restarts), 1)
+        args = (indptr, indices, data, init, entropy)
+        options = (tol, max_iter, learning_rate)
 
-        return w
+        workers = min(processes or os.cpu_count() or 1, restarts)
+        if workers <= 1:
+            runs = [_minres_run(*args, r, *options) for r in range(restarts)]
+        else:
+            # 작업 프로세스는 CSR을 공유 메모리로 받음; numba 병렬 스레드가 돈 뒤의 fork는
+            # 종료 시 멈출 수 있어 spawn 사용
+            snapshot = GraphSnapshot(indptr, indices, data, range(indptr.shape[0] - 1))
+            context = multiprocessing.get_context("spawn")
+            with SharedSnapshot(snapshot) as shared, ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                futures = [pool.submit(_minres_shared_run, shared.handle, init, entropy, r, *options)
+                           for r in range(restarts)]
+                runs = [future.result() for future in futures]
 
-    def minres(self, tol=1e-5, max_iter=10000, learning_rate=0.001, cutoff = 0.5):
-        A = self.A
-        w = self.minres_algorithm(A, tol, max_iter, learning_rate)
-        self.PRE = self.calculate_pre(A, w)
+        w, self.PRE = max(runs, key=lambda run: run[1])
         self.w = self.normalize_w(w)
-        self.indices = np.where(self.w > cutoff)[0]
+        self.indices = self.core_indices(self.w, cutoff)
         return self.w, self.indices, self.PRE
-    
+
+    @staticmethod
+    def core_indices(w, cutoff):
+        """Core nodes for a cutoff on the scaled w (w and PRE do not depend on it)."""
+        return np.where(w > cutoff)[0]
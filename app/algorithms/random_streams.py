@@ -0,0 +1,37 @@
+import numpy as np
+import numba
+
+# numba 커널용 splitmix64 난수열. 상태가 정수 하나라서 prange의 각 반복(개체, 체인)이
+# seed와 인덱스로 독립적이고 재현 가능한 난수열을 가질 수 있음
+
+GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+
+
+@numba.jit(nopython=True, cache=True)
+def splitmix64(state):
+    state = state + GOLDEN
+    z = state
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return state, z ^ (z >> np.uint64(31))
+
+
+@numba.jit(nopython=True, cache=True)
+def stream_seed(seed, a, b):
+    """Starting state of the stream for (seed, a, b), e.g. (seed, generation, individual)."""
+    return np.uint64(seed) ^ (np.uint64(a) * GOLDEN) ^ (np.uint64(b) * np.uint64(0xD1B54A32D192ED03))
+
+
+@numba.jit(nopython=True, cache=True)
+def uniform(state):
+    state, z = splitmix64(state)
+    return state, (z >> np.uint64(11)) * (1.0 / 9007199254740992.0)
+
+
+@numba.jit(nopython=True, cache=True)
+def randint(state, high):
+    state, u = uniform(state)
+    value = int(u * high)
+    if value >= high:
+        value = high - 1
+    return state, value
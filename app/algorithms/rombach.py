@@ -1,9 +1,232 @@
+import multiprocessing
+import os
+import time
 import numpy as np
 import numba
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from simanneal import Annealer
+from graph_snapshot import snapshot_of
+from graph_store import SharedSnapshot, attach_shared
+from algorithms.random_streams import stream_seed, uniform, randint
+
+
+@numba.jit(nopython=True, cache=True)
+def csr_matvec(indptr, indices, data, x):
+    n = indptr.shape[0] - 1
+    out = np.zeros(n)
+    for i in range(n):
+        total = 0.0
+        for e in range(indptr[i], indptr[i + 1]):
+            total += data[e] * x[indices[e]]
+        out[i] = total
+    return out
+
+
+@numba.jit(nopython=True, cache=True)
+def quadratic_form(indptr, indices, data, x):
+    """x^T A x, diagonal included."""
+    return np.dot(x, csr_matvec(indptr, indices, data, x))
+
+
+@numba.jit(nopython=True, cache=True)
+def swap_delta(indptr, indices, data, x, Ax, u, v):
+    """
+    Change of x^T A x when nodes u and v exchange positions (x_u <-> x_v),
+    from their rows only: with d = x_v - x_u,
+    2d (Ax_u - Ax_v) + d^2 (A_uu + A_vv - 2 A_uv).
+    """
+    d = x[v] - x[u]
+    a_uu = 0.0
+    a_uv = 0.0
+    for e in range(indptr[u], indptr[u + 1]):
+        if indices[e] == u:
+            a_uu += data[e]
+        elif indices[e] == v:
+            a_uv += data[e]
+    a_vv = 0.0
+    for e in range(indptr[v], indptr[v + 1]):
+        if indices[e] == v:
+            a_vv += data[e]
+    return 2 * d * (Ax[u] - Ax[v]) + d * d * (a_uu + a_vv - 2 * a_uv)
+
+
+@numba.jit(nopython=True, cache=True)
+def apply_swap(indptr, indices, data, x, Ax, u, v):
+    """Exchange x_u and x_v and update A x over the two neighbour lists."""
+    d = x[v] - x[u]
+    for e in range(indptr[u], indptr[u + 1]):
+        Ax[indices[e]] += data[e] * d
+    for e in range(indptr[v], indptr[v + 1]):
+        Ax[indices[e]] -= data[e] * d
+    x[u], x[v] = x[v], x[u]
+
+
+@numba.jit(nopython=True, cache=True)
+def _metropolis_sweep(indptr, indices, data, order, x, Ax, quality, temperature, steps, state):
+    """
+    `steps` random position swaps at a fixed temperature on one chain
+    (maximising x^T A x). Returns (quality, best quality, best order, rng state).
+    """
+    n = order.shape[0]
+    best_quality = quality
+    best_order = order.copy()
+    for _ in range(steps):
+        state, a = randint(state, n)
+        state, b = randint(state, n)
+        if a == b:
+            continue
+        u = order[a]
+        v = order[b]
+        delta = swap_delta(indptr, indices, data, x, Ax, u, v)
+        accept = delta >= 0
+        if not accept and temperature > 0:
+            state, r = uniform(state)
+            accept = r < np.exp(delta / temperature)
+        if accept:
+            apply_swap(indptr, indices, data, x, Ax, u, v)
+            order[a] = v
+            order[b] = u
+            quality += delta
+            if quality > best_quality:
+                best_quality = quality
+                best_order[:] = order
+    return quality, best_quality, best_order, state
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def parallel_tempering(indptr, indices, data, core_vector, orders, temperatures, rounds, steps_per_round, seed):
+    """
+    Replica-exchange annealing of node orderings. Chain c runs at
+    temperatures[c] (ascending); every round each chain makes
+    `steps_per_round` Metropolis swaps in parallel, A x and the quality are
+    resynchronised, and neighbouring temperatures exchange states with
+    probability min(1, exp((R_hot - R_cold) * (1/T_cold - 1/T_hot))).
+    Returns (best order over all chains, its quality).
+    """
+    n_chains, n = orders.shape
+    x = np.empty((n_chains, n))
+    Ax = np.empty((n_chains, n))
+    quality = np.empty(n_chains)
+    best_quality = np.full(n_chains, -np.inf)
+    best_orders = orders.copy()
+    for c in range(n_chains):
+        x[c, orders[c]] = core_vector
+        Ax[c] = csr_matvec(indptr, indices, data, x[c])
+        quality[c] = np.dot(x[c], Ax[c])
+        best_quality[c] = quality[c]
+
+    exchange_state = stream_seed(seed, rounds + 1, n_chains)
+    for r in range(rounds):
+        for c in numba.prange(n_chains):
+            state = stream_seed(seed, r, c)
+            q, q_best, order_best, state = _metropolis_sweep(
+                indptr, indices, data, orders[c], x[c], Ax[c], quality[c],
+                temperatures[c], steps_per_round, state,
+            )
+            # 반올림 오차 누적을 막기 위해 라운드마다 전체 재계산
+            Ax[c] = csr_matvec(indptr, indices, data, x[c])
+            quality[c] = np.dot(x[c], Ax[c])
+            if q_best > best_quality[c]:
+                best_quality[c] = q_best
+                best_orders[c] = order_best
+
+        # 짝수/홀수 이웃 쌍을 번갈아 교환 시도
+        for c in range(r % 2, n_chains - 1, 2):
+            t_cold = temperatures[c]
+            t_hot = temperatures[c + 1]
+            if t_cold <= 0:
+                continue
+            log_p = (quality[c + 1] - quality[c]) * (1.0 / t_cold - 1.0 / t_hot)
+            exchange_state, u = uniform(exchange_state)
+            if log_p >= 0 or u < np.exp(log_p):
+                tmp_order = orders[c].copy()
+                orders[c] = orders[c + 1]
+                orders[c + 1] = tmp_order
+                tmp = x[c].copy()
+                x[c] = x[c + 1]
+                x[c + 1] = tmp
+                tmp = Ax[c].copy()
+                Ax[c] = Ax[c + 1]
+                Ax[c + 1] = tmp
+                q = quality[c]
+                quality[c] = quality[c + 1]
+                quality[c + 1] = q
+
+    best = np.argmax(best_quality)
+    return best_orders[best], best_quality[best]
+
+
+@numba.jit(nopython=True, cache=True)
+def _sample_swap_deltas(indptr, indices, data, x, Ax, samples, seed):
+    """|quality change| of random swaps from one state, for temperature calibration."""
+    n = x.shape[0]
+    deltas = np.zeros(samples)
+    state = stream_seed(seed, 0, 0)
+    for s in range(samples):
+        state, u = randint(state, n)
+        state, v = randint(state, n)
+        if u != v:
+            deltas[s] = abs(swap_delta(indptr, indices, data, x, Ax, u, v))
+    return deltas
+
+
+def calibrate_temperatures(indptr, indices, data, x, n_chains, seed, samples=2000,
+                           hot_acceptance=0.8, cold_acceptance=0.001):
+    """
+    Geometric temperature ladder from sampled swap deltas: a typical worsening
+    swap is accepted with probability `hot_acceptance` on the hottest chain
+    and a small one with `cold_acceptance` on the coldest.
+    """
+    Ax = csr_matvec(indptr, indices, data, x)
+    deltas = _sample_swap_deltas(indptr, indices, data, x, Ax, samples, seed)
+    deltas = deltas[deltas > 0]
+    if deltas.shape[0] == 0:
+        return np.zeros(n_chains)
+    t_hot = np.mean(deltas) / -np.log(hot_acceptance)
+    t_cold = np.percentile(deltas, 10) / -np.log(cold_acceptance)
+    t_cold = min(t_cold, t_hot)
+    if n_chains == 1:
+        return np.array([t_cold])
+    return np.geomspace(t_cold, t_hot, n_chains)
+
+
+def tempering_order(indptr, indices, data, core_vector, step, chains=8, rounds=None,
+                    temperatures=None, seed=None):
+    """Parallel tempering from the identity ordering; returns (order array, R)."""
+    n = indptr.shape[0] - 1
+    rng = np.random.default_rng(seed)
+    if temperatures is None:
+        # 초기 순서(항등)에서 swap 변화량을 표본 추출해 온도 사다리를 정함
+        temperatures = calibrate_temperatures(indptr, indices, data, core_vector, max(int(chains), 1),
+                                              int(rng.integers(0, 2 ** 63 - 1)))
+    temperatures = np.sort(np.asarray(temperatures, dtype=np.float64))
+    if rounds is None:
+        rounds = max(1, min(100, step // 100))
+    steps_per_round = max(1, int(np.ceil(step / rounds)))
+    orders = np.tile(np.arange(n, dtype=np.int64), (temperatures.shape[0], 1))
+    best_order, best_quality = parallel_tempering(
+        indptr, indices, data, core_vector, orders, temperatures, int(rounds), steps_per_round,
+        int(rng.integers(0, 2 ** 63 - 1)),
+    )
+    return best_order, float(best_quality)
+
+
+def _grid_run(handle, alpha, beta, step, chains, entropy, run, threads):
+    # 작업 프로세스: 공유 메모리의 스냅샷 위에서 (alpha, beta) 한 쌍을 최적화
+    if threads:
+        numba.set_num_threads(threads)
+    snapshot = attach_shared(handle)
+    indptr = np.asarray(snapshot.indptr, dtype=np.int64)
+    indices = np.asarray(snapshot.indices, dtype=np.int32)
+    data = np.asarray(snapshot.data, dtype=np.float64)
+    core_vector = Rombach.core_vector(snapshot.n, alpha, beta)
+    seed = np.random.SeedSequence(entropy, spawn_key=(run,))
+    order, quality = tempering_order(indptr, indices, data, core_vector, step, chains, seed=seed)
+    return alpha, beta, order, quality
+
 
 class Rombach:
-    def __init__(self, graph, A, alpha=0.5, beta=0.8):
+    def __init__(self, graph, A=None, alpha=0.5, beta=0.8):
         self.G = graph
         self.A = A
         self.alpha = alpha
@@ -27,21 +250,39 @@ class Rombach:
     def find_optimal_core_vector(self, A, alpha, beta):
         """최적의 코어 벡터 C*를 찾습니다."""
         N = A.shape[0]
+        return self.core_vector(N, alpha, beta)
+
+    @classmethod
+    def core_vector(cls, N, alpha, beta):
+        """Position i (0-based) of the ordering gets C*_i = g_{alpha, beta}(i + 1)."""
         C_star = np.zeros(N)
         for i in range(1, N + 1):
-            C_star[i - 1] = self.transition_function(i, N, alpha, beta)
+            C_star[i - 1] = cls.transition_function(i, N, alpha, beta)
         return C_star
 
-    def aggregate_core_score(self, A, alpha_values, beta_values):
-        """각 노드의 코어 점수 CS(i)를 계산합니다."""
-        N = A.shape[0]
+    def _csr(self):
+        A = snapshot_of(self.G).adjacency()
+        return (np.asarray(A.indptr, dtype=np.int64), np.asarray(A.indices, dtype=np.int32),
+                np.asarray(A.data, dtype=np.float64))
+
+    def core_quality(self, order, alpha, beta):
+        """R_{alpha, beta} of a node ordering (order[p] = node at position p) in O(m)."""
+        indptr, indices, data = self._csr()
+        order = np.asarray(order, dtype=np.int64)
+        x = np.empty(order.shape[0])
+        x[order] = self.core_vector(order.shape[0], alpha, beta)
+        return quadratic_form(indptr, indices, data, x)
+
+    def aggregate_core_score(self, order, alpha_values, beta_values):
+        """각 노드의 코어 점수 CS(i)를 계산합니다 (order의 위치 기준)."""
+        N = len(order)
         core_scores = np.zeros(N)
         Z = 0  # 정규화 인자
 
         for alpha in alpha_values:
             for beta in beta_values:
-                C_star = self.find_optimal_core_vector(A, alpha, beta)
-                R_gamma = self.calculate_core_quality(A, C_star)
+                C_star = self.core_vector(N, alpha, beta)
+                R_gamma = self.core_quality(order, alpha, beta)
                 core_scores += C_star * R_gamma
                 Z = max(Z, np.max(core_scores))
 
@@ -49,52 +290,107 @@ class Rombach:
         return core_scores, R_gamma
 
     class NodeOrderAnnealer(Annealer):
-        def __init__(self, state, A, alpha, beta, step, parent):
-            self.A = A
-            self.alpha = alpha
-            self.beta = beta
-            self.parent = parent
+        """
+        State: node ordering (state[p] = node at position p). Besides the
+        ordering it keeps x (C* value of every node's position) and A x, so a
+        swap is scored and applied in O(deg(a) + deg(b)); move() returns the
+        energy change and the tracked quality is recomputed every
+        `resync_interval` steps to stop rounding drift.
+        """
+        copy_strategy = 'slice'
+
+        def __init__(self, state, csr, core_vector, step, resync_interval=1000):
+            self.indptr, self.indices, self.data = csr
             self.steps = step  # 총 단계 수
             self.Tmax = 1  # 초기 온도
             self.Tmin = 1e-8  # 최종 온도
+            self.resync_interval = resync_interval
             super().__init__(state)  # 초기 상태 설정
+            order = np.asarray(state, dtype=np.int64)
+            self.x = np.empty(order.shape[0])
+            self.x[order] = core_vector
+            self.Ax = csr_matvec(self.indptr, self.indices, self.data, self.x)
+            self.quality = float(self.x @ self.Ax)
+            self._last = None
+            self._moves = 0
 
         def default_update(self, step, T, E, acceptance, improvement):
             """Silent update, does not output anything."""
             pass
 
+        def _undo_rejected(self):
+            # simanneal은 거절된 이동을 prevState 복사로 되돌림 -> x, Ax도 되돌림
+            if self._last is None:
+                return
+            a, u, v, delta = self._last
+            self._last = None
+            if self.state[a] == u:
+                apply_swap(self.indptr, self.indices, self.data, self.x, self.Ax, u, v)
+                self.quality -= delta
+
         def move(self):
-            """임의의 두 노드를 스왑하여 이웃 상태를 생성합니다."""
+            """임의의 두 노드를 스왑하여 이웃 상태를 생성합니다. 에너지 변화량을 반환."""
+            self._undo_rejected()
             a = np.random.randint(0, len(self.state))
             b = np.random.randint(0, len(self.state))
-            self.state[a], self.state[b] = self.state[b], self.state[a]
+            u, v = self.state[a], self.state[b]
+            if u == v:
+                return 0.0
+            delta = swap_delta(self.indptr, self.indices, self.data, self.x, self.Ax, u, v)
+            apply_swap(self.indptr, self.indices, self.data, self.x, self.Ax, u, v)
+            self.state[a], self.state[b] = v, u
+            self.quality += delta
+            self._last = (a, u, v, delta)
+
+            self._moves += 1
+            drift = 0.0
+            if self._moves % self.resync_interval == 0:
+                self.Ax = csr_matvec(self.indptr, self.indices, self.data, self.x)
+                exact = float(self.x @ self.Ax)
+                drift = exact - self.quality
+                self.quality = exact
+                # 되돌릴 때 보정분까지 빼지 않도록 delta에 포함
+                self._last = (a, u, v, delta + drift)
+            return -(delta + drift)
 
         def energy(self):
             """현재 상태의 에너지를 계산합니다 (코어 품질의 음수)."""
-            order = self.state
-            A_ordered = self.A[order][:, order]
-            core_vector = self.parent.find_optimal_core_vector(A_ordered, self.alpha, self.beta)
-            core_quality = self.parent.calculate_core_quality(A_ordered, core_vector)
-            return -core_quality  # 코어 품질의 음수를 에너지로 사용
+            self._undo_rejected()
+            return -self.quality
+
+    def anneal_order(self, step, alpha=None, beta=None, engine="tempering", chains=8,
+                     rounds=None, temperatures=None, seed=None):
+        """
+        Best node ordering for R_{alpha, beta}. "tempering" runs `chains`
+        replica-exchange chains in parallel for `step` swaps each (seeded,
+        reproducible); "simanneal" runs the single simanneal chain.
+        Returns (ordering as a list, R of that ordering).
+        """
+        alpha = self.alpha if alpha is None else alpha
+        beta = self.beta if beta is None else beta
+        n = self.G.number_of_nodes()
+        csr = self._csr()
+        core_vector = self.core_vector(n, alpha, beta)
 
-    def optimize(self, step):
-        # 초기 상태 (노드 순서)
-        initial_state = list(np.arange(self.A.shape[0]))
+        if engine == "simanneal":
+            annealer = self.NodeOrderAnnealer(list(range(n)), csr, core_vector, step)
+            best_state, best_energy = annealer.anneal()
+            return list(best_state), -best_energy
 
-        # Annealer 생성
-        annealer = self.NodeOrderAnnealer(initial_state, self.A, self.alpha, self.beta, step, self)
+        order, quality = tempering_order(*csr, core_vector, step, chains, rounds, temperatures, seed)
+        return order.tolist(), quality
 
-        # 최적화 수행
-        best_state, best_energy = annealer.anneal()
+    def optimize(self, step, engine="tempering", chains=8, seed=None):
+        # 최적화 수행 (기본: 병렬 replica-exchange 체인)
+        n = self.G.number_of_nodes()
+        best_order, _ = self.anneal_order(step, engine=engine, chains=chains, seed=seed)
 
         # 결과 적용
-        best_order = best_state
-        A_optimized = self.A[best_order][:, best_order]
-        core_scores_optimized, R_gamma = self.aggregate_core_score(A_optimized, [self.alpha], [self.beta])
+        core_scores_optimized, R_gamma = self.aggregate_core_score(best_order, [self.alpha], [self.beta])
         core_nodes = np.where(core_scores_optimized > 0.7)[0]
         result = [best_order[i] for i in core_nodes]
 
-        core_scores_reordered = np.zeros(self.A.shape[0])
+        core_scores_reordered = np.zeros(n)
         j = 0
         for i in best_order:
             core_scores_reordered[i] = core_scores_optimized[j]
@@ -102,4 +398,76 @@ class Rombach:
 
         core_scores_optimized = [core_scores_optimized[i] for i in best_order]
 
-        return best_order, core_scores_reordered, result, R_gamma
\ No newline at end of file
+        return best_order, core_scores_reordered, result, R_gamma
+
+    @staticmethod
+    def grid_values(resolution):
+        """alpha in [0, 1] and beta in (0, 1) (beta = 0 or 1 leaves no core or no periphery)."""
+        resolution = max(int(resolution), 1)
+        alpha_values = np.linspace(0, 1, resolution) if resolution > 1 else np.array([0.5])
+        beta_values = np.linspace(0, 1, resolution + 2)[1:-1]
+        return alpha_values, beta_values
+
+    def grid_optimize(self, step, resolution=5, time_budget=None, chains=4, seed=None, processes=None):
+        """
+        Aggregate core score over an (alpha, beta) grid, each pair with its own
+        annealed ordering: CS(i) = Z * sum C_i(alpha, beta) R(alpha, beta).
+        Runs are spread over worker processes that share one CSR snapshot and
+        are folded into the score as they finish. `time_budget` (seconds) is a
+        soft limit: when it expires runs that have not started are cancelled,
+        but runs already executing (at most one per worker, or the current
+        one when sequential) are finished and included, so the call can
+        overrun the budget by up to one run's duration.
+        Returns (core scores by node index, core nodes, runs as
+        [(alpha, beta, R), ...]).
+        """
+        alpha_values, beta_values = self.grid_values(resolution)
+        pairs = [(float(a), float(b)) for a in alpha_values for b in beta_values]
+        deadline = None if time_budget is None else time.monotonic() + float(time_budget)
+        entropy = np.random.SeedSequence(seed).entropy
+        n = self.G.number_of_nodes()
+        core_scores = np.zeros(n)
+        runs = []
+
+        def collect(alpha, beta, order, quality):
+            x = np.empty(n)
+            x[order] = self.core_vector(n, alpha, beta)
+            core_scores[:] += x * quality
+            runs.append((alpha, beta, quality))
+
+        snapshot = snapshot_of(self.G)
+        workers = min(processes or os.cpu_count() or 1, len(pairs))
+        if workers <= 1:
+            csr = self._csr()
+            for run, (alpha, beta) in enumerate(pairs):
+                if deadline is not None and runs and time.monotonic() > deadline:
+                    break
+                seed_run = np.random.SeedSequence(entropy, spawn_key=(run,))
+                order, quality = tempering_order(*csr, self.core_vector(n, alpha, beta), step, chains, seed=seed_run)
+                collect(alpha, beta, order, quality)
+        else:
+            threads = max(1, numba.config.NUMBA_NUM_THREADS // workers)
+            # numba 병렬 스레드가 이미 돈 프로세스를 fork하면 종료 시 멈출 수 있어 spawn 사용
+            context = multiprocessing.get_context("spawn")
+            with SharedSnapshot(snapshot) as shared, ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                pending = {
+                    pool.submit(_grid_run, shared.handle, alpha, beta, step, chains, entropy, run, threads)
+                    for run, (alpha, beta) in enumerate(pairs)
+                }
+                while pending:
+                    timeout = None if deadline is None else max(deadline - time.monotonic(), 0)
+                    done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(*future.result())
+                    if not done:
+                        # 시간 초과: 시작 전인 작업은 취소, 이미 실행 중인 작업은 끝난 뒤 반영
+                        running = [future for future in pending if not future.cancel()]
+                        for future in wait(running).done:
+                            collect(*future.result())
+                        pending = set()
+
+        peak = np.max(core_scores) if runs else 0
+        if peak > 0:
+            core_scores /= peak  # 정규화
+        core_nodes = np.where(core_scores > 0.7)[0]
+        return core_scores, core_nodes, sorted(runs)
@@ -1,6 +1,9 @@
 import numpy as np
 import networkx as nx
 import numba
+from scipy import sparse
+from graph_snapshot import snapshot_of
+from null_models import null_graphs
 
 class Rossa:
     def __init__(self, G):
@@ -17,55 +20,80 @@ class Rossa:
         self._calculate_cp_centralization()
 
     def _initialize_matrices(self):
-        A = nx.to_numpy_array(self.G)
-        A = np.where(A != 0, 1, 0)
-        sigma = np.array(A.sum(axis=0)).reshape(-1)
+        # 이진 인접행렬(자기 루프 포함)의 CSR에서 행 정규화한 전이행렬 m을 희소하게 유지
+        A = snapshot_of(self.G).binary_adjacency(drop_self_loops=False)
+        sigma = np.asarray(A.sum(axis=0)).reshape(-1)
         self.pi = sigma / np.sum(sigma)  # Normalize the sigma values to get pi
-        self.m = np.zeros((self.N, self.N))
-
-        for i in range(self.N):
-            for j in range(self.N):
-                if A[i, j] != 0:
-                    self.m[i, j] = A[i, j] / np.sum(A[i])
+        row_sums = np.diff(A.indptr)
+        data = 1.0 / np.repeat(np.where(row_sums > 0, row_sums, 1), row_sums)
+        self.m = sparse.csr_array((data, A.indices, A.indptr), shape=(self.N, self.N))
 
     @staticmethod
     @numba.jit(nopython=True, cache=True)
-    def _calculate_alpha_numba(N, P, alpha, pi, m):
-        for k in range(1, N):
-            min_val = np.inf
-            min_idx = -1
-
-            for j in range(N):
-                if j in P:
-                    continue
-
-                num1 = np.sum(np.array([pi[p1] * m[p1, p2] for p1 in P for p2 in P]))
-                num2 = np.sum(np.array([pi[p] * m[p, j] + pi[j] * m[j, p] for p in P]))
-                denom = np.sum(np.array([pi[p] for p in P])) + pi[j]
-
-                # ZeroDivisionError 방지: denom이 0인 경우 처리
-                if denom == 0:
-                    continue  # denom이 0이면 이 후보를 건너뜁니다
-
-                alpha_candidate = (num1 + num2) / denom
-
-                if alpha_candidate < min_val:
-                    min_val = alpha_candidate
-                    min_idx = j
-
-            P.append(min_idx)
-            alpha[min_idx] = min_val
-
-        return P, alpha
+    def _calculate_alpha_numba(N, start, alpha, pi, indptr, indices, data):
+        """
+        Grow the periphery P one node at a time, adding the candidate j that
+        minimises (num1 + flow[j]) / (sum pi_P + pi_j). num1 (the persistence
+        numerator sum_{p1, p2 in P} pi_p1 m_p1p2) and flow[j] (sum_{p in P}
+        pi_p m_pj + pi_j m_jp) are updated from the sparse row of each added
+        node, so a step costs O(N + deg) instead of rebuilding them over P.
+        The key of every candidate changes with num1 and sum pi_P, so the
+        argmin is a linear scan over the non-members.
+        """
+        in_P = np.zeros(N, dtype=np.bool_)
+        flow = np.zeros(N)
+        P = np.empty(N, dtype=np.int64)
+        num1 = 0.0
+        pi_sum = 0.0
+        size = 0
+        j = start
+        for k in range(N):
+            if k > 0:
+                min_val = np.inf
+                j = -1
+                for c in range(N):
+                    if in_P[c]:
+                        continue
+                    denom = pi_sum + pi[c]
+                    # ZeroDivisionError 방지: denom이 0인 경우 처리
+                    if denom == 0:
+                        continue
+                    alpha_candidate = (num1 + flow[c]) / denom
+                    if alpha_candidate < min_val:
+                        min_val = alpha_candidate
+                        j = c
+                if j < 0:
+                    break
+                alpha[j] = min_val
+
+            # j를 P에 추가: num1, pi 합, 이웃 후보들의 flow 갱신
+            num1 += flow[j]
+            pi_sum += pi[j]
+            in_P[j] = True
+            P[size] = j
+            size += 1
+            for e in range(indptr[j], indptr[j + 1]):
+                c = indices[e]
+                # m은 대칭 구조: m_jc != 0 이면 m_cj != 0
+                m_cj = 1.0 / (indptr[c + 1] - indptr[c])
+                if c == j:
+                    num1 += pi[j] * data[e]
+                else:
+                    flow[c] += pi[j] * data[e] + pi[c] * m_cj
+
+        return P[:size], alpha
 
     def _calculate_alpha(self):
         sigma = np.array([degree for _, degree in self.G.degree()], dtype=np.int32)
         idx = np.random.choice(np.flatnonzero(sigma == sigma.min()))
-        self.P = [idx]
         self.alpha[idx] = 0
 
         # Apply Numba-optimized function
-        self.P, self.alpha = self._calculate_alpha_numba(self.N, self.P, self.alpha, self.pi, self.m)
+        P, self.alpha = self._calculate_alpha_numba(
+            self.N, idx, self.alpha, self.pi, self.m.indptr.astype(np.int64),
+            self.m.indices.astype(np.int64), self.m.data,
+        )
+        self.P = P.tolist()
 
     def _calculate_cp_centralization(self):
         alpha_sum = np.sum(self.alpha) - 1
@@ -82,11 +110,12 @@ class Rossa:
         nx.double_edge_swap(random_G, nswap=2*self.G.number_of_edges(), max_tries=10000)
         return random_G
 
-    def calculate_z_score(self, num_randomizations=100):
+    def calculate_z_score(self, num_randomizations=100, seed=0):
         random_cp_centralizations = []
 
-        for _ in range(num_randomizations):
-            random_G = self.randomize_network()
+        # double edge swap 앙상블을 CSR로 병렬 생성, 같은 그래프면 캐시 재사용
+        for null_snapshot in null_graphs(self.G, num_randomizations, model="edge_swap", seed=seed):
+            random_G = null_snapshot.to_networkx(frozen=True)
             random_analyzer = Rossa(random_G)
             random_cp_centralizations.append(random_analyzer.get_cp_centralization())
 
@@ -1,75 +1,248 @@
+import time
 import numpy as np
 import networkx as nx
 import numba
+from graph_snapshot import snapshot_of, source_distance_sums
+
+
+@numba.jit(nopython=True, cache=True)
+def harmonic_sum(indptr, indices, rank, step, source, dist, queue):
+    """
+    Sum of 1/d(source, v) over the nodes reached by a BFS restricted to the
+    alive nodes (rank >= step). `dist` must be -1 everywhere and is reset
+    before returning.
+    """
+    dist[source] = 0
+    queue[0] = source
+    head = 0
+    tail = 1
+    total = 0.0
+    while head < tail:
+        u = queue[head]
+        head += 1
+        du = dist[u] + 1
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if dist[v] < 0 and rank[v] >= step:
+                dist[v] = du
+                queue[tail] = v
+                tail += 1
+                total += 1.0 / du
+    for q in range(tail):
+        dist[queue[q]] = -1
+    return total
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def capacity_steps(indptr, indices, order, steps):
+    """
+    Capacity (sum of 1/d over unordered pairs) of the graph induced by
+    order[k:] for k = 0..steps-1, i.e. after removing the first k nodes of
+    the removal order. Steps run in parallel; memory is O(n) per step.
+    """
+    n = indptr.shape[0] - 1
+    rank = np.empty(n, dtype=np.int64)
+    for p in range(n):
+        rank[order[p]] = p
+    capacity = np.zeros(steps)
+    for k in numba.prange(steps):
+        dist = np.full(n, -1, dtype=np.int64)
+        queue = np.empty(n, dtype=np.int64)
+        total = 0.0
+        for p in range(k, n):
+            total += harmonic_sum(indptr, indices, rank, k, order[p], dist, queue)
+        capacity[k] = total / 2  # 각 쌍을 두 번 셈
+    return capacity
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def sampled_capacity_steps(indptr, indices, order, steps, sources, groups, n_groups):
+    """
+    Per removal step, harmonic sums from the alive sampled `sources`
+    accumulated by group: (sums, counts) of shape (steps, n_groups). A step
+    with at most len(sources) alive nodes, or fewer than two alive sampled
+    sources, is computed exactly from every alive node into group 0 and
+    flagged in `exact`.
+    """
+    n = indptr.shape[0] - 1
+    rank = np.empty(n, dtype=np.int64)
+    for p in range(n):
+        rank[order[p]] = p
+    sums = np.zeros((steps, n_groups))
+    counts = np.zeros((steps, n_groups), dtype=np.int64)
+    exact = np.zeros(steps, dtype=np.bool_)
+    for k in numba.prange(steps):
+        dist = np.full(n, -1, dtype=np.int64)
+        queue = np.empty(n, dtype=np.int64)
+        alive_sources = 0
+        for i in range(sources.shape[0]):
+            if rank[sources[i]] >= k:
+                alive_sources += 1
+        if n - k <= sources.shape[0] or alive_sources < 2:
+            exact[k] = True
+            total = 0.0
+            for p in range(k, n):
+                total += harmonic_sum(indptr, indices, rank, k, order[p], dist, queue)
+            sums[k, 0] = total
+            counts[k, 0] = n - k
+            continue
+        for i in range(sources.shape[0]):
+            if rank[sources[i]] >= k:
+                sums[k, groups[i]] += harmonic_sum(indptr, indices, rank, k, sources[i], dist, queue)
+                counts[k, groups[i]] += 1
+    return sums, counts, exact
+
 
 class Silva:
     def __init__(self, G):
         self.G = G
 
-    @staticmethod
-    @numba.jit(nopython=True, cache=True)
-    def _calculate_total_capacity(n, shortest_paths):
-        total_capacity = 0
-        for i in range(n):
-            for j in range(n):
-                if i != j and shortest_paths[i, j] > 0:
-                    total_capacity += 1 / shortest_paths[i, j]
-        total_capacity /= 2  # Since each pair is counted twice
-        return total_capacity
-
     def get_capacity(self, G):
         """
         Calculate the capacity of the network.
         """
-        n = len(G.nodes)
-        shortest_paths = np.full((n, n), np.inf)
+        snapshot = snapshot_of(G)
+        order = np.arange(snapshot.n, dtype=np.int64)
+        return float(capacity_steps(snapshot.indptr, snapshot.indices, order, 1)[0])
 
-        node_list = list(G.nodes)
-        node_index = {node: idx for idx, node in enumerate(node_list)}
+    @staticmethod
+    def closeness_order(snapshot):
+        """
+        Node indices sorted by increasing closeness centrality (networkx
+        formula with the wf_improved scaling, ties in node order).
+        """
+        n = snapshot.n
+        dist_sums, reached = source_distance_sums(snapshot.indptr, snapshot.indices, np.arange(n, dtype=np.int64))
+        closeness = np.zeros(n)
+        if n > 1:
+            # nx.closeness_centrality와 같은 순서로 연산해 동점 처리도 동일하게 유지
+            r = (reached - 1).astype(np.float64)
+            ok = dist_sums > 0
+            closeness[ok] = (r[ok] / dist_sums[ok]) * (r[ok] / (n - 1))
+        return np.argsort(closeness, kind='stable')
 
-        for i in G.nodes:
-            sp = nx.single_source_shortest_path_length(G, i)
-            for j in sp:
-                shortest_paths[node_index[i], node_index[j]] = sp[j]
+    def capacity_curve(self, G):
+        """
+        Remove nodes in increasing closeness order and record the capacity
+        after every removal. Returns (removal order, capacity, cumulative
+        capacity); this is the threshold independent part of the method.
+        """
+        snapshot = snapshot_of(G)
+        order = self.closeness_order(snapshot)
+        sorted_nodes = [snapshot.labels[i] for i in order]
 
-        # Replace np.inf with 0 for disconnected pairs
-        shortest_paths[np.isinf(shortest_paths)] = 0
-        
-        return self._calculate_total_capacity(n, shortest_paths)
+        # 제거 단계별 capacity (단계 k = 앞의 k개 노드를 제거한 그래프)
+        capacity = capacity_steps(snapshot.indptr, snapshot.indices, order, snapshot.n + 1)
+        capacity = capacity.tolist()
+        cumulative_capacity = np.cumsum(capacity).tolist()
+
+        return sorted_nodes, capacity, cumulative_capacity
+
+    @staticmethod
+    def sample_size(snapshot, accuracy=None, time_budget=None, pilot=32, seed=None):
+        """
+        Number of sampled sources for the approximate curve. `accuracy` is the
+        target relative standard error of the full graph capacity (from the
+        spread of a pilot sample's harmonic sums); `time_budget` (seconds)
+        is turned into a source count from the pilot BFS time. With both the
+        smaller count is used.
+        """
+        n = snapshot.n
+        if n <= 2 * pilot or (accuracy is None and time_budget is None):
+            return min(n, 256)
+        rng = np.random.default_rng(seed)
+        sources = np.sort(rng.choice(n, pilot, replace=False)).astype(np.int64)
+        order = np.arange(n, dtype=np.int64)
+        start = time.perf_counter()
+        sums, _, _ = sampled_capacity_steps(snapshot.indptr, snapshot.indices, order, 1, sources,
+                                            np.arange(pilot, dtype=np.int64), pilot)
+        per_source = (time.perf_counter() - start) / pilot
+        size = n
+        if accuracy is not None:
+            h = sums[0]
+            cv = np.std(h, ddof=1) / np.mean(h) if np.mean(h) > 0 else 0.0
+            wanted = (cv / accuracy) ** 2
+            size = min(size, int(np.ceil(wanted / (1 + wanted / n))))
+        if time_budget is not None:
+            # 표본 출발점 하나는 평균적으로 약 n/3 단계 분량의 전체 그래프 BFS 비용
+            threads = numba.config.NUMBA_NUM_THREADS
+            size = min(size, int(3 * time_budget * threads / (n * per_source)))
+        return int(min(max(size, pilot), n))
 
-    def silva_core_coefficient(self, G, threshold):
+    def approximate_capacity_curve(self, G, sample_size=None, accuracy=None, time_budget=None,
+                                   groups=10, seed=None):
+        """
+        capacity_curve estimated from a fixed set of sampled BFS sources,
+        reused at every removal step: one random node from each of
+        `sample_size` equal strata of the removal order, so sources stay
+        spread over the alive nodes. Steps with few alive nodes are exact.
+        Standard errors come from `groups` random groups of the sources.
+        Returns (removal order, capacity, cumulative capacity, its standard
+        error, cumulative capacity of every group as a (steps, groups) array).
+        """
+        snapshot = snapshot_of(G)
+        n = snapshot.n
+        order = self.closeness_order(snapshot)
+        sorted_nodes = [snapshot.labels[i] for i in order]
+        if sample_size is None:
+            sample_size = self.sample_size(snapshot, accuracy, time_budget, seed=seed)
+        sample_size = int(min(max(sample_size, 1), n))
+
+        rng = np.random.default_rng(seed)
+        bounds = np.linspace(0, n, sample_size + 1).astype(np.int64)
+        ranks = np.array([rng.integers(lo, hi) for lo, hi in zip(bounds[:-1], bounds[1:])], dtype=np.int64)
+        sources = order[ranks]
+        groups = max(min(int(groups), sample_size), 2)
+        group_of = (rng.permutation(sample_size) % groups).astype(np.int64)
+
+        sums, counts, exact = sampled_capacity_steps(
+            snapshot.indptr, snapshot.indices, order, n + 1, sources, group_of, groups,
+        )
+        alive = (n - np.arange(n + 1)).astype(np.float64)
+        # 살아 있는 노드 수 * 표본 평균 조화합 / 2
+        total = sums.sum(axis=1)
+        count = counts.sum(axis=1)
+        capacity = np.where(count > 0, alive * total / np.maximum(count, 1) / 2, 0.0)
+        group_capacity = np.where(counts > 0, alive[:, None] * sums / np.maximum(counts, 1) / 2, capacity[:, None])
+        group_capacity[exact] = capacity[exact, None]
+
+        cumulative_capacity = np.cumsum(capacity)
+        group_cumulative = np.cumsum(group_capacity, axis=0)
+        cumulative_error = np.std(group_cumulative, axis=1, ddof=1) / np.sqrt(groups)
+        return sorted_nodes, capacity.tolist(), cumulative_capacity.tolist(), cumulative_error, group_cumulative
+
+    @staticmethod
+    def core_size(cumulative_capacity, threshold):
+        """Number of removed (periphery) nodes for a threshold on the cumulative capacity."""
+        n = 0
+        last = len(cumulative_capacity) - 1
+        while n < last and cumulative_capacity[n] <= cumulative_capacity[last] * threshold:
+            n += 1
+        return n
+
+    def silva_core_coefficient(self, G, threshold, approximate=False, sample_size=None,
+                               accuracy=None, time_budget=None, seed=None):
         """
         Calculate the core coefficient of the network and return the core nodes and capacity changes.
+        With approximate=True the capacity curve is estimated from sampled
+        sources; standard errors are kept in self.cumulative_capacity_error
+        and self.cc_error (zero for the exact curve).
         """
-        # Calculate the closeness centrality of each node
-        closeness = nx.closeness_centrality(G)
-        
-        # Sort nodes by closeness centrality in decreasing order
-        sorted_nodes = sorted(closeness, key=closeness.get)
-        
-        # Initialize variables
         N = len(G.nodes)
-        removed_nodes = []
-        G_removed = G.copy()
-        tot_capacity = self.get_capacity(G)
-        capacity = [tot_capacity]
-        cumulative_capacity = [tot_capacity]
-        
-        # Calculate capacities after removing nodes in order
-        for node in sorted_nodes:
-            # Remove the node and calculate the new capacity
-            G_removed.remove_node(node)
-            new_capacity = self.get_capacity(G_removed)
-            capacity.append(new_capacity)
-            cumulative_capacity.append(np.sum(capacity))
-            
-            # Add the node to the removed nodes list
-            removed_nodes.append(node)
+        if approximate:
+            sorted_nodes, capacity, cumulative_capacity, self.cumulative_capacity_error, group_cumulative = \
+                self.approximate_capacity_curve(G, sample_size, accuracy, time_budget, seed=seed)
+            # 그룹별 곡선으로 구한 cc의 퍼짐으로 cc의 표준오차 추정
+            cc_groups = [(N - self.core_size(curve, threshold)) / N for curve in group_cumulative.T]
+            self.cc_error = float(np.std(cc_groups, ddof=1) / np.sqrt(len(cc_groups)))
+        else:
+            sorted_nodes, capacity, cumulative_capacity = self.capacity_curve(G)
+            self.cumulative_capacity_error = np.zeros(len(cumulative_capacity))
+            self.cc_error = 0.0
+        removed_nodes = sorted_nodes
         
         # Calculate the core coefficient
-        n = 0
-        while cumulative_capacity[n] <= cumulative_capacity[len(cumulative_capacity)-1] * threshold:
-            n += 1
+        n = self.core_size(cumulative_capacity, threshold)
         
         cc = (N - n) / N
         
@@ -78,7 +251,8 @@ class Silva:
         print(cc)
 
         r_nodes = list(G.nodes())
-        r_index = [r_nodes.index(i) for i in removed_nodes[n:]]
+        node_to_index = {node: idx for idx, node in enumerate(r_nodes)}
+        r_index = [node_to_index[i] for i in removed_nodes[n:]]
 
         n = self.G.number_of_nodes()
         core_indices = [0 for _ in range(n)]
@@ -87,7 +261,6 @@ class Silva:
             
         # Create capacity_order using integer indices
         capacity_order = [0 for _ in range(n)]
-        node_to_index = {node: idx for idx, node in enumerate(r_nodes)}
         for node, cap in capacities.items():
             idx = node_to_index[node]  # Get the index of the node
             capacity_order[idx] = cap
@@ -0,0 +1,279 @@
+import weakref
+import numpy as np
+import networkx as nx
+import numba
+from scipy import sparse
+
+
+class GraphSnapshot:
+    """
+    Read-only CSR view of an undirected graph.
+
+    Node i of the snapshot is the i-th node of the source graph (the same
+    order nx.to_numpy_array uses), so index based results can be mapped back
+    with `labels`.
+    """
+    def __init__(self, indptr, indices, data, labels, weighted=True, node_attributes=None, degrees=None):
+        # np.asarray는 dtype이 같으면 복사하지 않으므로 memmap/shared memory 배열도 그대로 공유됨
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.data = np.asarray(data, dtype=np.float64)
+        self._degrees = degrees
+        self.labels = labels
+        self.weighted = weighted
+        # 컬럼 형식의 노드 속성 {이름: 노드 순서의 값 리스트(없으면 None)}
+        self.node_attributes = node_attributes or {}
+        self.n = self.indptr.shape[0] - 1
+        self._adjacency = None
+
+    @classmethod
+    def from_networkx(cls, G):
+        # 멀티그래프/방향 그래프는 다른 전처리와 동일하게 단순 무방향 그래프로 변환
+        if isinstance(G, nx.MultiGraph) or isinstance(G, nx.MultiDiGraph):
+            G = nx.Graph(G)
+        if G.is_directed():
+            G = G.to_undirected()
+
+        labels = list(G.nodes())
+        if not labels:
+            # nx.to_scipy_sparse_array는 빈 그래프를 거부함
+            return cls(np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32), np.empty(0), labels, weighted=False)
+        A = nx.to_scipy_sparse_array(G, nodelist=labels, weight='weight', format='csr')
+        A.sort_indices()
+
+        node_attributes = {}
+        for i, (_, data) in enumerate(G.nodes(data=True)):
+            for name, value in data.items():
+                node_attributes.setdefault(name, [None] * len(labels))[i] = value
+        weighted = any('weight' in data for _, _, data in G.edges(data=True))
+        return cls(A.indptr, A.indices, A.data, labels, weighted=weighted, node_attributes=node_attributes)
+
+    @classmethod
+    def from_edges(cls, src, dst, weight, labels, weighted=True, node_attributes=None):
+        """
+        Build a snapshot from int node codes (0..len(labels)-1). Edges are
+        undirected; for repeated edges the last weight wins, as in nx.Graph.
+        """
+        n = len(labels)
+        src = np.asarray(src, dtype=np.int64)
+        dst = np.asarray(dst, dtype=np.int64)
+        if weight is None:
+            weight = np.ones(src.shape[0])
+        weight = np.asarray(weight, dtype=np.float64)
+
+        # (min, max) 키로 중복 엣지 제거, 뒤집은 배열에서 첫 번째 = 원래 순서의 마지막
+        lo = np.minimum(src, dst)
+        hi = np.maximum(src, dst)
+        key = lo * n + hi
+        _, last = np.unique(key[::-1], return_index=True)
+        keep = key.shape[0] - 1 - last
+        lo, hi, weight = lo[keep], hi[keep], weight[keep]
+
+        off = lo != hi
+        rows = np.concatenate((lo, hi[off]))
+        cols = np.concatenate((hi, lo[off]))
+        data = np.concatenate((weight, weight[off]))
+        order = np.argsort(rows * n + cols, kind='stable')
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(indptr, cols[order], data[order], labels, weighted=weighted, node_attributes=node_attributes)
+
+    def to_networkx(self, frozen=False):
+        """
+        Materialise an nx.Graph with the snapshot's node order. With
+        frozen=True the graph is nx.freeze()d and snapshot_of() returns this
+        snapshot for it.
+        """
+        G = nx.Graph()
+        G.add_nodes_from(self.labels)
+        for name, column in self.node_attributes.items():
+            for label, value in zip(self.labels, column):
+                if value is not None:
+                    G.nodes[label][name] = value
+        rows = np.repeat(np.arange(self.n), np.diff(self.indptr))
+        upper = rows <= self.indices
+        labels = self.labels
+        u = rows[upper].tolist()
+        v = self.indices[upper].tolist()
+        if self.weighted:
+            w = self.data[upper].tolist()
+            G.add_edges_from((labels[a], labels[b], {'weight': c}) for a, b, c in zip(u, v, w))
+        else:
+            G.add_edges_from((labels[a], labels[b]) for a, b in zip(u, v))
+        if frozen:
+            nx.freeze(G)
+            register_snapshot(G, self)
+        return G
+
+    @property
+    def m(self):
+        """Number of undirected edges (self loops counted once)."""
+        loops = self.self_loops()
+        return int((self.indices.shape[0] - loops) // 2 + loops)
+
+    def self_loops(self):
+        rows = np.repeat(np.arange(self.n, dtype=np.int32), np.diff(self.indptr))
+        return int(np.count_nonzero(rows == self.indices))
+
+    def without_self_loops(self):
+        """Copy of the snapshot with the diagonal entries removed."""
+        rows = np.repeat(np.arange(self.n, dtype=np.int32), np.diff(self.indptr))
+        keep = rows != self.indices
+        indptr = np.zeros(self.n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows[keep], minlength=self.n), out=indptr[1:])
+        return GraphSnapshot(indptr, self.indices[keep], self.data[keep], self.labels,
+                             weighted=self.weighted, node_attributes=self.node_attributes)
+
+    @property
+    def degrees(self):
+        """Structural degree of every node (number of stored neighbours)."""
+        if self._degrees is None:
+            self._degrees = np.diff(self.indptr)
+        return self._degrees
+
+    def adjacency(self):
+        """scipy CSR adjacency sharing the snapshot buffers."""
+        if self._adjacency is None:
+            self._adjacency = sparse.csr_array(
+                (self.data, self.indices, self.indptr), shape=(self.n, self.n)
+            )
+        return self._adjacency
+
+    def binary_adjacency(self, drop_self_loops=True):
+        """0/1 float adjacency, optionally without the diagonal."""
+        A = sparse.csr_array(
+            (np.ones(self.indices.shape[0]), self.indices, self.indptr), shape=(self.n, self.n)
+        )
+        if drop_self_loops:
+            A.setdiag(0)
+            A.eliminate_zeros()
+        return A
+
+
+# Snapshot cache keyed by graph object. Only frozen graphs (nx.freeze) are
+# cached: an in-place edit of a mutable graph (weight change, rewire) cannot
+# be detected cheaply, so mutable graphs get a fresh snapshot on every call.
+_snapshot_cache = weakref.WeakKeyDictionary()
+
+
+def _immutable(G):
+    # subgraph view는 frozen이어도 원본 그래프가 바뀌면 내용이 바뀜
+    return nx.is_frozen(G) and getattr(G, '_graph', None) is None
+
+
+def register_snapshot(G, snapshot):
+    """Seed the cache for a frozen graph that was built from `snapshot` (no-op otherwise)."""
+    if _immutable(G):
+        _snapshot_cache[G] = snapshot
+
+
+def snapshot_of(G):
+    """
+    CSR snapshot of G. Cached per graph when G is frozen; mutable graphs are
+    converted on every call, so callers that reuse a graph should freeze it.
+    """
+    if not _immutable(G):
+        return GraphSnapshot.from_networkx(G)
+    snapshot = _snapshot_cache.get(G)
+    if snapshot is None:
+        snapshot = GraphSnapshot.from_networkx(G)
+        _snapshot_cache[G] = snapshot
+    return snapshot
+
+
+@numba.jit(nopython=True, cache=True)
+def bfs_distances(indptr, indices, source, dist, queue):
+    """
+    Unweighted BFS from `source`. `dist` must be filled with -1 beforehand;
+    returns the number of reached nodes, whose ids are queue[:count].
+    """
+    dist[source] = 0
+    queue[0] = source
+    head = 0
+    tail = 1
+    while head < tail:
+        u = queue[head]
+        head += 1
+        du = dist[u] + 1
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if dist[v] < 0:
+                dist[v] = du
+                queue[tail] = v
+                tail += 1
+    return tail
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def source_distance_sums(indptr, indices, sources):
+    """
+    For every source run one BFS and return (sum of hop distances, number of
+    reached nodes including the source).
+    """
+    n = indptr.shape[0] - 1
+    k = sources.shape[0]
+    dist_sums = np.zeros(k)
+    reached = np.zeros(k, dtype=np.int64)
+    for s in numba.prange(k):
+        dist = np.full(n, -1, dtype=np.int64)
+        queue = np.empty(n, dtype=np.int64)
+        count = bfs_distances(indptr, indices, sources[s], dist, queue)
+        total = 0.0
+        for q in range(count):
+            total += dist[queue[q]]
+        dist_sums[s] = total
+        reached[s] = count
+    return dist_sums, reached
+
+
+@numba.jit(nopython=True, cache=True)
+def core_numbers(indptr, indices):
+    """
+    Core number of every node (Batagelj-Zaversnik bucket peeling, O(n + m)).
+    Self loops are ignored.
+    """
+    n = indptr.shape[0] - 1
+    deg = np.zeros(n, dtype=np.int64)
+    max_deg = 0
+    for u in range(n):
+        d = 0
+        for e in range(indptr[u], indptr[u + 1]):
+            if indices[e] != u:
+                d += 1
+        deg[u] = d
+        if d > max_deg:
+            max_deg = d
+
+    # 차수별 버킷 정렬: vert는 차수 순서의 노드, pos는 vert 안의 위치
+    bin_start = np.zeros(max_deg + 2, dtype=np.int64)
+    for u in range(n):
+        bin_start[deg[u] + 1] += 1
+    for d in range(1, max_deg + 2):
+        bin_start[d] += bin_start[d - 1]
+    vert = np.empty(n, dtype=np.int64)
+    pos = np.empty(n, dtype=np.int64)
+    fill = bin_start.copy()
+    for u in range(n):
+        pos[u] = fill[deg[u]]
+        vert[pos[u]] = u
+        fill[deg[u]] += 1
+
+    for i in range(n):
+        u = vert[i]
+        for e in range(indptr[u], indptr[u + 1]):
+            v = indices[e]
+            if v == u or deg[v] <= deg[u]:
+                continue
+            # v를 자기 차수 버킷의 맨 앞으로 옮긴 뒤 차수를 1 줄임
+            dv = deg[v]
+            pv = pos[v]
+            pw = bin_start[dv]
+            w = vert[pw]
+            if v != w:
+                vert[pv] = w
+                pos[w] = pv
+                vert[pw] = v
+                pos[v] = pw
+            bin_start[dv] += 1
+            deg[v] -= 1
+    return deg
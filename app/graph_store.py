@@ -0,0 +1,189 @@
+import hashlib
+import os
+import pickle
+from pathlib import Path
+from multiprocessing import shared_memory
+import numpy as np
+from graph_snapshot import GraphSnapshot
+
+STORE_DIR = Path("graph_store")
+
+# 스냅샷을 이루는 배열 (이름, dtype)
+_ARRAYS = (('indptr', np.int64), ('indices', np.int32), ('data', np.float64), ('degrees', np.int64))
+
+
+def _node_table(snapshot):
+    return {
+        'labels': snapshot.labels,
+        'weighted': snapshot.weighted,
+        'node_attributes': snapshot.node_attributes,
+    }
+
+
+class GraphStore:
+    """
+    On-disk store of CSR snapshots. Each graph is a directory of .npy arrays
+    plus a pickled node table; `attach` maps the arrays read-only with
+    np.load(mmap_mode='r'), so every request and worker process that attaches
+    the same graph shares one copy through the OS page cache.
+    """
+    def __init__(self, root=STORE_DIR):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key_for(file_path):
+        """Cache key of a source file: its name, size and modification time."""
+        stat = os.stat(file_path)
+        raw = f"{Path(file_path).name}:{stat.st_size}:{stat.st_mtime_ns}".encode()
+        return hashlib.sha1(raw).hexdigest()
+
+    def path_for(self, key):
+        return self.root / key
+
+    def contains(self, key):
+        return (self.path_for(key) / 'nodes.pkl').exists()
+
+    def put(self, key, snapshot):
+        directory = self.path_for(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        arrays = {'indptr': snapshot.indptr, 'indices': snapshot.indices,
+                  'data': snapshot.data, 'degrees': snapshot.degrees}
+        for name, dtype in _ARRAYS:
+            np.save(directory / f'{name}.npy', np.asarray(arrays[name], dtype=dtype))
+        # nodes.pkl은 마지막에 기록 -> contains()가 참이면 배열이 모두 준비된 상태
+        tmp = directory / 'nodes.pkl.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(_node_table(snapshot), f)
+        os.replace(tmp, directory / 'nodes.pkl')
+        return self.attach(key)
+
+    def attach(self, key):
+        """Read-only, memory-mapped snapshot of a stored graph."""
+        directory = self.path_for(key)
+        with open(directory / 'nodes.pkl', 'rb') as f:
+            table = pickle.load(f)
+        arrays = {name: np.load(directory / f'{name}.npy', mmap_mode='r') for name, _ in _ARRAYS}
+        return GraphSnapshot(
+            arrays['indptr'], arrays['indices'], arrays['data'], table['labels'],
+            weighted=table['weighted'], node_attributes=table['node_attributes'],
+            degrees=arrays['degrees'],
+        )
+
+    def get_value(self, namespace, key, default=None):
+        """Small derived result (baselines, caches) persisted next to the graphs."""
+        try:
+            with open(self.root / namespace / f'{key}.pkl', 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return default
+
+    def put_value(self, namespace, key, value):
+        directory = self.root / namespace
+        directory.mkdir(parents=True, exist_ok=True)
+        tmp = directory / f'{key}.pkl.tmp'
+        with open(tmp, 'wb') as f:
+            pickle.dump(value, f)
+        os.replace(tmp, directory / f'{key}.pkl')
+
+    def load(self, file_path, loader, simple=False):
+        """
+        Snapshot of `file_path`, parsed with `loader` (path -> GraphSnapshot)
+        only the first time; later calls attach the stored arrays. With
+        simple=True the graph without self loops is returned; it is stored as
+        its own entry when the source has loops.
+        """
+        key = self.key_for(file_path)
+        simple_key = key + '_simple'
+        if simple and self.contains(simple_key):
+            return self.attach(simple_key)
+        if self.contains(key):
+            snapshot = self.attach(key)
+        else:
+            snapshot = self.put(key, loader(str(file_path)))
+        if simple and snapshot.self_loops():
+            return self.put(simple_key, snapshot.without_self_loops())
+        return snapshot
+
+
+def _stored_file(array):
+    """Path of the .npy file `array` is a full memory map of (GraphStore.attach), else None."""
+    base = array
+    while isinstance(base, np.ndarray):
+        if isinstance(base, np.memmap) and base.filename is not None:
+            if base.shape == array.shape and base.dtype == array.dtype:
+                return base.filename
+            return None
+        base = base.base
+    return None
+
+
+class SharedSnapshot:
+    """
+    Copies a snapshot's arrays into multiprocessing.shared_memory blocks.
+    `handle` is a small picklable description (block names, shapes and
+    dtypes only; labels and node attributes stay in the creating process)
+    that pool workers pass to attach_shared() to get a read-only view
+    without copying. Arrays that are already memory-mapped from the graph
+    store are not copied; workers map the same .npy files. The creating
+    process owns the blocks and must call close() (or use it as a context
+    manager) once the workers are done.
+    """
+    def __init__(self, snapshot):
+        arrays = {'indptr': snapshot.indptr, 'indices': snapshot.indices,
+                  'data': snapshot.data, 'degrees': snapshot.degrees}
+        self._blocks = []
+        specs = {}
+        for name, dtype in _ARRAYS:
+            array = np.asarray(arrays[name], dtype=dtype)
+            stored = _stored_file(array)
+            if stored is not None:
+                specs[name] = ('file', stored)
+                continue
+            block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            np.ndarray(array.shape, dtype=dtype, buffer=block.buf)[:] = array
+            self._blocks.append(block)
+            specs[name] = ('shm', block.name, array.shape, np.dtype(dtype).str)
+        self.handle = {'arrays': specs, 'weighted': snapshot.weighted}
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 워커 프로세스에서 attach한 블록 (GC로 매핑이 해제되지 않도록 보관)
+_attached_blocks = {}
+
+
+def attach_shared(handle, labels=None):
+    """
+    Read-only snapshot view over the shared memory blocks (or stored .npy
+    files) of `handle`.
+    Nodes are labelled 0..n-1 unless `labels` is given.
+    """
+    arrays = {}
+    for name, spec in handle['arrays'].items():
+        if spec[0] == 'file':
+            arrays[name] = np.load(spec[1], mmap_mode='r')
+            continue
+        _, block_name, shape, dtype = spec
+        block = _attached_blocks.get(block_name)
+        if block is None:
+            block = shared_memory.SharedMemory(name=block_name)
+            _attached_blocks[block_name] = block
+        array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf)
+        array.flags.writeable = False
+        arrays[name] = array
+    n = arrays['indptr'].shape[0] - 1
+    return GraphSnapshot(
+        arrays['indptr'], arrays['indices'], arrays['data'], labels if labels is not None else range(n),
+        weighted=handle['weighted'], degrees=arrays['degrees'],
+    )
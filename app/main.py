@@ -3,6 +3,7 @@ from fastapi.responses import JSONResponse, FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pathlib import Path
 import os
+from collections import OrderedDict
 import preprocess
 import numpy as np
 import json
@@ -21,6 +22,12 @@ from algorithms.minre import Minre
 from algorithms.rombach import Rombach
 from algorithms.silva import Silva
 
+from graph_store import GraphStore
+from reduction import reduce_graph
+from sweep import SweepCache, SWEEP_PARAMETERS, parameter_sweep
+from graph_snapshot import snapshot_of
+from algorithms.local_search import refine_partition, OBJECTIVES
+
 from algorithms.km_config import KM_Config
 from algorithms.km_er import KM_ER
 from algorithms.icpa import ICPA
@@ -85,6 +92,7 @@ OVERVIEW_FILE = JSON_DIR / "overview.json"
 NODEFILE = JSON_DIR / "node_edge.json"
 ADJFILE = JSON_DIR / "adjacency.json"
 METFILE = JSON_DIR / "metric.json"
+STORE_DIR = Path("graph_store")
 
 # 디렉터리가 없으면 생성
 if not UPLOAD_DIR.exists():
@@ -93,6 +101,44 @@ if not UPLOAD_DIR.exists():
 if not JSON_DIR.exists():
     JSON_DIR.mkdir(parents=True)
 
+# 업로드된 그래프의 CSR 스냅샷을 memory-mapped 파일로 보관 (요청/워커 간 공유)
+graph_store = GraphStore(STORE_DIR)
+# 파라미터 스윕용 중간 결과 캐시
+sweep_cache = SweepCache(graph_store)
+
+
+# 최근 사용한 그래프 (저장소 키 -> frozen nx 그래프), 요청마다 to_networkx()를 반복하지 않도록 보관
+GRAPH_CACHE_SIZE = 4
+_graph_cache = OrderedDict()
+
+
+def load_graph(filename, simple=False):
+    """
+    Load an uploaded file as a frozen NetworkX graph. The file is parsed once
+    into a CSR snapshot kept in the graph store; the graph built from it is
+    kept per process by store key, and its snapshot_of() is the stored,
+    memory-mapped snapshot. With simple=True self loops are dropped (the
+    loop-free snapshot is a store entry of its own).
+    """
+    file_location = UPLOAD_DIR / filename
+    loader = preprocess.snapshot_loader_for(filename)
+    if loader is None:
+        raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats are .gexf, .gml, .graphml, .adjlist, .edgelist, .net, .yaml, .graph6, .sparse6, .gpickle, .json, .xlsx and .csv")
+    key = (graph_store.key_for(file_location), simple)
+    graph = _graph_cache.get(key)
+    if graph is None:
+        graph = graph_store.load(file_location, loader, simple=simple).to_networkx(frozen=True)
+        _graph_cache[key] = graph
+        if len(_graph_cache) > GRAPH_CACHE_SIZE:
+            _graph_cache.popitem(last=False)
+    _graph_cache.move_to_end(key)
+    return graph
+
+def prepare_graph(filename):
+    """Uploaded graph as the simple undirected graph the CP algorithms expect."""
+    # 저장소 스냅샷은 이미 무방향 단순 그래프, 셀프 루프는 저장 시점에 제거됨
+    return load_graph(filename, simple=True)
+
 # GEXF 파일 업로드 및 분석 처리
 @app.post("/uploadfile/")
 async def upload_file(file: UploadFile):
@@ -111,43 +157,16 @@ async def upload_file(file: UploadFile):
 
 # 그래프 요약 정보 API
 @app.get("/graph/overview/")
-async def get_graph_overview(filename: str):
+async def get_graph_overview(filename: str, mode: str = "auto", samples: Optional[int] = None, wedges: Optional[int] = None, confidence: float = 0.95):
     try:
         file_location = UPLOAD_DIR / filename
         if not file_location.exists():
             raise HTTPException(status_code=404, detail="File not found")
 
-        # 파일 확장자에 따라 다른 그래프 로딩 함수 호출
-        if filename.endswith(".gexf") or filename.endswith(".gephi"):
-            graph = preprocess.load_gexf_to_graph(str(file_location))
-        elif filename.endswith(".gml"):
-            graph = preprocess.load_gml_to_graph(str(file_location))
-        elif filename.endswith(".graphml"):
-            graph = preprocess.load_graphml_to_graph(str(file_location))
-        elif filename.endswith(".adjlist"):
-            graph = preprocess.load_adjlist_to_graph(str(file_location))
-        elif filename.endswith(".edgelist"):
-            graph = preprocess.load_edgelist_to_graph(str(file_location))
-        elif filename.endswith(".net"):
-            graph = preprocess.load_pajek_to_graph(str(file_location))
-        elif filename.endswith(".yaml"):
-            graph = preprocess.load_yaml_to_graph(str(file_location))
-        elif filename.endswith(".graph6"):
-            graph = preprocess.load_graph6_to_graph(str(file_location))
-        elif filename.endswith(".sparse6"):
-            graph = preprocess.load_sparse6_to_graph(str(file_location))
-        elif filename.endswith(".gpickle"):
-            graph = preprocess.load_gpickle_to_graph(str(file_location))
-        elif filename.endswith(".json"):
-            graph = preprocess.load_json_to_graph(str(file_location))
-        elif filename.endswith(".xlsx") :
-            graph = preprocess.load_excel_to_graph(str(file_location))
-        elif filename.endswith(".csv") :
-            graph = preprocess.load_csv_to_graph(str(file_location))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats are .gexf, .gml, .graphml, .adjlist, .edgelist, .net, .yaml, .graph6, .sparse6, .gpickle, and .json")
+        # 파일 확장자에 따라 다른 로더로 읽고, 그래프 저장소의 CSR 스냅샷을 공유
+        graph = load_graph(filename)
 
-        overview = preprocess.graph_overview(graph)
+        overview = preprocess.graph_overview(graph, mode=mode, n_samples=samples, n_wedges=wedges, confidence=confidence, warm_key=filename)
 
         # JSON 파일로 저장
         output_file = JSON_DIR / f"overview.json"
@@ -192,37 +211,10 @@ async def get_graph_node_edge(filename: str):
         if not file_location.exists():
             raise HTTPException(status_code=404, detail="File not found")
 
-        # 파일 확장자에 따라 다른 그래프 로딩 함수 호출
-        if filename.endswith(".gexf") or filename.endswith(".gephi"):
-            graph = preprocess.load_gexf_to_graph(str(file_location))
-        elif filename.endswith(".gml"):
-            graph = preprocess.load_gml_to_graph(str(file_location))
-        elif filename.endswith(".graphml"):
-            graph = preprocess.load_graphml_to_graph(str(file_location))
-        elif filename.endswith(".adjlist"):
-            graph = preprocess.load_adjlist_to_graph(str(file_location))
-        elif filename.endswith(".edgelist"):
-            graph = preprocess.load_edgelist_to_graph(str(file_location))
-        elif filename.endswith(".net"):
-            graph = preprocess.load_pajek_to_graph(str(file_location))
-        elif filename.endswith(".yaml"):
-            graph = preprocess.load_yaml_to_graph(str(file_location))
-        elif filename.endswith(".graph6"):
-            graph = preprocess.load_graph6_to_graph(str(file_location))
-        elif filename.endswith(".sparse6"):
-            graph = preprocess.load_sparse6_to_graph(str(file_location))
-        elif filename.endswith(".gpickle"):
-            graph = preprocess.load_gpickle_to_graph(str(file_location))
-        elif filename.endswith(".json"):
-            graph = preprocess.load_json_to_graph(str(file_location))
-        elif filename.endswith(".xlsx") :
-            graph = preprocess.load_excel_to_graph(str(file_location))
-        elif filename.endswith(".csv") :
-            graph = preprocess.load_csv_to_graph(str(file_location))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats are .gexf, .gml, .graphml, .adjlist, .edgelist, .net, .yaml, .graph6, .sparse6, .gpickle, and .json")
+        # 파일 확장자에 따라 다른 로더로 읽고, 그래프 저장소의 CSR 스냅샷을 공유
+        graph = load_graph(filename)
 
-        node_edge_data = preprocess.graph_node_edge(graph)
+        node_edge_data = preprocess.graph_node_edge(graph, warm_key=filename)
 
 
 
@@ -254,35 +246,8 @@ async def get_graph_adjacency_json(filename: str):
         if not file_location.exists():
             raise HTTPException(status_code=404, detail="File not found")
 
-        # 파일 확장자에 따라 다른 그래프 로딩 함수 호출
-        if filename.endswith(".gexf") or filename.endswith(".gephi"):
-            graph = preprocess.load_gexf_to_graph(str(file_location))
-        elif filename.endswith(".gml"):
-            graph = preprocess.load_gml_to_graph(str(file_location))
-        elif filename.endswith(".graphml"):
-            graph = preprocess.load_graphml_to_graph(str(file_location))
-        elif filename.endswith(".adjlist"):
-            graph = preprocess.load_adjlist_to_graph(str(file_location))
-        elif filename.endswith(".edgelist"):
-            graph = preprocess.load_edgelist_to_graph(str(file_location))
-        elif filename.endswith(".net"):
-            graph = preprocess.load_pajek_to_graph(str(file_location))
-        elif filename.endswith(".yaml"):
-            graph = preprocess.load_yaml_to_graph(str(file_location))
-        elif filename.endswith(".graph6"):
-            graph = preprocess.load_graph6_to_graph(str(file_location))
-        elif filename.endswith(".sparse6"):
-            graph = preprocess.load_sparse6_to_graph(str(file_location))
-        elif filename.endswith(".gpickle"):
-            graph = preprocess.load_gpickle_to_graph(str(file_location))
-        elif filename.endswith(".json"):
-            graph = preprocess.load_json_to_graph(str(file_location))
-        elif filename.endswith(".xlsx") :
-            graph = preprocess.load_excel_to_graph(str(file_location))
-        elif filename.endswith(".csv") :
-            graph = preprocess.load_csv_to_graph(str(file_location))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats are .gexf, .gml, .graphml, .adjlist, .edgelist, .net, .yaml, .graph6, .sparse6, .gpickle, and .json")
+        # 파일 확장자에 따라 다른 로더로 읽고, 그래프 저장소의 CSR 스냅샷을 공유
+        graph = load_graph(filename)
 
         cp_index = np.zeros(graph.number_of_nodes())
 
@@ -330,9 +295,6 @@ async def get_graph_adjacency_update(request: dict):
                 attributes=edge['attributes']
             )
 
-        # 그래프를 numpy 배열로 변환
-        A = nx.to_numpy_array(G)
-        n = A.shape[0]
         # 특정 전처리 함수 호출, 수정해야 할 수 있음
         graph_json = preprocess.graph_adjacency(G=G, cp_index=core_index, threshold=threshold)
 
@@ -400,6 +362,43 @@ async def get_centrality_box(request: dict):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+# 이진 core 벡터를 내는 메소드와 local search 기본 목적함수
+REFINE_OBJECTIVES = {"BE": "rho", "Brusco": "Z", "Lip": "Z", "Holme": "density", "LLC": "density", "Silva": "density"}
+
+
+def refined_metric(method, graph, cp_index, value):
+    """The method's own metric for a refined 0/1 partition (value = LLC's Q)."""
+    n = graph.number_of_nodes()
+    core = np.flatnonzero(np.asarray(cp_index) > 0)
+    if method == "BE":
+        return {"rho": Borgatti_Everett(graph, None, n).borgatti_everett_correlation(core)}
+    if method in ("Brusco", "Lip"):
+        return {"Z": int(Brusco(graph, None, n).brusco_metric(core))}
+    if method == "Holme":
+        nodes = list(graph.nodes())
+        refreshed = Holme(graph, store=graph_store).holme_refresh(graph, [nodes[i] for i in core])
+        c_cp, core_centrality = refreshed if isinstance(refreshed, tuple) else (refreshed, 0)
+        return {"C_cp": c_cp, "Core_Centrality": core_centrality}
+    if method == "LLC":
+        return {"Q": value}
+    if method == "Silva":
+        return {"cc": len(core) / n if n else 0.0}
+    return {}
+
+
+def genetic_options(parameters_dict):
+    # BE/Brusco GA 옵션 (engine, population_size, elite, mutation_rate, patience, seed)
+    options = {}
+    casts = {"engine": str, "population_size": int, "elite": int, "mutation_rate": float, "patience": int, "seed": int}
+    for key, cast in casts.items():
+        if parameters_dict.get(key) not in (None, ""):
+            try:
+                options[key] = cast(parameters_dict[key])
+            except (TypeError, ValueError):
+                pass
+    return options
+
+
 @app.get("/graph/algorithm")
 async def apply_algorithm(
     filename: str,
@@ -419,81 +418,64 @@ async def apply_algorithm(
         if not file_location.exists():
             raise HTTPException(status_code=404, detail="File not found")
 
-        # 파일 확장자에 따라 다른 그래프 로딩 함수 호출
-
-        # 파일 확장자에 따라 다른 그래프 로딩 함수 호출
-        if filename.endswith(".gexf") or filename.endswith(".gephi"):
-            graph = preprocess.load_gexf_to_graph(str(file_location))
-        elif filename.endswith(".gml"):
-            graph = preprocess.load_gml_to_graph(str(file_location))
-        elif filename.endswith(".graphml"):
-            graph = preprocess.load_graphml_to_graph(str(file_location))
-        elif filename.endswith(".adjlist"):
-            graph = preprocess.load_adjlist_to_graph(str(file_location))
-        elif filename.endswith(".edgelist"):
-            graph = preprocess.load_edgelist_to_graph(str(file_location))
-        elif filename.endswith(".net"):
-            graph = preprocess.load_pajek_to_graph(str(file_location))
-        elif filename.endswith(".yaml"):
-            graph = preprocess.load_yaml_to_graph(str(file_location))
-        elif filename.endswith(".graph6"):
-            graph = preprocess.load_graph6_to_graph(str(file_location))
-        elif filename.endswith(".sparse6"):
-            graph = preprocess.load_sparse6_to_graph(str(file_location))
-        elif filename.endswith(".gpickle"):
-            graph = preprocess.load_gpickle_to_graph(str(file_location))
-        elif filename.endswith(".json"):
-            graph = preprocess.load_json_to_graph(str(file_location))
-        elif filename.endswith(".xlsx") :
-            graph = preprocess.load_excel_to_graph(str(file_location))
-        elif filename.endswith(".csv") :
-            graph = preprocess.load_csv_to_graph(str(file_location))
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Supported formats are .gexf, .gml, .graphml, .adjlist, .edgelist, .net, .yaml, .graph6, .sparse6, .gpickle, and .json")
-        
-        if isinstance(graph, nx.MultiGraph) or isinstance(graph, nx.MultiDiGraph):
-            graph = nx.Graph(graph)  # 멀티그래프를 단순 그래프로 변환
-
-        if graph.is_directed():
-            graph = graph.to_undirected()  # 방향 그래프를 무방향 그래프로 변환
+        graph = prepare_graph(filename)
 
-        graph.remove_edges_from(nx.selfloop_edges(graph))
-        A = nx.to_numpy_array(graph)
-        n = A.shape[0]
+        # 선택적 축소 단계: 잎 노드/작은 컴포넌트 제거, 최대 연결 컴포넌트 또는 k-core로 제한
+        reduction = None
+        if parameters_dict.get('reduction'):
+            try:
+                k = int(parameters_dict['k'])
+            except:
+                k = 2
+            try:
+                min_component_size = int(parameters_dict['min_component_size'])
+            except:
+                min_component_size = 3
+            reduction = reduce_graph(graph, parameters_dict['reduction'], k=k, min_component_size=min_component_size)
+            full_graph = graph
+            graph = reduction.graph
+            if graph.number_of_nodes() < 2:
+                # 남은 노드가 2개 미만이면 코어/주변부를 나눌 수 없음
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Reduction '{reduction.mode}' left {graph.number_of_nodes()} node(s); a core-periphery split needs at least 2. Use a weaker reduction (e.g. lower k).",
+                )
+
+        # 각 메소드는 그래프의 CSR 스냅샷을 사용 (dense 인접행렬을 만들지 않음)
+        n = graph.number_of_nodes()
+        cp_index, cp_node_metric = None, None
         # 선택한 메소드에 따른 처리
         if method == "BE":
-            model = Borgatti_Everett(graph, A, n)
+            model = Borgatti_Everett(graph, None, n)
             try:
                 n_iterations = int(parameters_dict['n_iter'])
             except:
                 n_iterations = 1000
-            cp_index, cp_metric, cp_cluster = model.fit(n_iterations)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=cp_index)
+            cp_index, cp_metric, cp_cluster = model.fit(n_iterations, **genetic_options(parameters_dict))
             metric = {"rho": cp_metric}
         elif method == "Brusco":
-            model = Brusco(graph, A, n)
+            model = Brusco(graph, None, n)
             try:
                 n_iterations = int(parameters_dict['n_iter'])
             except:
                 n_iterations = 1000
-            cp_index, cp_metric, cp_cluster = model.fit(n_iterations)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=cp_index)
+            cp_index, cp_metric, cp_cluster = model.fit(n_iterations, **genetic_options(parameters_dict))
             metric = {"Z": int(cp_metric)}
 
         elif method == "Holme":
-            model = Holme(graph)
+            model = Holme(graph, store=graph_store)
             try:
                 n_iterations = int(parameters_dict['n_iter'])
             except:
                 n_iterations = 100
             cp_metric, core_indices, core_centrality = model.holme_metric(graph, n_iterations)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=core_indices)
+            cp_index = core_indices
             metric = {"C_cp": cp_metric, "Core_Centrality": core_centrality}
 
         elif method == "Lip":
-            model = Lip(graph, A)
+            model = Lip(graph)
             z_influence, core_indices, z = model.calculate()
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=core_indices, cp_node_metric=z_influence)
+            cp_index, cp_node_metric = core_indices, z_influence
             print(core_indices)
             print(z)
             metric = {"Z": int(z)}
@@ -505,28 +487,66 @@ async def apply_algorithm(
             except:
                 beta = None
             scores, core_indices, q = model.low_rank_core(beta=beta)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=core_indices, cp_node_metric=scores)
+            cp_index, cp_node_metric = core_indices, scores
             metric = {"Q": q}
 
         elif method == "Minre":
-            model = Minre(graph, A)
+            model = Minre(graph)
             try:
                 n_iterations = int(parameters_dict['n_iter'])
             except:
                 n_iterations = 10000
-            w, indices, PRE = model.minres(max_iter=n_iterations)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=w, cp_node_metric=w)
+            try:
+                restarts = int(parameters_dict['restarts'])
+            except:
+                restarts = 1
+            try:
+                seed = int(parameters_dict['seed'])
+            except:
+                seed = None
+            w, indices, PRE = model.minres(
+                max_iter=n_iterations, init=parameters_dict.get('init', 'random'),
+                restarts=restarts, seed=seed,
+            )
+            cp_index, cp_node_metric = w, w
             metric = {"PRE": PRE}
 
         elif method == "Rombach":
-            model = Rombach(graph, A)
+            model = Rombach(graph)
             try:
                 n_iterations = int(parameters_dict['n_iter'])
             except:
                 n_iterations = 10000
-            best_order, core_scores_optimized, result, R_gamma = model.optimize(step=n_iterations)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=core_scores_optimized, cp_node_metric=core_scores_optimized)
-            metric = {"R_gamma": R_gamma}
+            try:
+                chains = int(parameters_dict['chains'])
+            except:
+                chains = 8
+            try:
+                seed = int(parameters_dict['seed'])
+            except:
+                seed = None
+            try:
+                grid = int(parameters_dict['grid'])
+            except:
+                grid = None
+            if grid:
+                # (alpha, beta) 격자 전체에 대한 aggregate core score
+                try:
+                    time_budget = float(parameters_dict['time_budget'])
+                except:
+                    time_budget = None
+                core_scores, result, runs = model.grid_optimize(
+                    step=n_iterations, resolution=grid, time_budget=time_budget, chains=chains, seed=seed,
+                )
+                cp_index, cp_node_metric = core_scores, core_scores
+                metric = {"R_gamma": max((R for _, _, R in runs), default=0), "grid_runs": len(runs)}
+            else:
+                best_order, core_scores_optimized, result, R_gamma = model.optimize(
+                    step=n_iterations, engine=parameters_dict.get('engine', 'tempering'),
+                    chains=chains, seed=seed,
+                )
+                cp_index, cp_node_metric = core_scores_optimized, core_scores_optimized
+                metric = {"R_gamma": R_gamma}
 
         elif method == "Silva":
             model = Silva(graph)
@@ -534,16 +554,30 @@ async def apply_algorithm(
                 threshold = float(parameters_dict['threshold'])
             except:
                 threshold = 0.9
-            cc, core_indices, capcity_order, cumulative_capacity = model.silva_core_coefficient(graph, threshold)
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=core_indices)
+            approximate = str(parameters_dict.get('approximate', '')).lower() in ('1', 'true', 'yes')
+            sampling = {}
+            for name, cast in (('sample_size', int), ('accuracy', float), ('time_budget', float), ('seed', int)):
+                try:
+                    sampling[name] = cast(parameters_dict[name])
+                except:
+                    pass
+            cc, core_indices, capcity_order, cumulative_capacity = model.silva_core_coefficient(
+                graph, threshold, approximate=approximate, **sampling,
+            )
+            cp_index = core_indices
             metric = {"cc": cc}
+            if approximate:
+                # 추정 곡선과 그 표준오차를 함께 반환
+                metric["cc_error"] = model.cc_error
+                metric["cumulative_capacity"] = [float(c) for c in cumulative_capacity]
+                metric["cumulative_capacity_error"] = model.cumulative_capacity_error.tolist()
 
 
         elif method == "Rossa":
             model = Rossa(graph)
             alpha = model.get_alpha()
             cp_centralization = model.get_cp_centralization()
-            node_edge_data = preprocess.graph_node_edge(graph, cp_index=alpha, cp_node_metric=alpha)
+            cp_index, cp_node_metric = alpha, alpha
             metric = {"cp_centrality": cp_centralization}
 
 
@@ -561,6 +595,36 @@ async def apply_algorithm(
         else:
             raise HTTPException(status_code=400, detail="Invalid method")
 
+        # 선택적 후처리: 노드 하나씩 뒤집는 local search로 이진 partition 개선
+        if parameters_dict.get('refine') and method in REFINE_OBJECTIVES:
+            objective = parameters_dict['refine']
+            if objective not in OBJECTIVES:
+                objective = REFINE_OBJECTIVES[method]
+            try:
+                tabu_iterations = int(parameters_dict['tabu_iter'])
+            except:
+                tabu_iterations = 0
+            options = {}
+            if method == "LLC":
+                # LLC의 Q는 gamma=0 CP density -> 같은 목적함수로만 개선
+                objective = "density"
+                options = {"gamma": 0.0, "beta": beta if beta is not None else 0.1}
+            cp_index, value, flips = refine_partition(snapshot_of(graph), cp_index, objective,
+                                                      tabu_iterations=tabu_iterations, **options)
+            # 메소드 고유 메트릭을 개선된 partition으로 다시 계산
+            metric.update(refined_metric(method, graph, cp_index, value))
+            metric["refinement"] = {"objective": objective, "value": value, "flips": flips}
+
+        # 축소된 그래프의 결과를 원래 노드 인덱스로 복원 (제거된 노드는 periphery)
+        if reduction is not None:
+            cp_index = reduction.expand(cp_index)
+            if cp_node_metric is not None:
+                cp_node_metric = reduction.expand(cp_node_metric)
+            graph = full_graph
+            metric["reduction"] = reduction.summary()
+
+        node_edge_data = preprocess.graph_node_edge(graph, cp_index=cp_index, cp_node_metric=cp_node_metric, warm_key=filename)
+
         # 노드 및 엣지 데이터 처리 후 파일로 저장
         output_file = JSON_DIR / f"node_edge.json"
         metric_file = JSON_DIR / f"metric.json"
@@ -572,7 +636,8 @@ async def apply_algorithm(
         
         return {"message": "Algorithm applied successfully", "filepath": str(output_file)}
 
-    
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"Error: {e}")
         traceback.print_exc()
@@ -580,6 +645,48 @@ async def apply_algorithm(
     
 
 
+@app.get("/graph/sweep")
+async def sweep_parameter(
+    filename: str,
+    method: str,
+    start: Optional[float] = None,
+    stop: Optional[float] = None,
+    num: int = 10,
+    values: Optional[str] = None,  # JSON 리스트로 값을 직접 지정할 수도 있음
+    parameters: Optional[str] = None
+):
+    """
+    Core set and metric for every value of the method's main parameter
+    (LLC beta, Silva threshold, Minre cutoff) from one computation.
+    """
+    try:
+        if method not in SWEEP_PARAMETERS:
+            raise HTTPException(status_code=400, detail=f"Sweep is supported for {', '.join(SWEEP_PARAMETERS)}")
+        file_location = UPLOAD_DIR / filename
+        if not file_location.exists():
+            raise HTTPException(status_code=404, detail="File not found")
+
+        if values:
+            sweep_values = [float(v) for v in json.loads(values)]
+        elif start is not None and stop is not None:
+            sweep_values = np.linspace(start, stop, max(num, 1)).tolist()
+        else:
+            raise HTTPException(status_code=400, detail="Provide start/stop or values")
+        options = json.loads(parameters) if parameters else {}
+
+        graph = prepare_graph(filename)
+        graph_key = GraphStore.key_for(file_location)
+        curve = parameter_sweep(graph, method, sweep_values, sweep_cache, graph_key, options)
+        return {"method": method, "parameter": SWEEP_PARAMETERS[method], "curve": curve}
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        print(f"Error: {e}")
+        traceback.print_exc()
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 # GEXF 파일 업로드 및 분석 처리
 @app.post("/uploadCurrent/")
 async def upload_graph(data: GraphWithMethod):
@@ -612,23 +719,24 @@ async def upload_graph(data: GraphWithMethod):
                 weight=edge.weight,
                 attributes=edge.attributes
             )
-        A = nx.to_numpy_array(G)
-        n = A.shape[0]
+        # 메트릭 재계산은 CSR 스냅샷만 사용 (dense 인접행렬을 만들지 않음); freeze해서 스냅샷을 한 번만 만듦
+        nx.freeze(G)
+        n = G.number_of_nodes()
 
         # 선택한 메소드에 따른 처리
         if method == "BE":
 
-            model = Borgatti_Everett(G, A, n)
+            model = Borgatti_Everett(G, None, n)
             rho = model.borgatti_everett_correlation(core_indices)
             metric = {"rho": rho}
 
         elif method == "Brusco":
-            model = Brusco(G, A, n)
+            model = Brusco(G, None, n)
             Z = model.brusco_metric(core_indices)
             metric = {"Z": int(Z)}
 
         elif method == "Holme":
-            model = Holme(G)
+            model = Holme(G, store=graph_store)
             nodes = list(G.nodes())
             core_nodes = []
             for i in core_indices:
@@ -638,7 +746,7 @@ async def upload_graph(data: GraphWithMethod):
             metric = {"C_cp": c_cp, "Core_Centrality": core_centrality}
 
         elif method == "Lip":
-            model = Lip(G, A)
+            model = Lip(G)
             print(core_indices)
             z = model.brusco_metric(core_indices)
             metric = {"Z": int(z)}
@@ -0,0 +1,218 @@
+import multiprocessing
+import os
+import numpy as np
+import numba
+from concurrent.futures import ProcessPoolExecutor
+from graph_snapshot import GraphSnapshot
+from graph_store import SharedSnapshot, attach_shared
+
+# 차수 보존 랜덤 그래프(null model)를 CSR 스냅샷으로 생성.
+# 앙상블은 (모델, 차수열, seed) 별로 캐시되어 반복 검정/refresh에서 재사용됨.
+
+NULL_MODELS = ("configuration", "configuration_multi", "edge_swap")
+
+# 앙상블 전체 엣지 수가 이 값보다 작으면 프로세스를 띄우지 않고 순차 생성
+PARALLEL_MIN_EDGES = 200000
+
+# 캐시에 보관하는 null 그래프 배열의 총 바이트 수 상한 (오래된 앙상블부터 제거)
+CACHE_BYTES = 1 << 30
+
+
+def _stub_pairs(degrees, rng):
+    """Random perfect matching of the degree stubs (configuration model)."""
+    stubs = np.repeat(np.arange(degrees.shape[0], dtype=np.int64), degrees)
+    rng.shuffle(stubs)
+    if stubs.shape[0] % 2:
+        stubs = stubs[:-1]
+    return stubs[0::2], stubs[1::2]
+
+
+@numba.jit(nopython=True, cache=True)
+def _double_edge_swap(u, v, nswap, max_tries, seed):
+    """
+    Degree-preserving double edge swaps on an edge list, in place:
+    (a, b), (c, d) -> (a, d), (c, b) when that creates no self loop or
+    multi-edge. Stops after `nswap` swaps or `max_tries` attempts.
+    """
+    np.random.seed(seed)
+    m = u.shape[0]
+    if m < 2:
+        return 0
+    edges = set()
+    for e in range(m):
+        a, b = min(u[e], v[e]), max(u[e], v[e])
+        edges.add((a, b))
+    swaps = 0
+    tries = 0
+    while swaps < nswap and tries < max_tries:
+        tries += 1
+        e1 = np.random.randint(m)
+        e2 = np.random.randint(m)
+        if e1 == e2:
+            continue
+        a, b = u[e1], v[e1]
+        c, d = u[e2], v[e2]
+        # 절반의 확률로 두 번째 엣지 방향을 뒤집어 (a, c), (b, d) 교환도 허용
+        if np.random.random() < 0.5:
+            c, d = d, c
+        if a == d or c == b:
+            continue
+        new1 = (min(a, d), max(a, d))
+        new2 = (min(c, b), max(c, b))
+        if new1 in edges or new2 in edges:
+            continue
+        edges.remove((min(a, b), max(a, b)))
+        edges.remove((min(c, d), max(c, d)))
+        edges.add(new1)
+        edges.add(new2)
+        u[e1], v[e1] = a, d
+        u[e2], v[e2] = c, b
+        swaps += 1
+    return swaps
+
+
+def generate_null_graph(model, degrees, src, dst, seed_sequence):
+    """
+    One null graph as (indptr, indices, data).
+    configuration: erased configuration model (self loops and multi-edges dropped).
+    configuration_multi: configuration model keeping multi-edges as weights and self loops.
+    edge_swap: 2m double edge swaps of the observed edge list.
+    """
+    rng = np.random.default_rng(seed_sequence)
+    n = degrees.shape[0]
+    labels = range(n)
+    if model == "edge_swap":
+        u = src.copy()
+        v = dst.copy()
+        _double_edge_swap(u, v, 2 * u.shape[0], 100 * u.shape[0] + 100, int(rng.integers(0, 2 ** 31 - 1)))
+        snapshot = GraphSnapshot.from_edges(u, v, None, labels, weighted=False)
+    else:
+        u, v = _stub_pairs(degrees, rng)
+        if model == "configuration":
+            off = u != v
+            snapshot = GraphSnapshot.from_edges(u[off], v[off], None, labels, weighted=False)
+        else:
+            lo, hi = np.minimum(u, v), np.maximum(u, v)
+            keys, multiplicity = np.unique(lo * n + hi, return_counts=True)
+            snapshot = GraphSnapshot.from_edges(keys // n, keys % n, multiplicity, labels, weighted=True)
+    return snapshot.indptr, snapshot.indices, snapshot.data
+
+
+def _model_inputs(snapshot, model):
+    """Degree sequence, plus the upper-triangle edge list for edge_swap."""
+    A = snapshot.binary_adjacency()
+    degrees = np.diff(A.indptr).astype(np.int64)
+    src = dst = None
+    if model == "edge_swap":
+        rows = np.repeat(np.arange(snapshot.n, dtype=np.int64), degrees)
+        upper = rows < A.indices
+        src, dst = rows[upper], A.indices[upper].astype(np.int64)
+    return degrees, src, dst
+
+
+def _generate_batch(model, degrees, src, dst, entropy, start, stop):
+    # i번째 그래프는 항상 SeedSequence(entropy, spawn_key=(i,))로 생성
+    return [
+        generate_null_graph(model, degrees, src, dst, np.random.SeedSequence(entropy, spawn_key=(i,)))
+        for i in range(start, stop)
+    ]
+
+
+def _generate_shared_batch(handle, model, entropy, start, stop):
+    # 작업 프로세스: 공유 메모리의 원본 CSR에서 차수열/엣지 목록을 직접 만듦
+    degrees, src, dst = _model_inputs(attach_shared(handle), model)
+    return _generate_batch(model, degrees, src, dst, entropy, start, stop)
+
+
+def _nbytes(graph):
+    return sum(array.nbytes for array in graph)
+
+
+class NullModelEnsemble:
+    """
+    Cache of degree-preserving random graphs, keyed by model, degree sequence
+    and seed. Graph i of an ensemble always comes from the same seed stream,
+    so growing a cached ensemble keeps the graphs already generated. The
+    cache holds at most `cache_bytes` of graph arrays in total; the least
+    recently used ensembles are dropped first, and an ensemble larger than
+    the whole budget is returned without being cached.
+    """
+    def __init__(self, processes=None, cache_bytes=CACHE_BYTES):
+        self.processes = processes or os.cpu_count() or 1
+        self.cache_bytes = cache_bytes
+        self._cache = {}
+        self._cached_bytes = 0
+
+    @staticmethod
+    def _key(model, degrees, seed, src, dst):
+        import hashlib
+
+        digest = hashlib.sha1(np.ascontiguousarray(degrees, dtype=np.int64).tobytes())
+        if model == "edge_swap":
+            # edge swap은 시작 그래프에 의존
+            digest.update(np.ascontiguousarray(src).tobytes())
+            digest.update(np.ascontiguousarray(dst).tobytes())
+        return (model, digest.hexdigest(), seed)
+
+    def graphs(self, snapshot, size, model="configuration", seed=0):
+        """Return `size` null graphs of `snapshot` as GraphSnapshots with its labels."""
+        if model not in NULL_MODELS:
+            raise ValueError(f"Unknown null model: {model}")
+        degrees, src, dst = _model_inputs(snapshot, model)
+
+        key = self._key(model, degrees, seed, src, dst)
+        cached = self._cache.pop(key, [])
+        self._cached_bytes -= sum(_nbytes(graph) for graph in cached)
+        if len(cached) < size:
+            cached = cached + self._generate(snapshot, model, degrees, src, dst, seed, len(cached), size)
+        self._store(key, cached)
+
+        return [
+            GraphSnapshot(indptr, indices, data, snapshot.labels, weighted=(model == "configuration_multi"))
+            for indptr, indices, data in cached[:size]
+        ]
+
+    def _store(self, key, graphs):
+        nbytes = sum(_nbytes(graph) for graph in graphs)
+        if nbytes > self.cache_bytes:
+            return
+        while self._cache and self._cached_bytes + nbytes > self.cache_bytes:
+            oldest = self._cache.pop(next(iter(self._cache)))
+            self._cached_bytes -= sum(_nbytes(graph) for graph in oldest)
+        self._cache[key] = graphs
+        self._cached_bytes += nbytes
+
+    def _generate(self, snapshot, model, degrees, src, dst, seed, start, stop):
+        entropy = np.random.SeedSequence(seed).entropy
+        count = stop - start
+        workers = min(self.processes, count)
+        if workers <= 1 or count * max(int(degrees.sum()) // 2, 1) < PARALLEL_MIN_EDGES:
+            return _generate_batch(model, degrees, src, dst, entropy, start, stop)
+
+        # 원본 CSR은 공유 메모리로 전달; numba 병렬 스레드가 돈 뒤의 fork는 종료 시
+        # 멈출 수 있어 spawn 사용
+        bounds = np.linspace(start, stop, workers + 1).astype(int)
+        context = multiprocessing.get_context("spawn")
+        with SharedSnapshot(snapshot) as shared, ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            futures = [
+                pool.submit(_generate_shared_batch, shared.handle, model, entropy, int(a), int(b))
+                for a, b in zip(bounds[:-1], bounds[1:]) if b > a
+            ]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+        return results
+
+
+# 프로세스 전역 앙상블 캐시
+null_models = NullModelEnsemble()
+
+
+def null_graphs(G_or_snapshot, size, model="configuration", seed=0):
+    """Shortcut for the shared ensemble; accepts an nx graph or a GraphSnapshot."""
+    if isinstance(G_or_snapshot, GraphSnapshot):
+        snapshot = G_or_snapshot
+    else:
+        from graph_snapshot import snapshot_of
+        snapshot = snapshot_of(G_or_snapshot)
+    return null_models.graphs(snapshot, size, model=model, seed=seed)
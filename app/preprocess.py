@@ -1,55 +1,63 @@
 import networkx as nx
 import numpy as np
 import json
+from collections import OrderedDict
+import heapq
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import pandas as pd
+import numba
+from scipy import sparse
+from scipy.sparse import csgraph
+from scipy.stats import norm
+from scipy.sparse.linalg import eigsh
+from graph_snapshot import GraphSnapshot, snapshot_of, source_distance_sums
+import readers
+
+# mode="auto"일 때 이 엣지 수를 넘으면 샘플링 추정치를 사용
+OVERVIEW_EXACT_MAX_EDGES = 200000
+# 샘플링 추정에 사용하는 기본 표본 크기
+OVERVIEW_SAMPLE_SOURCES = 256
+OVERVIEW_SAMPLE_WEDGES = 20000
+# backend="auto"일 때 이 노드 수 이상이면 희소 고유값 solver로 eigenvector centrality 계산
+EIGENVECTOR_SPARSE_MIN_NODES = 1000
+
+def load_excel_to_snapshot(excel_file_path):
+    try:
+        return readers.read_excel_snapshot(excel_file_path)
 
-def load_excel_to_graph(excel_file_path) :
-    try: 
-        df = pd.read_excel(excel_file_path)
-        
-        # Check if 'weight' column exists
-        if 'weight' in df.columns:
-            # If weight column exists, include it as an edge attribute
-            graph = nx.from_pandas_edgelist(df, source='source', target='target', edge_attr='weight')
-        else:
-            # If weight column is missing, just load the source and target
-            graph = nx.from_pandas_edgelist(df, source='source', target='target')
-        
-        return graph
-    
     except Exception as e:
         # 최종적으로 다른 예외 발생 시 디버깅 메시지 출력
         error_message = f"Unexpected error occurred: {str(e)}"
         print(error_message)
         raise Exception(error_message)
 
-def load_csv_to_graph(csv_file_path) :
-    try: 
-        df = pd.read_csv(csv_file_path)
-        
-        # Check if 'weight' column exists
-        if 'weight' in df.columns:
-            # If weight column exists, include it as an edge attribute
-            graph = nx.from_pandas_edgelist(df, source='source', target='target', edge_attr='weight')
-        else:
-            # If weight column is missing, just load the source and target
-            graph = nx.from_pandas_edgelist(df, source='source', target='target')
-        
-        return graph
-    
+def load_excel_to_graph(excel_file_path) :
+    # 'weight' 컬럼이 있으면 엣지 속성으로 포함
+    return load_excel_to_snapshot(excel_file_path).to_networkx()
+
+def load_csv_to_snapshot(csv_file_path):
+    try:
+        return readers.read_csv_snapshot(csv_file_path)
+
     except Exception as e:
         # 최종적으로 다른 예외 발생 시 디버깅 메시지 출력
         error_message = f"Unexpected error occurred: {str(e)}"
         print(error_message)
         raise Exception(error_message)
+
+def load_csv_to_graph(csv_file_path) :
+    # 'weight' 컬럼이 있으면 엣지 속성으로 포함
+    return load_csv_to_snapshot(csv_file_path).to_networkx()
     
 
 # GML 파일 로드
+def load_gml_to_snapshot(gml_file_path):
+    return readers.read_gml_snapshot(gml_file_path)
+
 def load_gml_to_graph(gml_file_path):
     try:
-        graph = nx.read_gml(gml_file_path)
+        graph = load_gml_to_snapshot(gml_file_path).to_networkx()
         return graph
 
     except Exception as e:
@@ -59,9 +67,12 @@ def load_gml_to_graph(gml_file_path):
         raise Exception(error_message)
     
 # GEXF 파일 로드
+def load_gexf_to_snapshot(gexf_file_path):
+    return readers.read_gexf_snapshot(gexf_file_path)
+
 def load_gexf_to_graph(gexf_file_path):
     try:
-        graph = nx.read_gexf(gexf_file_path)
+        graph = load_gexf_to_snapshot(gexf_file_path).to_networkx()
         
         return graph
 
@@ -72,18 +83,27 @@ def load_gexf_to_graph(gexf_file_path):
         raise Exception(error_message)
     
 # GraphML 파일 로드
+def load_graphml_to_snapshot(graphml_file_path):
+    return readers.read_graphml_snapshot(graphml_file_path)
+
 def load_graphml_to_graph(graphml_file_path):
-    graph = nx.read_graphml(graphml_file_path)
+    graph = load_graphml_to_snapshot(graphml_file_path).to_networkx()
     return graph
 
-# Adjacency List 파일 로드
+# Adjacency List 파일 로드 (gzip 지원)
+def load_adjlist_to_snapshot(adjlist_file_path):
+    return readers.read_adjlist_snapshot(adjlist_file_path)
+
 def load_adjlist_to_graph(adjlist_file_path):
-    graph = nx.read_adjlist(adjlist_file_path)
+    graph = load_adjlist_to_snapshot(adjlist_file_path).to_networkx()
     return graph
 
-# Edge List 파일 로드
+# Edge List 파일 로드 (gzip 지원)
+def load_edgelist_to_snapshot(edgelist_file_path):
+    return readers.read_edgelist_snapshot(edgelist_file_path)
+
 def load_edgelist_to_graph(edgelist_file_path):
-    graph = nx.read_edgelist(edgelist_file_path)
+    graph = load_edgelist_to_snapshot(edgelist_file_path).to_networkx()
     return graph
 
 # Pajek 파일 로드
@@ -124,8 +144,362 @@ def load_json_to_graph(json_file_path):
     return graph
 
 
+# 확장자별 CSR 스냅샷 로더 (스냅샷을 직접 만드는 스트리밍 로더가 없는 형식은 NetworkX 경유)
+def _via_networkx(loader):
+    return lambda file_path: GraphSnapshot.from_networkx(loader(file_path))
+
+SNAPSHOT_LOADERS = (
+    ((".gexf", ".gephi"), load_gexf_to_snapshot),
+    ((".gml",), load_gml_to_snapshot),
+    ((".graphml",), load_graphml_to_snapshot),
+    ((".adjlist", ".adjlist.gz"), load_adjlist_to_snapshot),
+    ((".edgelist", ".edgelist.gz"), load_edgelist_to_snapshot),
+    ((".net",), _via_networkx(load_pajek_to_graph)),
+    ((".yaml",), _via_networkx(load_yaml_to_graph)),
+    ((".graph6",), _via_networkx(load_graph6_to_graph)),
+    ((".sparse6",), _via_networkx(load_sparse6_to_graph)),
+    ((".gpickle",), _via_networkx(load_gpickle_to_graph)),
+    ((".json",), _via_networkx(load_json_to_graph)),
+    ((".xlsx",), load_excel_to_snapshot),
+    ((".csv",), load_csv_to_snapshot),
+)
+
+def snapshot_loader_for(filename):
+    """Snapshot loader for a file name, or None when the format is unsupported."""
+    for suffixes, loader in SNAPSHOT_LOADERS:
+        if str(filename).endswith(suffixes):
+            return loader
+    return None
+
+
+def _z_value(confidence):
+    return float(norm.ppf(0.5 + confidence / 2))
+
+
+def _is_connected(snapshot):
+    if snapshot.n == 0:
+        return False
+    n_components, _ = csgraph.connected_components(snapshot.adjacency(), directed=False)
+    return n_components == 1
+
+
+def estimate_average_shortest_path_length(G, n_sources=OVERVIEW_SAMPLE_SOURCES, confidence=0.95, seed=None):
+    """
+    Estimate the average shortest path length from BFS runs on sampled sources.
+
+    Returns (estimate, margin) where margin is the half width of the normal
+    confidence interval, or (None, None) when G is not connected. When every
+    node is sampled the result is exact and the margin is 0.
+    """
+    snapshot = snapshot_of(G)
+    n = snapshot.n
+    if n == 1:
+        return 0.0, 0.0
+    if not _is_connected(snapshot):
+        return None, None
+
+    rng = np.random.default_rng(seed)
+    k = min(n_sources, n)
+    sources = np.sort(rng.choice(n, size=k, replace=False)).astype(np.int64)
+    dist_sums, _ = source_distance_sums(snapshot.indptr, snapshot.indices, sources)
+
+    # 소스별 평균 거리의 표본 평균 = 전체 평균 최단 경로 길이의 불편 추정치
+    per_source = dist_sums / (n - 1)
+    estimate = float(per_source.mean())
+    if k == n or k < 2:
+        return estimate, 0.0
+    fpc = np.sqrt((n - k) / (n - 1))
+    margin = _z_value(confidence) * per_source.std(ddof=1) / np.sqrt(k) * fpc
+    return estimate, float(margin)
+
+
+def sparse_average_clustering(G):
+    """
+    Exact average clustering (unweighted, zeros counted) via sparse triangle
+    counting; matches nx.average_clustering.
+    """
+    snapshot = snapshot_of(G)
+    A = snapshot.binary_adjacency()
+    deg = np.asarray(A.sum(axis=1)).ravel()
+    triangles = np.asarray((A @ A).multiply(A).sum(axis=1)).ravel() / 2
+    wedges = deg * (deg - 1) / 2
+    local = np.divide(triangles, wedges, out=np.zeros_like(triangles), where=wedges > 0)
+    return float(local.mean())
+
+
+@numba.jit(nopython=True, cache=True)
+def _closed_wedges(indptr, indices, nodes, u1, u2):
+    closed = np.zeros(nodes.shape[0])
+    for s in range(nodes.shape[0]):
+        v = nodes[s]
+        start = indptr[v]
+        d = indptr[v + 1] - start
+        if d < 2:
+            continue
+        i = int(u1[s] * d)
+        j = int(u2[s] * (d - 1))
+        if j >= i:
+            j += 1
+        a = indices[start + i]
+        b = indices[start + j]
+        row = indices[indptr[a]:indptr[a + 1]]
+        pos = np.searchsorted(row, b)
+        if pos < row.shape[0] and row[pos] == b:
+            closed[s] = 1.0
+    return closed
+
+
+def estimate_average_clustering(G, n_wedges=OVERVIEW_SAMPLE_WEDGES, confidence=0.95, seed=None):
+    """
+    Estimate the average clustering coefficient by wedge sampling.
+
+    A uniformly sampled node contributes one random wedge (pair of distinct
+    neighbours); the fraction of closed wedges is an unbiased estimate of
+    nx.average_clustering. Returns (estimate, margin).
+    """
+    snapshot = snapshot_of(G)
+    n = snapshot.n
+    A = snapshot.binary_adjacency()
+    A.sort_indices()
+
+    rng = np.random.default_rng(seed)
+    nodes = rng.integers(0, n, size=n_wedges)
+    closed = _closed_wedges(
+        A.indptr.astype(np.int64), A.indices.astype(np.int64), nodes,
+        rng.random(n_wedges), rng.random(n_wedges)
+    )
+    p = float(closed.mean())
+    margin = _z_value(confidence) * np.sqrt(p * (1 - p) / n_wedges)
+    return p, float(margin)
+
+
+def estimate_closeness_centrality(G, n_sources=OVERVIEW_SAMPLE_SOURCES, confidence=0.95, seed=None):
+    """
+    Closeness centrality (nx definition, wf_improved) of sampled sources.
+    Returns (max over the sample, mean estimate, margin of the mean).
+    """
+    snapshot = snapshot_of(G)
+    n = snapshot.n
+    if n == 1:
+        return 0.0, 0.0, 0.0
+    rng = np.random.default_rng(seed)
+    k = min(n_sources, n)
+    sources = np.sort(rng.choice(n, size=k, replace=False)).astype(np.int64)
+    dist_sums, reached = source_distance_sums(snapshot.indptr, snapshot.indices, sources)
+
+    r = reached - 1
+    closeness = np.divide(r, dist_sums, out=np.zeros(k), where=dist_sums > 0) * (r / (n - 1))
+    if k == n or k < 2:
+        return float(closeness.max()), float(closeness.mean()), 0.0
+    fpc = np.sqrt((n - k) / (n - 1))
+    margin = _z_value(confidence) * closeness.std(ddof=1) / np.sqrt(k) * fpc
+    return float(closeness.max()), float(closeness.mean()), float(margin)
+
+
+@numba.jit(nopython=True, cache=True)
+def _source_dependencies(indptr, indices, data, source, weighted, bc, dist, sigma, delta, order, done):
+    """
+    One Brandes pass from `source` (BFS, or Dijkstra when weighted): adds
+    the dependencies delta_s(v) to bc and returns their sum. Predecessors
+    are found again in the backward pass from dist, so no lists are kept.
+    """
+    n = indptr.shape[0] - 1
+    for i in range(n):
+        dist[i] = -1.0
+        sigma[i] = 0.0
+        delta[i] = 0.0
+        done[i] = False
+    dist[source] = 0.0
+    sigma[source] = 1.0
+    count = 0
+    if weighted:
+        heap = [(0.0, source)]
+        while len(heap) > 0:
+            d, v = heapq.heappop(heap)
+            if done[v]:
+                continue
+            done[v] = True
+            order[count] = v
+            count += 1
+            for e in range(indptr[v], indptr[v + 1]):
+                w = indices[e]
+                if w == v or done[w]:
+                    continue
+                vw = d + data[e]
+                if dist[w] < 0 or vw < dist[w]:
+                    dist[w] = vw
+                    sigma[w] = sigma[v]
+                    heapq.heappush(heap, (vw, np.int64(w)))
+                elif vw == dist[w]:
+                    sigma[w] += sigma[v]
+    else:
+        order[0] = source
+        count = 1
+        head = 0
+        while head < count:
+            v = order[head]
+            head += 1
+            for e in range(indptr[v], indptr[v + 1]):
+                w = indices[e]
+                if dist[w] < 0:
+                    dist[w] = dist[v] + 1.0
+                    order[count] = w
+                    count += 1
+                if dist[w] == dist[v] + 1.0:
+                    sigma[w] += sigma[v]
+
+    total = 0.0
+    for i in range(count - 1, -1, -1):
+        w = order[i]
+        coeff = (1.0 + delta[w]) / sigma[w]
+        for e in range(indptr[w], indptr[w + 1]):
+            v = indices[e]
+            if v == w or dist[v] < 0:
+                continue
+            step = data[e] if weighted else 1.0
+            if dist[v] + step == dist[w]:
+                delta[v] += sigma[v] * coeff
+        if w != source:
+            bc[w] += delta[w]
+            total += delta[w]
+    return total
+
+
+@numba.jit(nopython=True, parallel=True, cache=True)
+def sampled_betweenness(indptr, indices, data, pivots, weighted, chunks):
+    """
+    Unnormalised betweenness summed over the `pivots` sources, and the total
+    dependency of every pivot. Pivots are split over `chunks` parallel
+    workers, each with its own accumulator row.
+    """
+    n = indptr.shape[0] - 1
+    k = pivots.shape[0]
+    partial = np.zeros((chunks, n))
+    totals = np.zeros(k)
+    for c in numba.prange(chunks):
+        dist = np.empty(n)
+        sigma = np.empty(n)
+        delta = np.empty(n)
+        order = np.empty(n, dtype=np.int64)
+        done = np.empty(n, dtype=np.bool_)
+        for p in range(c, k, chunks):
+            totals[p] = _source_dependencies(indptr, indices, data, pivots[p], weighted,
+                                             partial[c], dist, sigma, delta, order, done)
+    bc = np.zeros(n)
+    for c in range(chunks):
+        bc += partial[c]
+    return bc, totals
+
+
+def estimate_betweenness_centrality(G, n_sources=OVERVIEW_SAMPLE_SOURCES, confidence=0.95, seed=None):
+    """
+    Normalised betweenness (nx definition, weight='weight') from sampled
+    pivots on the CSR snapshot, scaled by n / k as nx does with `k`.
+    Returns (max estimate, mean estimate, margin of the mean); the mean is
+    the average over pivots of their total dependency.
+    """
+    snapshot = snapshot_of(G)
+    n = snapshot.n
+    if n <= 2:
+        return 0.0, 0.0, 0.0
+    rng = np.random.default_rng(seed)
+    k = min(n_sources, n)
+    pivots = np.sort(rng.choice(n, size=k, replace=False)).astype(np.int64)
+    weighted = bool(snapshot.weighted and np.any(snapshot.data != 1.0))
+    chunks = max(1, min(numba.get_num_threads(), k))
+    bc, totals = sampled_betweenness(snapshot.indptr, snapshot.indices, snapshot.data, pivots, weighted, chunks)
+
+    scale = 1.0 / ((n - 1) * (n - 2))
+    bc *= scale * n / k
+    # 노드 평균 = (피벗별 의존도 합의 평균) * scale
+    per_pivot = totals * scale
+    if k == n or k < 2:
+        return float(bc.max()), float(per_pivot.mean()), 0.0
+    fpc = np.sqrt((n - k) / (n - 1))
+    margin = _z_value(confidence) * per_pivot.std(ddof=1) / np.sqrt(k) * fpc
+    return float(bc.max()), float(per_pivot.mean()), float(margin)
+
+
+# 파일(그래프 저장소 키/파일 이름)별 직전 eigenvector centrality 결과. 같은 파일의
+# 그래프는 요청마다 새 객체이므로 객체가 아닌 키로 찾고, 노드 라벨로 매핑해서 사용
+EIGENVECTOR_WARM_START_SIZE = 8
+_eigenvector_warm_start = OrderedDict()
+
+
+def sparse_eigenvector_centrality(G, tol=1e-6, warm_key=None):
+    """
+    Eigenvector centrality from scipy's eigsh on the cached CSR adjacency.
+
+    Same normalisation as nx.eigenvector_centrality (unweighted, unit
+    Euclidean norm, non-negative). With a `warm_key` (e.g. the uploaded
+    file name) the previous result stored under that key is mapped onto the
+    current node labels and used as the starting vector.
+    """
+    snapshot = snapshot_of(G)
+    n = snapshot.n
+    labels = snapshot.labels
+    if n == 0:
+        raise nx.NetworkXPointlessConcept("cannot compute centrality for the null graph")
+    A = snapshot.binary_adjacency(drop_self_loops=False)
+
+    if n < 3:
+        _, vectors = np.linalg.eigh(A.toarray())
+        v = vectors[:, -1]
+    else:
+        v0 = None
+        previous = _eigenvector_warm_start.get(warm_key) if warm_key is not None else None
+        if previous:
+            fill = np.mean(list(previous.values()))
+            v0 = np.array([previous.get(label, fill) for label in labels]) + 1e-9
+        _, vectors = eigsh(A.astype(float), k=1, which='LA', v0=v0, tol=tol)
+        v = vectors[:, 0]
+
+    v = np.abs(v)
+    v /= np.linalg.norm(v)
+    centrality = dict(zip(labels, v.tolist()))
+    if warm_key is not None:
+        _eigenvector_warm_start[warm_key] = centrality
+        _eigenvector_warm_start.move_to_end(warm_key)
+        if len(_eigenvector_warm_start) > EIGENVECTOR_WARM_START_SIZE:
+            _eigenvector_warm_start.popitem(last=False)
+    return centrality
+
+
+def compute_eigenvector_centrality(G, backend="auto", min_sparse_nodes=None, warm_key=None):
+    """
+    backend: "networkx" (power iteration), "sparse" (eigsh) or "auto", which
+    uses eigsh from `min_sparse_nodes` nodes (EIGENVECTOR_SPARSE_MIN_NODES by
+    default) and also when the power iteration fails to converge. `warm_key`
+    is passed to sparse_eigenvector_centrality.
+    """
+    if min_sparse_nodes is None:
+        min_sparse_nodes = EIGENVECTOR_SPARSE_MIN_NODES
+    if backend == "auto":
+        backend = "sparse" if G.number_of_nodes() >= min_sparse_nodes else "networkx"
+
+    if backend == "sparse":
+        return sparse_eigenvector_centrality(G, warm_key=warm_key)
+    if backend != "networkx":
+        raise ValueError(f"Unknown eigenvector centrality backend: {backend}")
+    try:
+        return nx.eigenvector_centrality(G, max_iter=1000, tol=1e-4)
+    except nx.PowerIterationFailedConvergence as e:
+        print(f"Eigenvector centrality did not converge, using sparse solver: {e}")
+        return sparse_eigenvector_centrality(G, warm_key=warm_key)
+
+
 # 그래프 요약 정보 생성 함수
-def graph_overview(G):
+def graph_overview(G, mode="exact", n_samples=None, confidence=0.95, seed=None, eigenvector_backend="auto", warm_key=None, n_wedges=None):
+    """
+    mode: "exact" computes every statistic exactly, "estimate" uses sampled
+    estimators (with *_margin keys giving the confidence interval half width)
+    and "auto" switches to "estimate" above OVERVIEW_EXACT_MAX_EDGES edges.
+    n_samples is the number of BFS sources (path length, closeness,
+    betweenness) and n_wedges the number of sampled wedges (clustering);
+    they default to OVERVIEW_SAMPLE_SOURCES and OVERVIEW_SAMPLE_WEDGES
+    independently, since a wedge costs far less than a BFS.
+    eigenvector_backend is passed to compute_eigenvector_centrality.
+    """
     try:
         overview = {}
 
@@ -137,6 +511,21 @@ def graph_overview(G):
         if G.is_directed():
             G = G.to_undirected()  # 방향 그래프를 무방향 그래프로 변환
 
+        if mode == "auto":
+            mode = "estimate" if G.number_of_edges() > OVERVIEW_EXACT_MAX_EDGES else "exact"
+        if mode not in ("exact", "estimate"):
+            raise ValueError(f"Unknown overview mode: {mode}")
+        estimate = mode == "estimate"
+        n_sources = n_samples or OVERVIEW_SAMPLE_SOURCES
+        n_wedges = n_wedges or OVERVIEW_SAMPLE_WEDGES
+
+        overview["estimation"] = {
+            "mode": mode,
+            "confidence": confidence if estimate else None,
+            "sources": min(n_sources, G.number_of_nodes()) if estimate else None,
+            "wedges": n_wedges if estimate else None,
+        }
+
         # 노드 및 엣지 관련 정보
         overview["node_count"] = G.number_of_nodes()
         overview["edge_count"] = G.number_of_edges()
@@ -146,20 +535,31 @@ def graph_overview(G):
 
         # 평균 군집 계수
         try:
-            overview["average_clustering_coefficient"] = nx.average_clustering(G)
+            if estimate:
+                value, margin = estimate_average_clustering(G, n_wedges, confidence, seed)
+            else:
+                value, margin = sparse_average_clustering(G), 0.0
+            overview["average_clustering_coefficient"] = value
+            overview["average_clustering_coefficient_margin"] = margin
         except Exception as e:
             print(f"Error calculating average_clustering_coefficient: {e}")
             overview["average_clustering_coefficient"] = None
+            overview["average_clustering_coefficient_margin"] = None
 
         # 평균 최단 경로 길이 (연결된 그래프만)
         try:
-            if nx.is_connected(G):
-                overview["average_shortest_path_length"] = nx.average_shortest_path_length(G)
+            if estimate:
+                value, margin = estimate_average_shortest_path_length(G, n_sources, confidence, seed)
+            elif nx.is_connected(G):
+                value, margin = nx.average_shortest_path_length(G), 0.0
             else:
-                overview["average_shortest_path_length"] = None
+                value, margin = None, None
+            overview["average_shortest_path_length"] = value
+            overview["average_shortest_path_length_margin"] = margin
         except Exception as e:
             print(f"Error calculating average_shortest_path_length: {e}")
             overview["average_shortest_path_length"] = None
+            overview["average_shortest_path_length_margin"] = None
 
         # Degree Centrality
         try:
@@ -171,29 +571,45 @@ def graph_overview(G):
             overview["degree_centrality_max"] = None
             overview["degree_centrality_avg"] = None
 
-        # Betweenness Centrality
+        # Betweenness Centrality (추정 모드에서는 CSR 위에서 피벗 샘플링)
         try:
-            betweenness_centrality = nx.betweenness_centrality(G, weight='weight')
-            overview["betweenness_centrality_max"] = max(betweenness_centrality.values())
-            overview["betweenness_centrality_avg"] = sum(betweenness_centrality.values()) / len(betweenness_centrality)
+            if estimate:
+                b_max, b_avg, b_margin = estimate_betweenness_centrality(G, n_sources, confidence, seed)
+                overview["betweenness_centrality_max"] = b_max
+                overview["betweenness_centrality_avg"] = b_avg
+                overview["betweenness_centrality_avg_margin"] = b_margin
+            else:
+                betweenness_centrality = nx.betweenness_centrality(G, weight='weight')
+                overview["betweenness_centrality_max"] = max(betweenness_centrality.values())
+                overview["betweenness_centrality_avg"] = sum(betweenness_centrality.values()) / len(betweenness_centrality)
+                overview["betweenness_centrality_avg_margin"] = 0.0
         except Exception as e:
             print(f"Error calculating betweenness_centrality: {e}")
             overview["betweenness_centrality_max"] = None
             overview["betweenness_centrality_avg"] = None
+            overview["betweenness_centrality_avg_margin"] = None
 
-        # Closeness Centrality
+        # Closeness Centrality (추정 모드에서는 샘플 소스 기준)
         try:
-            closeness_centrality = nx.closeness_centrality(G)
-            overview["closeness_centrality_max"] = max(closeness_centrality.values())
-            overview["closeness_centrality_avg"] = sum(closeness_centrality.values()) / len(closeness_centrality)
+            if estimate:
+                c_max, c_avg, c_margin = estimate_closeness_centrality(G, n_sources, confidence, seed)
+                overview["closeness_centrality_max"] = c_max
+                overview["closeness_centrality_avg"] = c_avg
+                overview["closeness_centrality_avg_margin"] = c_margin
+            else:
+                closeness_centrality = nx.closeness_centrality(G)
+                overview["closeness_centrality_max"] = max(closeness_centrality.values())
+                overview["closeness_centrality_avg"] = sum(closeness_centrality.values()) / len(closeness_centrality)
+                overview["closeness_centrality_avg_margin"] = 0.0
         except Exception as e:
             print(f"Error calculating closeness_centrality: {e}")
             overview["closeness_centrality_max"] = None
             overview["closeness_centrality_avg"] = None
+            overview["closeness_centrality_avg_margin"] = None
 
         # Eigenvector Centrality (수렴 실패 시 처리)
         try:
-            eigenvector_centrality = nx.eigenvector_centrality(G, max_iter=1000, tol=1e-4)
+            eigenvector_centrality = compute_eigenvector_centrality(G, backend=eigenvector_backend, warm_key=warm_key)
             overview["eigenvector_centrality_max"] = max(eigenvector_centrality.values())
             overview["eigenvector_centrality_avg"] = sum(eigenvector_centrality.values()) / len(eigenvector_centrality)
         except nx.PowerIterationFailedConvergence as e:
@@ -214,7 +630,7 @@ def graph_overview(G):
         raise Exception(error_message)
 
 # 노드 및 엣지 데이터를 생성하는 함수
-def graph_node_edge(G, cp_index=None, cp_cluster=None, cp_node_metric=None):
+def graph_node_edge(G, cp_index=None, cp_cluster=None, cp_node_metric=None, eigenvector_backend="auto", warm_key=None):
     try:
         # 멀티그래프인 경우 단일 그래프로 변환 (중복 엣지 제거)
         if isinstance(G, nx.MultiGraph) or isinstance(G, nx.MultiDiGraph):
@@ -261,7 +677,7 @@ def graph_node_edge(G, cp_index=None, cp_cluster=None, cp_node_metric=None):
 
         # Eigenvector Centrality
         try:
-            eigenvector_centrality = nx.eigenvector_centrality(G, max_iter=1000, tol=1e-4)
+            eigenvector_centrality = compute_eigenvector_centrality(G, backend=eigenvector_backend, warm_key=warm_key)
         except nx.PowerIterationFailedConvergence as e:
             print(f"Eigenvector centrality did not converge: {e}")
             eigenvector_centrality = {n: None for n in G.nodes()}
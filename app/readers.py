@@ -0,0 +1,642 @@
+import numpy as np
+from graph_snapshot import GraphSnapshot
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    from pyarrow import csv as pa_csv
+except ImportError:
+    # pyarrow는 requirements.txt에 포함됨; 설치되지 않은 환경에서는 pandas 청크 리더(C 엔진)로
+    # 대체 (같은 결과, 더 느림)
+    pa = None
+
+# 한 번에 읽는 행 수 (메모리 사용량 상한)
+CHUNK_ROWS = 1_000_000
+
+
+class LabelTable:
+    """
+    Incremental node label -> int32 code table. Codes follow the order in
+    which labels are first seen, matching the node order NetworkX would give.
+    """
+    def __init__(self):
+        self.labels = []
+        self._codes = {}
+
+    def __len__(self):
+        return len(self.labels)
+
+    def encode(self, uniques, local_codes):
+        """
+        Map chunk-local codes (indices into `uniques`, first-appearance order)
+        to global codes. Only the chunk's unique labels touch Python.
+        """
+        mapping = np.empty(len(uniques), dtype=np.int32)
+        for i, label in enumerate(uniques):
+            code = self._codes.get(label)
+            if code is None:
+                code = len(self.labels)
+                self._codes[label] = code
+                self.labels.append(label)
+            mapping[i] = code
+        return mapping[local_codes]
+
+    def encode_values(self, values):
+        """Factorize a plain sequence of labels in first-appearance order."""
+        uniques = list(dict.fromkeys(values))
+        local = {label: i for i, label in enumerate(uniques)}
+        local_codes = np.fromiter(map(local.__getitem__, values), dtype=np.int64, count=len(values))
+        return self.encode(uniques, local_codes)
+
+
+class AttributeStore:
+    """Columnar node attributes: one list per attribute, indexed by node code."""
+    def __init__(self, names=()):
+        self.columns = {name: [] for name in names}
+
+    def set(self, code, name, value):
+        column = self.columns.get(name)
+        if column is None:
+            return
+        if len(column) <= code:
+            column.extend([None] * (code + 1 - len(column)))
+        column[code] = value
+
+    def to_dict(self, n):
+        for column in self.columns.values():
+            column.extend([None] * (n - len(column)))
+        return {name: column for name, column in self.columns.items() if any(v is not None for v in column)}
+
+
+class EdgeAccumulator:
+    """Collects int32 endpoint codes and float weights chunk by chunk."""
+    def __init__(self, node_attributes=()):
+        self.labels = LabelTable()
+        self.attributes = AttributeStore(node_attributes)
+        self._src = []
+        self._dst = []
+        self._weight = []
+        self.weighted = False
+
+    def add(self, src, dst, weight=None):
+        self._src.append(np.asarray(src, dtype=np.int32))
+        self._dst.append(np.asarray(dst, dtype=np.int32))
+        if weight is not None:
+            self.weighted = True
+            weight = np.asarray(weight, dtype=np.float64)
+            weight = np.where(np.isnan(weight), 1.0, weight)
+        else:
+            weight = np.ones(len(src))
+        self._weight.append(weight)
+
+    def add_labels(self, src_labels, dst_labels, weight=None):
+        """Factorize a chunk of endpoint labels (row-interleaved) and add it."""
+        pairs = [None] * (2 * len(src_labels))
+        pairs[0::2] = src_labels
+        pairs[1::2] = dst_labels
+        codes = self.labels.encode_values(pairs)
+        self.add(codes[0::2], codes[1::2], weight)
+
+    def add_nodes(self, labels):
+        """Register nodes that may have no edges (e.g. isolated adjlist entries)."""
+        return self.labels.encode_values(labels)
+
+    def add_node(self, label, attributes=None):
+        code = self.labels.encode_values([label])[0]
+        if attributes:
+            for name, value in attributes.items():
+                self.attributes.set(code, name, value)
+        return code
+
+    def snapshot(self):
+        def concat(parts, dtype):
+            return np.concatenate(parts) if parts else np.empty(0, dtype=dtype)
+        return GraphSnapshot.from_edges(
+            concat(self._src, np.int32), concat(self._dst, np.int32),
+            concat(self._weight, np.float64), self.labels.labels, weighted=self.weighted,
+            node_attributes=self.attributes.to_dict(len(self.labels))
+        )
+
+
+def _pyarrow_labels(column, table):
+    """dictionary_encode keeps first-appearance order, like pd.factorize."""
+    encoded = pc.dictionary_encode(column)
+    return table.encode(encoded.dictionary.to_pylist(), encoded.indices.to_numpy(zero_copy_only=False))
+
+
+def read_csv_snapshot(csv_file_path, source='source', target='target', weight='weight', chunk_rows=CHUNK_ROWS):
+    """
+    Stream a CSV edge list into a GraphSnapshot without building a DataFrame of
+    the whole file or a NetworkX graph. Only the source/target/weight columns
+    are read, with pyarrow's typed streaming reader when it is installed and
+    pandas' chunked reader otherwise.
+    """
+    if pa is not None:
+        try:
+            return _read_csv_pyarrow(csv_file_path, source, target, weight, chunk_rows, label_type=None)
+        except pa.ArrowInvalid:
+            # 첫 블록에서 추론한 타입(예: 정수)과 맞지 않는 라벨이 뒤에 나오면 문자열로 다시 읽음
+            return _read_csv_pyarrow(csv_file_path, source, target, weight, chunk_rows, label_type=pa.string())
+
+    import pandas as pd
+    acc = EdgeAccumulator()
+    header = pd.read_csv(csv_file_path, nrows=0).columns
+    columns = [source, target] + ([weight] if weight in header else [])
+    dtype = {weight: np.float64} if weight in header else None
+    for chunk in pd.read_csv(csv_file_path, usecols=columns, dtype=dtype, chunksize=chunk_rows):
+        pairs = np.empty(2 * len(chunk), dtype=object)
+        pairs[0::2] = chunk[source].to_numpy(dtype=object)
+        pairs[1::2] = chunk[target].to_numpy(dtype=object)
+        local_codes, uniques = pd.factorize(pairs)
+        codes = acc.labels.encode(uniques.tolist(), local_codes)
+        w = chunk[weight].to_numpy() if weight in header else None
+        acc.add(codes[0::2], codes[1::2], w)
+    return acc.snapshot()
+
+
+def _read_csv_pyarrow(csv_file_path, source, target, weight, chunk_rows, label_type):
+    acc = EdgeAccumulator()
+    header = pa_csv.open_csv(csv_file_path).schema.names
+    has_weight = weight in header
+    columns = [source, target] + ([weight] if has_weight else [])
+    column_types = {weight: pa.float64()} if has_weight else {}
+    if label_type is not None:
+        column_types[source] = label_type
+        column_types[target] = label_type
+
+    reader = pa_csv.open_csv(
+        csv_file_path,
+        read_options=pa_csv.ReadOptions(block_size=max(chunk_rows * 32, 1 << 20)),
+        convert_options=pa_csv.ConvertOptions(include_columns=columns, column_types=column_types),
+    )
+    for batch in reader:
+        if batch.num_rows == 0:
+            continue
+        # 행 단위로 source/target을 교차 배치해 노드 순서를 NetworkX와 맞춤
+        pairs = _interleave(batch.column(source), batch.column(target))
+        codes = _pyarrow_labels(pairs, acc.labels)
+        w = batch.column(weight).to_numpy(zero_copy_only=False) if has_weight else None
+        acc.add(codes[0::2], codes[1::2], w)
+    return acc.snapshot()
+
+
+def _interleave(a, b):
+    """[a0, b0, a1, b1, ...] for two equally long arrow columns."""
+    a = a.combine_chunks() if isinstance(a, pa.ChunkedArray) else a
+    b = b.combine_chunks() if isinstance(b, pa.ChunkedArray) else b
+    if a.type != b.type:
+        a = a.cast(pa.string())
+        b = b.cast(pa.string())
+    n = len(a)
+    take = np.empty(2 * n, dtype=np.int64)
+    take[0::2] = np.arange(n)
+    take[1::2] = np.arange(n, 2 * n)
+    return pa.concat_arrays([a, b]).take(pa.array(take))
+
+
+def read_excel_snapshot(excel_file_path, source='source', target='target', weight='weight', chunk_rows=CHUNK_ROWS):
+    """
+    Stream the first worksheet of an .xlsx edge list row by row (openpyxl
+    read-only mode) into a GraphSnapshot, flushing every `chunk_rows` rows.
+    """
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(excel_file_path, read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else None for h in next(rows)]
+        s_col = header.index(source)
+        t_col = header.index(target)
+        w_col = header.index(weight) if weight in header else None
+
+        acc = EdgeAccumulator()
+        src, dst, w = [], [], []
+        for row in rows:
+            if row[s_col] is None or row[t_col] is None:
+                continue
+            src.append(row[s_col])
+            dst.append(row[t_col])
+            if w_col is not None:
+                w.append(np.nan if row[w_col] is None else row[w_col])
+            if len(src) >= chunk_rows:
+                acc.add_labels(src, dst, w if w_col is not None else None)
+                src, dst, w = [], [], []
+        if src:
+            acc.add_labels(src, dst, w if w_col is not None else None)
+        return acc.snapshot()
+    finally:
+        workbook.close()
+
+
+# 텍스트 블록 크기 (bytes); 블록은 항상 줄 경계에서 잘림
+BLOCK_BYTES = 64 << 20
+
+_WHITESPACE = np.zeros(256, dtype=bool)
+_WHITESPACE[[9, 10, 11, 12, 13, 32]] = True
+
+
+def _text_blocks(path, block_bytes=BLOCK_BYTES):
+    """
+    Yield newline-terminated byte blocks of a text file. Plain files are
+    memory-mapped, gzip files (by magic number) are decompressed as a stream.
+    """
+    import gzip
+    import mmap
+
+    with open(path, 'rb') as f:
+        is_gzip = f.read(2) == b'\x1f\x8b'
+
+    if is_gzip:
+        rest = b''
+        with gzip.open(path, 'rb') as f:
+            while True:
+                chunk = f.read(block_bytes)
+                if not chunk:
+                    break
+                chunk = rest + chunk
+                cut = chunk.rfind(b'\n') + 1
+                if cut == 0:
+                    rest = chunk
+                    continue
+                rest = chunk[cut:]
+                yield chunk[:cut]
+        if rest:
+            yield rest + b'\n'
+        return
+
+    with open(path, 'rb') as f:
+        if f.seek(0, 2) == 0:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            size = len(mm)
+            while start < size:
+                end = min(start + block_bytes, size)
+                if end < size:
+                    cut = mm.rfind(b'\n', start, end)
+                    end = cut + 1 if cut >= start else mm.find(b'\n', end) + 1 or size
+                block = mm[start:end]
+                start = end
+                yield block if block.endswith(b'\n') else block + b'\n'
+
+
+def _tokenize(block, comments=b'#'):
+    """
+    Bulk-tokenize a whitespace separated text block with NumPy. Returns
+    (tokens, line id of each token); text after `comments` on a line is
+    ignored.
+    """
+    buf = np.frombuffer(block, dtype=np.uint8)
+    if comments is not None and comments in block:
+        buf = buf.copy()
+        idx = np.arange(buf.shape[0])
+        is_hash = buf == comments[0]
+        hashes = np.cumsum(is_hash)
+        last_nl = np.maximum.accumulate(np.where(buf == 10, idx, -1))
+        base = np.where(last_nl >= 0, hashes[np.maximum(last_nl, 0)], 0)
+        buf[(hashes - base) > 0] = 32
+        block = buf.tobytes()
+
+    ws = _WHITESPACE[buf]
+    starts = np.flatnonzero(~ws & np.concatenate(([True], ws[:-1])))
+    line_ids = np.cumsum(buf == 10)[starts]
+    return block.split(), line_ids
+
+
+def _factorize_tokens(tokens, table):
+    """Order-preserving factorization of byte tokens into the label table."""
+    if not tokens:
+        return np.empty(0, dtype=np.int32)
+    arr = np.array(tokens)
+    uniques, first, inverse = np.unique(arr, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind='stable')
+    rank = np.empty_like(order)
+    rank[order] = np.arange(order.shape[0])
+    labels = [u.decode('utf-8') for u in uniques[order].tolist()]
+    return table.encode(labels, rank[inverse.ravel()])
+
+
+def _edge_weight(tokens):
+    """Weight from trailing edge-data tokens: a dict literal or a bare number."""
+    from ast import literal_eval
+
+    text = b' '.join(tokens).decode('utf-8')
+    try:
+        value = literal_eval(text)
+    except (ValueError, SyntaxError) as e:
+        raise ValueError(f"Failed to convert edge data ({text})") from e
+    if isinstance(value, dict):
+        return value.get('weight')
+    return float(value)
+
+
+_WEIGHT_KEYS = (b"{'weight':", b'{"weight":')
+
+
+def _to_float(values):
+    """Bulk float conversion of byte tokens; None where a token is not a number."""
+    try:
+        return values.astype(np.float64)
+    except ValueError:
+        return None
+
+
+def _bulk_weights(tokens, starts, sizes, edge_of_line, weight):
+    """
+    Fill `weight` for the common edge-data forms without per-line Python
+    work: a bare number ("u v w") and "u v {'weight': w}". Returns the
+    start tokens of the lines left for _edge_weight.
+    """
+    third = np.array([tokens[i] for i in (starts + 2).tolist()])
+    rest = []
+
+    bare = sizes == 3
+    if bare.any():
+        values = _to_float(third[bare])
+        if values is None:
+            rest.append(starts[bare])
+        else:
+            weight[edge_of_line[starts[bare]]] = values
+
+    keyed = (sizes == 4) & np.isin(third, _WEIGHT_KEYS)
+    if keyed.any():
+        last = np.array([tokens[i] for i in (starts[keyed] + 3).tolist()])
+        closed = np.char.endswith(last, b'}')
+        values = _to_float(np.char.rstrip(last[closed], b'}')) if closed.any() else None
+        if values is None:
+            rest.append(starts[keyed])
+        else:
+            weight[edge_of_line[starts[keyed][closed]]] = values
+            rest.append(starts[keyed][~closed])
+
+    rest.append(starts[~bare & ~keyed])
+    return np.concatenate(rest)
+
+
+def read_edgelist_snapshot(edgelist_file_path, block_bytes=BLOCK_BYTES):
+    """
+    Read a NetworkX style edge list ("u v [data]" per line, '#' comments,
+    optionally gzip-compressed) into a GraphSnapshot in one streaming pass.
+    Node labels are strings as with nx.read_edgelist; of the edge data only
+    'weight' is kept.
+    """
+    acc = EdgeAccumulator()
+    for block in _text_blocks(edgelist_file_path, block_bytes):
+        tokens, line_ids = _tokenize(block)
+        if not tokens:
+            continue
+        counts = np.bincount(line_ids)
+        per_token = counts[line_ids]
+        first = np.concatenate(([True], line_ids[1:] != line_ids[:-1]))
+        pos = np.arange(len(tokens)) - np.flatnonzero(first)[np.cumsum(first) - 1]
+
+        # 두 토큰(u, v)만 쓰이므로 나머지 토큰은 weight 파싱에만 사용
+        endpoint = (per_token >= 2) & (pos < 2)
+        endpoints = [tokens[i] for i in np.flatnonzero(endpoint)] if not endpoint.all() else tokens
+        codes = _factorize_tokens(endpoints, acc.labels)
+
+        weight = None
+        with_data = np.flatnonzero(first & (per_token > 2))
+        if with_data.shape[0]:
+            weight = np.full(codes.shape[0] // 2, np.nan)
+            edge_of_line = np.cumsum(first & (per_token >= 2)) - 1
+            rest = _bulk_weights(tokens, with_data, per_token[with_data], edge_of_line, weight)
+            # 그 외 형식(여러 키를 가진 dict 등)만 한 줄씩 literal_eval
+            for start in rest.tolist():
+                w = _edge_weight(tokens[start + 2:start + counts[line_ids[start]]])
+                if w is not None:
+                    weight[edge_of_line[start]] = w
+            if np.isnan(weight).all():
+                weight = None
+        acc.add(codes[0::2], codes[1::2], weight)
+    return acc.snapshot()
+
+
+def read_adjlist_snapshot(adjlist_file_path, block_bytes=BLOCK_BYTES):
+    """
+    Read a NetworkX style adjacency list ("u v1 v2 ..." per line, '#'
+    comments, optionally gzip-compressed) into a GraphSnapshot in one
+    streaming pass. Nodes without neighbours are kept, as in nx.read_adjlist.
+    """
+    acc = EdgeAccumulator()
+    for block in _text_blocks(adjlist_file_path, block_bytes):
+        tokens, line_ids = _tokenize(block)
+        if not tokens:
+            continue
+        codes = _factorize_tokens(tokens, acc.labels)
+        first = np.concatenate(([True], line_ids[1:] != line_ids[:-1]))
+        heads = np.flatnonzero(first)
+        owner = codes[heads][np.cumsum(first) - 1]
+        neighbour = ~first
+        acc.add(owner[neighbour], codes[neighbour])
+    return acc.snapshot()
+
+
+# UI에 표시되는 속성만 유지 (노드 라벨, 엣지 가중치)
+NODE_ATTRIBUTES = ('label',)
+# 엣지를 이만큼 모을 때마다 라벨 인코딩 후 배열로 내보냄
+EDGE_BATCH = 100_000
+
+
+def _local(tag):
+    return tag.rsplit('}', 1)[-1]
+
+
+class _EdgeBatch:
+    """Python-side edge buffer flushed into an EdgeAccumulator in batches."""
+    def __init__(self, acc):
+        self.acc = acc
+        self.src, self.dst, self.weight = [], [], []
+        self.any_weight = False
+
+    def add(self, u, v, w=None):
+        self.src.append(u)
+        self.dst.append(v)
+        if w is None:
+            self.weight.append(np.nan)
+        else:
+            self.weight.append(float(w))
+            self.any_weight = True
+        if len(self.src) >= EDGE_BATCH:
+            self.flush()
+
+    def flush(self):
+        if self.src:
+            self.acc.add_labels(self.src, self.dst, self.weight if self.any_weight else None)
+        self.src, self.dst, self.weight = [], [], []
+        self.any_weight = False
+
+
+def _iterparse(path):
+    """
+    iterparse over (event, local tag, element) that detaches every finished
+    <node>/<edge> from its parent, so memory stays bounded by one element.
+    """
+    import xml.etree.ElementTree as ET
+
+    stack = []
+    for event, elem in ET.iterparse(path, events=('start', 'end')):
+        tag = _local(elem.tag)
+        if event == 'start':
+            stack.append(elem)
+            yield event, tag, elem
+            continue
+        stack.pop()
+        yield event, tag, elem
+        if tag in ('node', 'edge') and stack:
+            stack[-1].remove(elem)
+
+
+def read_gexf_snapshot(gexf_file_path, node_attributes=NODE_ATTRIBUTES):
+    """
+    Stream a GEXF file with an incremental XML parser into a GraphSnapshot.
+    Node ids stay strings as with nx.read_gexf; only `node_attributes` (XML
+    attributes or <attvalue>s) and the edge weight are kept.
+    """
+    acc = EdgeAccumulator(node_attributes)
+    edges = _EdgeBatch(acc)
+    titles = {'node': {}, 'edge': {}}
+    attr_class = None
+    data = None
+    for event, tag, elem in _iterparse(gexf_file_path):
+        if event == 'start':
+            if tag == 'attributes':
+                attr_class = elem.get('class')
+            elif tag in ('node', 'edge'):
+                data = {}
+            continue
+
+        if tag == 'attribute' and attr_class in titles:
+            titles[attr_class][elem.get('id')] = elem.get('title')
+        elif tag == 'attvalue' and data is not None:
+            key = elem.get('for') or elem.get('id')
+            data[key] = elem.get('value')
+        elif tag == 'node':
+            named = {titles['node'].get(k, k): v for k, v in data.items()}
+            if elem.get('label') is not None:
+                named['label'] = elem.get('label')
+            acc.add_node(elem.get('id'), {k: named[k] for k in node_attributes if k in named})
+            data = None
+        elif tag == 'edge':
+            named = {titles['edge'].get(k, k): v for k, v in data.items()}
+            edges.add(elem.get('source'), elem.get('target'), elem.get('weight', named.get('weight')))
+            data = None
+    return _finish(acc, edges)
+
+
+def read_graphml_snapshot(graphml_file_path, node_attributes=NODE_ATTRIBUTES):
+    """
+    Stream a GraphML file with an incremental XML parser into a
+    GraphSnapshot. Node ids stay strings as with nx.read_graphml; only
+    `node_attributes` and the edge weight are kept.
+    """
+    acc = EdgeAccumulator(node_attributes)
+    edges = _EdgeBatch(acc)
+    keys = {}
+    data = None
+    for event, tag, elem in _iterparse(graphml_file_path):
+        if event == 'start':
+            if tag in ('node', 'edge'):
+                data = {}
+            continue
+
+        if tag == 'key':
+            keys[elem.get('id')] = (elem.get('attr.name'), elem.get('attr.type', 'string'))
+        elif tag == 'data' and data is not None:
+            name, kind = keys.get(elem.get('key'), (elem.get('key'), 'string'))
+            data[name] = _graphml_value(elem.text, kind)
+        elif tag == 'node':
+            acc.add_node(elem.get('id'), {k: data[k] for k in node_attributes if k in data})
+            data = None
+        elif tag == 'edge':
+            edges.add(elem.get('source'), elem.get('target'), data.get('weight'))
+            data = None
+    return _finish(acc, edges)
+
+
+def _graphml_value(text, kind):
+    if text is None:
+        return None
+    if kind in ('int', 'long'):
+        return int(text)
+    if kind in ('float', 'double'):
+        return float(text)
+    if kind == 'boolean':
+        return text.strip().lower() in ('true', '1')
+    return text
+
+
+def _gml_tokens(path):
+    """Incremental GML tokenizer: yields '[', ']', keys and values line by line."""
+    import re
+
+    token = re.compile(r'\[|\]|"[^"]*"|[^\s\[\]"]+')
+    pending = ''
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = pending + line
+            # 여러 줄에 걸친 문자열은 따옴표가 닫힐 때까지 이어 붙임
+            if line.count('"') % 2:
+                pending = line
+                continue
+            pending = ''
+            if line.lstrip().startswith('#'):
+                continue
+            yield from token.findall(line)
+
+
+def _gml_value(text):
+    if text.startswith('"'):
+        return text[1:-1]
+    try:
+        return int(text)
+    except ValueError:
+        try:
+            return float(text)
+        except ValueError:
+            return text
+
+
+def read_gml_snapshot(gml_file_path, label='label'):
+    """
+    Stream a GML file with an incremental token parser into a GraphSnapshot.
+    As in nx.read_gml, nodes are named by their `label` attribute (or by id
+    when label='id'); of the edge data only the weight is kept.
+    """
+    acc = EdgeAccumulator()
+    edges = _EdgeBatch(acc)
+    names = {}
+    path = []
+    record = None
+    key = None
+    for tok in _gml_tokens(gml_file_path):
+        if tok == '[':
+            path.append(key)
+            if path[-2:] in (['graph', 'node'], ['graph', 'edge']) and len(path) == 2:
+                record = {}
+            key = None
+        elif tok == ']':
+            section = path.pop() if path else None
+            if record is not None and len(path) == 1:
+                if section == 'node':
+                    node_id = record.get('id')
+                    name = record.get(label, node_id) if label != 'id' else node_id
+                    names[node_id] = name
+                    acc.add_node(name)
+                elif section == 'edge':
+                    edges.add(names.get(record.get('source'), record.get('source')),
+                              names.get(record.get('target'), record.get('target')),
+                              record.get('weight'))
+                record = None
+        elif key is None:
+            key = tok
+        else:
+            if record is not None and len(path) == 2:
+                record.setdefault(key, _gml_value(tok))
+            key = None
+    return _finish(acc, edges)
+
+
+def _finish(acc, edges):
+    edges.flush()
+    return acc.snapshot()
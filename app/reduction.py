@@ -0,0 +1,72 @@
+import numpy as np
+import networkx as nx
+from scipy.sparse import csgraph
+from graph_snapshot import snapshot_of, core_numbers
+
+REDUCTION_MODES = ("leaves", "lcc", "kcore")
+
+
+class GraphReduction:
+    """
+    A reduced graph together with the original indices of its nodes, so that
+    index based algorithm output can be mapped back onto the full graph.
+    """
+    def __init__(self, original, kept, mode):
+        self.original = original
+        self.kept = kept
+        self.mode = mode
+        self.n = original.number_of_nodes()
+        labels = snapshot_of(original).labels
+        # subgraph는 원래 그래프의 노드 순서를 유지하므로 kept(오름차순)와 인덱스가 일치
+        self.graph = nx.freeze(original.subgraph([labels[i] for i in kept]).copy())
+
+    def expand(self, values, fill=0):
+        """Full-length array with `values` at the kept nodes and `fill` (periphery) elsewhere."""
+        values = np.asarray(values, dtype=float)
+        full = np.full(self.n, fill, dtype=float)
+        full[self.kept] = values
+        return full
+
+    def summary(self):
+        return {"mode": self.mode, "kept_nodes": int(self.kept.shape[0]), "pruned_nodes": int(self.n - self.kept.shape[0])}
+
+
+def _component_mask(snapshot, keep, min_size=None, largest=False):
+    """Restrict `keep` to components of the induced subgraph (largest or of size >= min_size)."""
+    A = snapshot.binary_adjacency()
+    idx = np.flatnonzero(keep)
+    if idx.shape[0] == 0:
+        return keep
+    _, labels = csgraph.connected_components(A[idx][:, idx], directed=False)
+    sizes = np.bincount(labels)
+    if largest:
+        ok = labels == np.argmax(sizes)
+    else:
+        ok = sizes[labels] >= min_size
+    mask = np.zeros_like(keep)
+    mask[idx[ok]] = True
+    return mask
+
+
+def reduce_graph(G, mode="leaves", k=2, min_component_size=3):
+    """
+    Pre-algorithm reduction. Pruned nodes are periphery under every CP
+    definition, so the algorithm can run on what is left.
+
+    mode:
+    - "leaves": iteratively strip degree <= 1 nodes (i.e. keep the 2-core),
+      then drop components smaller than `min_component_size`
+    - "lcc": keep the largest connected component
+    - "kcore": keep the k-core
+    """
+    snapshot = snapshot_of(G)
+    if mode == "leaves":
+        keep = core_numbers(snapshot.indptr, snapshot.indices) >= 2
+        keep = _component_mask(snapshot, keep, min_size=min_component_size)
+    elif mode == "lcc":
+        keep = _component_mask(snapshot, np.ones(snapshot.n, dtype=bool), largest=True)
+    elif mode == "kcore":
+        keep = core_numbers(snapshot.indptr, snapshot.indices) >= k
+    else:
+        raise ValueError(f"Unknown reduction mode: {mode}. Supported modes are {', '.join(REDUCTION_MODES)}")
+    return GraphReduction(G, np.flatnonzero(keep), mode)
@@ -0,0 +1,106 @@
+import numpy as np
+from graph_snapshot import snapshot_of
+from algorithms.cp_kernels import sweep_cut_counts, cp_density_from_counts
+from algorithms.low_rank_core import Low_Rank_Core
+from algorithms.minre import Minre
+from algorithms.silva import Silva
+
+# 파라미터 스윕: 파라미터와 무관한 중간 결과(LLC 점수, Silva 누적 capacity 곡선,
+# Minre w)를 그래프/메소드별로 한 번만 계산하고 곡선 전체를 반환
+
+SWEEP_PARAMETERS = {"LLC": "beta", "Silva": "threshold", "Minre": "cutoff"}
+SWEEP_NAMESPACE = "sweep"
+
+
+class SweepCache:
+    """
+    Parameter independent intermediates per (graph key, method, options).
+    Kept in memory and, when a GraphStore is given, persisted next to the
+    stored graphs.
+    """
+    def __init__(self, store=None, max_entries=32):
+        self.store = store
+        self.max_entries = max_entries
+        self._entries = {}
+
+    def get(self, key, compute):
+        value = self._entries.pop(key, None)
+        if value is None and self.store is not None:
+            value = self.store.get_value(SWEEP_NAMESPACE, key)
+        if value is None:
+            value = compute()
+            if self.store is not None:
+                self.store.put_value(SWEEP_NAMESPACE, key, value)
+        self._entries[key] = value
+        while len(self._entries) > self.max_entries:
+            self._entries.pop(next(iter(self._entries)))
+        return value
+
+
+def _llc_intermediates(G):
+    model = Low_Rank_Core(G)
+    scores = model.rank2_scores(G)
+    A = snapshot_of(G).binary_adjacency(drop_self_loops=False)
+    # 점수 내림차순으로 core에 넣을 때 모든 prefix의 블록 엣지 수
+    e_cc, e_cp, e_pp = sweep_cut_counts(
+        np.asarray(A.indptr, dtype=np.int64), np.asarray(A.indices, dtype=np.int32),
+        np.ascontiguousarray(np.argsort(scores)[::-1]),
+    )
+    return {"scores": scores, "e_cc": e_cc, "e_cp": e_cp, "e_pp": e_pp}
+
+
+def _silva_intermediates(G):
+    model = Silva(G)
+    sorted_nodes, capacity, cumulative_capacity = model.capacity_curve(G)
+    node_to_index = {node: idx for idx, node in enumerate(G.nodes())}
+    return {
+        "removal_order": np.array([node_to_index[node] for node in sorted_nodes], dtype=np.int64),
+        "cumulative_capacity": np.asarray(cumulative_capacity, dtype=np.float64),
+    }
+
+
+def _minre_intermediates(G, max_iter, init, restarts):
+    model = Minre(G)
+    w, _, PRE = model.minres(max_iter=max_iter, init=init, restarts=restarts)
+    return {"w": np.asarray(w), "PRE": float(PRE)}
+
+
+def parameter_sweep(G, method, values, cache, graph_key, options=None):
+    """
+    (parameter -> core set, metric) for every value, from one computation of
+    the method's parameter independent part. Core sets are node indices.
+    """
+    options = options or {}
+    n = G.number_of_nodes()
+    curve = []
+
+    if method == "LLC":
+        gamma = float(options.get("gamma", 0))
+        data = cache.get(f"{graph_key}_LLC", lambda: _llc_intermediates(G))
+        for beta in values:
+            core = Low_Rank_Core.top_core(data["scores"], beta)
+            k = core.shape[0]
+            q = cp_density_from_counts(n, k, data["e_cc"][k], data["e_cp"][k], data["e_pp"][k], gamma, beta)
+            curve.append({"value": beta, "core": np.sort(core).tolist(), "metric": {"Q": float(q)}})
+
+    elif method == "Silva":
+        data = cache.get(f"{graph_key}_Silva", lambda: _silva_intermediates(G))
+        for threshold in values:
+            removed = Silva.core_size(data["cumulative_capacity"], threshold)
+            core = np.sort(data["removal_order"][removed:])
+            curve.append({"value": threshold, "core": core.tolist(), "metric": {"cc": (n - removed) / n}})
+
+    elif method == "Minre":
+        max_iter = int(options.get("n_iter", 10000))
+        init = options.get("init", "random")
+        restarts = int(options.get("restarts", 1))
+        data = cache.get(f"{graph_key}_Minre_{max_iter}_{init}_{restarts}",
+                         lambda: _minre_intermediates(G, max_iter, init, restarts))
+        for cutoff in values:
+            core = Minre.core_indices(data["w"], cutoff)
+            curve.append({"value": cutoff, "core": core.tolist(), "metric": {"PRE": data["PRE"], "core_size": int(core.shape[0])}})
+
+    else:
+        raise ValueError(f"Parameter sweep is not available for {method}")
+
+    return curve